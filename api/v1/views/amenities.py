@@ -3,17 +3,19 @@
 """Amenities view"""
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
+from api.v1.views.response_cache import cached
+from api.v1.views.conditional import get_object
 from models import storage
 from models.amenity import Amenity
 
 
 @app_views.route("/amenities", methods=["GET"],
                  strict_slashes=False)
+@cached(Amenity)
 def get_amenities():
-    """Retrieve all amenities"""
-    list_amenities = [
-        amenity.to_dict() for amenity in storage.all(Amenity).values()]
-    return jsonify(list_amenities)
+    """Retrieve all amenities, a page at a time given limit or cursor"""
+    return paginate(Amenity)
 
 
 @app_views.route("/amenities/<string:amenity_id>", methods=["GET"],
@@ -23,7 +25,7 @@ def get_ameniti(amenity_id):
     amenity = storage.get(Amenity, amenity_id)
     if amenity is None:
         abort(404)
-    return jsonify(amenity.to_dict())
+    return get_object(amenity)
 
 
 @app_views.route("/amenities/<string:amenity_id>", methods=["DELETE"],
@@ -70,5 +72,5 @@ def update_amenity(amenity_id):
     for k, v in data.items():
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(amenity, k, v)
-    storage.save()
+    amenity.save()
     return jsonify(amenity.to_dict()), 200
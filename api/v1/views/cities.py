@@ -3,6 +3,9 @@
 """Cities view"""
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
+from api.v1.views.response_cache import cached
+from api.v1.views.conditional import get_object
 from models import storage
 from models.state import State
 from models.city import City
@@ -10,13 +13,13 @@ from models.city import City
 
 @app_views.route("/states/<string:state_id>/cities", methods=["GET"],
                  strict_slashes=False)
+@cached(State, City)
 def get_cities_by_state(state_id):
-    """Retrieve all cities by the state_id"""
-    state = storage.get(State, state_id)
-    if state is None:
+    """Retrieve all cities by the state_id, a page at a time given limit
+    or cursor"""
+    if storage.get(State, state_id) is None:
         abort(404)
-    list_cities = [city.to_dict() for city in state.cities]
-    return jsonify(list_cities)
+    return paginate(City, {"state_id": state_id})
 
 
 @app_views.route("/cities/<string:city_id>", methods=["GET"],
@@ -26,7 +29,7 @@ def get_city(city_id):
     city = storage.get(City, city_id)
     if city is None:
         abort(404)
-    return jsonify(city.to_dict())
+    return get_object(city)
 
 
 @app_views.route("/cities/<string:city_id>", methods=["DELETE"],
@@ -77,5 +80,5 @@ def update_city(city_id):
     for k, v in data.items():
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(city, k, v)
-    storage.save()
+    city.save()
     return jsonify(city.to_dict()), 200
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+"""Conditional GET (ETag, Last-Modified) of the GET endpoints"""
+from datetime import timezone
+from hashlib import sha1
+from flask import current_app, jsonify, request
+from api.v1.views.projection import requested_fields
+from models import storage
+
+
+def etag(*parts):
+    """Return the strong ETag of the representation identified by parts"""
+    return sha1("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def not_modified(tag, last_modified=None):
+    """Return whether the copy of the client is current: its ETag, if
+    it sent If-None-Match, else its If-Modified-Since date"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(tag)
+    since = request.if_modified_since
+    if last_modified is None or since is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional(build, tag, last_modified=None):
+    """Return 304 Not Modified if the client has the representation
+    tagged tag, else the response build() returns; either carries the
+    ETag and Last-Modified headers"""
+    if not_modified(tag, last_modified):
+        response = current_app.response_class(status=304)
+    else:
+        response = build()
+    response.set_etag(tag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def get_object(obj):
+    """Return the JSON response of obj, limited to the requested fields
+
+    The ETag and Last-Modified headers derive from updated_at, so an
+    unchanged object is answered with 304 without being serialized.
+    """
+    fields = requested_fields(type(obj))
+    updated_at = obj.updated_at
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    tag = etag(type(obj).__name__, obj.id, updated_at.isoformat(), fields)
+    return conditional(lambda: jsonify(obj.to_dict(fields=fields)), tag,
+                       updated_at)
+
+
+def get_collection(cls, build):
+    """Return the response build() makes of objects of cls, or 304
+
+    The ETag derives from the generation of cls in storage, from the
+    URL and from the Accept header, which may select another format, so
+    the objects are not even read while none of them changes.
+    """
+    tag = etag(cls.__name__, storage.generation(cls), request.full_path,
+               request.headers.get("Accept"))
+    return conditional(build, tag)
@@ -1,8 +1,9 @@
 #!/usr/bin/python3
 # Author: Joana Casallas
 """Index API"""
-from flask import jsonify
+from flask import abort, jsonify
 from api.v1.views import app_views
+from api.v1.views.response_cache import cached, responses
 from models import storage
 from models.amenity import Amenity
 from models.city import City
@@ -19,6 +20,7 @@ def status():
 
 
 @app_views.route("/stats", methods=["GET"])
+@cached(Amenity, City, Place, Review, State, User)
 def stats():
     """Retrieve the number of each objects by type"""
     return jsonify(
@@ -31,3 +33,17 @@ def stats():
             "users": storage.count(User)
         }
     )
+
+
+@app_views.route("/stats/pool", methods=["GET"])
+def pool_stats():
+    """Retrieve the statistics of the database connection pool"""
+    if not hasattr(storage, "pool_stats"):
+        abort(404)
+    return jsonify(storage.pool_stats())
+
+
+@app_views.route("/stats/cache", methods=["GET"])
+def cache_stats():
+    """Retrieve the statistics of the response cache"""
+    return jsonify(responses.stats())
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""Pagination of the list endpoints"""
+from base64 import b64decode, urlsafe_b64encode
+import binascii
+from os import getenv
+from flask import abort, jsonify, request, url_for
+from api.v1.views.conditional import get_collection
+from api.v1.views.projection import requested_fields
+from api.v1.views.streaming import stream, stream_format
+from models import storage
+
+# largest page a client may ask for
+max_limit = int(getenv("HBNB_API_MAX_LIMIT", "1000"))
+
+
+def paginate(cls, filters=None):
+    """Return the JSON list of the objects of cls matching filters
+
+    Given a limit (at most max_limit) or a cursor parameter, only one
+    page of objects sorted by id is returned; the Link header points to
+    the next one, which starts after the opaque cursor of the last
+    object (even once that object is deleted), so every page costs the
+    same however deep it is. Only the
+    attributes named by the fields parameter are loaded and returned.
+    While no object of cls changes, the client is answered 304 if it
+    sends the ETag it was given. Without limit and cursor, the list may
+    be streamed instead (see stream_format), in storage order.
+    """
+    return get_collection(cls, lambda: page(cls, filters))
+
+
+def page(cls, filters):
+    """Return the JSON list of the objects of cls matching filters,
+    paginated as the request asks (see paginate)"""
+    limit = request.args.get("limit")
+    cursor = request.args.get("cursor")
+    fields = requested_fields(cls)
+    name = stream_format()
+    if limit is None and cursor is None and name is not None:
+        return stream(storage.iterate(cls, filters, fields=fields), fields,
+                      name)
+    if limit is None and cursor is None:
+        return jsonify([obj.to_dict(fields=fields) for obj in
+                        storage.query(cls, filters, fields=fields)])
+    try:
+        limit = min(int(limit or max_limit), max_limit)
+    except ValueError:
+        abort(400, description="Invalid limit")
+    if limit < 1:
+        abort(400, description="Invalid limit")
+    if cursor is not None:
+        # pages are sorted by id alone: the next one holds the greater
+        # ids, so the object of the cursor need not exist anymore
+        filters = dict(filters or {}, id__gt=decode_cursor(cursor))
+    # one more object tells whether there is a next page
+    objs = storage.query(cls, filters, limit=limit + 1, fields=fields)
+    response = jsonify([obj.to_dict(fields=fields) for obj in objs[:limit]])
+    if len(objs) > limit:
+        args = dict(request.args, limit=limit,
+                    cursor=encode_cursor(objs[limit - 1].id))
+        url = url_for(request.endpoint, **request.view_args, **args,
+                      _external=True)
+        response.headers["Link"] = '<{}>; rel="next"'.format(url)
+    return response
+
+
+def encode_cursor(id):
+    """Return the cursor of the page after the object id"""
+    return urlsafe_b64encode(id.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Return the id of the object a cursor follows"""
+    try:
+        return b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_",
+                         validate=True).decode()
+    except (binascii.Error, UnicodeDecodeError):
+        abort(400, description="Invalid cursor")
@@ -1,21 +1,29 @@
 #!/usr/bin/python3
 # Author: Joana Casallas
 """Place view"""
+from math import isfinite
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import max_limit, paginate
+from api.v1.views.projection import requested_fields
+from api.v1.views.conditional import get_object
+from api.v1.views.streaming import stream, stream_format
 from models import storage
 from models.city import City
-from models.place import Place
+from models.place import Place, range_attributes
 from models.user import User
-from models.state import State
-from models.amenity import Amenity
+from models.engine.search import PlaceSearch
+
+# the search engine of places_search
+search = PlaceSearch(storage)
 
 
 @app_views.route("cities/<string:city_id>/places", methods=["GET"],
                  strict_slashes=False)
 def get_places(city_id):
     """
-    Retrieve all places by its city ID.
+    Retrieve all places by its city ID, a page at a time given limit or
+    cursor.
     ---
     tags:
       - Places
@@ -25,6 +33,14 @@ def get_places(city_id):
         required: true
         type: string
         description: The ID of the city
+      - name: limit
+        in: query
+        type: integer
+        description: Number of places per page
+      - name: cursor
+        in: query
+        type: string
+        description: Cursor of the page, from the Link header
     responses:
       200:
         description: A list of places in the specified city
@@ -32,14 +48,14 @@ def get_places(city_id):
           type: array
           items:
             $ref: "#/definitions/Place"
+      400:
+        description: Invalid limit or cursor
       404:
         description: City not found
     """
-    city = storage.get(City, city_id)
-    if city is None:
+    if storage.get(City, city_id) is None:
         abort(404)
-    list_places = [place.to_dict() for place in city.places]
-    return jsonify(list_places)
+    return paginate(Place, {"city_id": city_id})
 
 
 @app_views.route("/places/<string:place_id>", methods=["GET"],
@@ -67,7 +83,7 @@ def get_place(place_id):
     place = storage.get(Place, place_id)
     if place is None:
         abort(404)
-    return jsonify(place.to_dict())
+    return get_object(place)
 
 
 @app_views.route("/places/<string:place_id>", methods=["DELETE"],
@@ -149,6 +165,7 @@ def create_place(city_id):
     user_id = storage.get(User, data['user_id'])
     if user_id is None:
         abort(404)
+    data = integers(data)
     new_place = Place(**data)
     new_place.city_id = city_id
     storage.new(new_place)
@@ -161,6 +178,13 @@ def create_place(city_id):
 def places_search():
     """
     Search for places based on filters in JSON body.
+
+    Returns the places, sorted by id, that are in one of the states or
+    cities (all places if there are none), have all the amenities and
+    whose price_by_night, max_guest, number_rooms and number_bathrooms
+    are within the given min and max (both included), streamed as
+    NDJSON or as a JSON array if asked (?stream=ndjson or ?stream=json,
+    or Accept: application/x-ndjson).
     ---
     tags:
       - Places
@@ -188,6 +212,23 @@ def places_search():
               items:
                 type: string
               example: ["WiFi", "Parking"]
+            price_by_night:
+              type: object
+              properties:
+                min:
+                  type: number
+                max:
+                  type: number
+              example: {"min": 50, "max": 150}
+            max_guest:
+              type: object
+              example: {"min": 4}
+            number_rooms:
+              type: object
+              example: {"min": 2, "max": 3}
+            number_bathrooms:
+              type: object
+              example: {"min": 1}
     responses:
       200:
         description: Successfully retrieved places
@@ -209,39 +250,125 @@ def places_search():
     if not request.is_json:
         abort(400, description="Not a JSON")
     data = request.get_json()
-    if data is None or not any(key in data for key in ['states',
-                                                       'cities',
-                                                       'amenities']):
-        return jsonify([
-            place.to_dict() for place in storage.all(Place).values()])
-    list_ids = []
-    list_cities = []
-    list_places = []
-    for requirement in data:
-        for id_obj in data[requirement]:
-            list_ids.append(id_obj)
-        if requirement == "states":
-            all_states = storage.all(State)
-            for k, v in all_states.items():
-                if v.id in list_ids:
-                    for city in v.cities:
-                        list_cities.append(city)
-        elif requirement == "cities":
-            all_cities = storage.all(City)
-            for k, v in all_cities.items():
-                if v.id in list_ids:
-                    list_cities.append(v)
-        elif requirement == "amenities":
-            all_places = storage.all(Place)
-            for place in all_places.items():
-                for k, v in place.amenities:
-                    if v.id in list_ids:
-                        list_places.append(v.to_dict())
-    for city in list_cities:
-        for place in city.places:
-            if place not in list_places:
-                list_places.append(place.to_dict())
-    return jsonify(list_places), 201
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        abort(400, description="Not a JSON")
+    filters = {}
+    for key in ("states", "cities", "amenities"):
+        ids = data.get(key) or []
+        if not isinstance(ids, list) or \
+                not all(isinstance(id, str) for id in ids):
+            abort(400, description="Invalid {}".format(key))
+        filters[key] = ids
+    ranges = {}
+    for key in range_attributes:
+        bounds = data.get(key) or {}
+        if not isinstance(bounds, dict) or \
+                not set(bounds) <= {"min", "max"} or \
+                not all(isinstance(value, (int, float)) and
+                        not isinstance(value, bool) and isfinite(value)
+                        for value in bounds.values()):
+            abort(400, description="Invalid {}".format(key))
+        if "min" in bounds:
+            ranges[key + "__ge"] = bounds["min"]
+        if "max" in bounds:
+            ranges[key + "__le"] = bounds["max"]
+    name = stream_format()
+    if name is not None:
+        return stream(search.iterate(filters=ranges, **filters), name=name)
+    return jsonify([place.to_dict() for place in
+                    search.search(filters=ranges, **filters)])
+
+
+@app_views.route("/places_near", methods=["GET"], strict_slashes=False)
+def places_near():
+    """
+    Retrieve the places nearest a point, sorted by distance.
+    ---
+    tags:
+      - Places
+    parameters:
+      - name: lat
+        in: query
+        required: true
+        type: number
+        description: Latitude of the point, in degrees
+      - name: lng
+        in: query
+        required: true
+        type: number
+        description: Longitude of the point, in degrees
+      - name: radius
+        in: query
+        type: number
+        description: Only the places within this many kilometers
+      - name: limit
+        in: query
+        type: integer
+        description: At most this many places (10 without a radius)
+    responses:
+      200:
+        description: The places, each with its distance in kilometers
+      400:
+        description: Missing or invalid parameter
+    """
+    lat = number("lat", -90, 90)
+    lng = number("lng", -180, 180)
+    radius = number("radius", 0, None, required=False)
+    limit = request.args.get("limit")
+    try:
+        limit = int(limit) if limit is not None else \
+            (10 if radius is None else max_limit)
+    except ValueError:
+        abort(400, description="Invalid limit")
+    if not 1 <= limit <= max_limit:
+        abort(400, description="Invalid limit")
+    fields = requested_fields(Place)
+    places = []
+    for distance, place in storage.near(lat, lng, radius, limit):
+        place_dict = place.to_dict(fields=fields)
+        place_dict["distance"] = round(distance, 3)
+        places.append(place_dict)
+    return jsonify(places)
+
+
+def integers(data):
+    """Return data with its range attributes (see places_search) as
+    integers, as both storage engines keep them; integer texts are
+    converted, other values are a bad request"""
+    data = dict(data)
+    for key in range_attributes:
+        if key not in data:
+            continue
+        value = data[key]
+        if isinstance(value, str):
+            try:
+                value = int(value)
+            except ValueError:
+                abort(400, description="Invalid {}".format(key))
+        if not isinstance(value, int) or isinstance(value, bool):
+            abort(400, description="Invalid {}".format(key))
+        data[key] = value
+    return data
+
+
+def number(name, low, high, required=True):
+    """Return the float parameter name, which must be between low and
+    high (None: unbounded), or None if it is absent and not required"""
+    value = request.args.get(name)
+    if value is None:
+        if required:
+            abort(400, description="Missing {}".format(name))
+        return None
+    try:
+        value = float(value)
+    except ValueError:
+        abort(400, description="Invalid {}".format(name))
+    if not isfinite(value) or value < low or \
+            (high is not None and value > high):
+        abort(400, description="Invalid {}".format(name))
+    return value
 
 
 @app_views.route("/places/<string:place_id>", methods=["PUT"],
@@ -285,8 +412,9 @@ def update_place(place_id):
     data = request.get_json()
     if data is None:
         abort(400, description="Not a JSON")
+    data = integers(data)
     for k, v in data.items():
         if k not in ['id', 'user_id', 'city_id', 'created_at', 'updated_at']:
             setattr(place, k, v)
-    storage.save()
+    place.save()
     return jsonify(place.to_dict()), 200
@@ -3,6 +3,8 @@
 """Amenities view"""
 from flask import jsonify, abort
 from api.v1.views import app_views
+from api.v1.views.projection import project
+import models
 from models import storage
 from models.place import Place
 from models.amenity import Amenity
@@ -12,10 +14,10 @@ from models.amenity import Amenity
                  strict_slashes=False)
 def get_place_amenities(place_id):
     """Retrieve all amenities by the place_id"""
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=("amenities",))
     if place is None:
         abort(404)
-    list_amenities = [amenity.to_dict() for amenity in place.amenities]
+    list_amenities = [project(amenity) for amenity in place.amenities]
     return jsonify(list_amenities)
 
 
@@ -32,8 +34,14 @@ def delete_place_amenity(place_id, amenity_id):
         abort(404)
     if amenity not in place.amenities:
         abort(404)
-    place.amenities.remove(amenity)
-    storage.save()
+    if models.storage_t == "db":
+        place.amenities.remove(amenity)
+    else:
+        # a new list, so storage records the change (place.amenities is
+        # a fresh list read from amenity_ids)
+        place.amenity_ids = [id for id in place.amenity_ids
+                             if id != amenity.id]
+    place.save()
     return jsonify({}), 200
 
 
@@ -50,6 +58,9 @@ def link_amenity_place(place_id, amenity_id):
         abort(404)
     if amenity in place.amenities:
         return jsonify(amenity.to_dict()), 200
-    place.amenities.append(amenity)
-    storage.save()
+    if models.storage_t == "db":
+        place.amenities.append(amenity)
+    else:
+        place.amenity_ids = place.amenity_ids + [amenity.id]
+    place.save()
     return jsonify(amenity.to_dict()), 201
@@ -3,6 +3,8 @@
 """Reviews view"""
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
+from api.v1.views.conditional import get_object
 from models import storage
 from models.place import Place
 from models.review import Review
@@ -11,12 +13,11 @@ from models.review import Review
 @app_views.route("places/<string:place_id>/reviews", methods=["GET"],
                  strict_slashes=False)
 def get_reviews(place_id):
-    """Retrieve all reviews by the place_id"""
-    place = storage.get(Place, place_id)
-    if place is None:
+    """Retrieve all reviews by the place_id, a page at a time given limit
+    or cursor"""
+    if storage.get(Place, place_id) is None:
         abort(404)
-    list_reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(list_reviews)
+    return paginate(Review, {"place_id": place_id})
 
 
 @app_views.route("/reviews/<string:review_id>", methods=["GET"],
@@ -26,7 +27,7 @@ def get_review(review_id):
     review = storage.get(Review, review_id)
     if review is None:
         abort(404)
-    return jsonify(review.to_dict())
+    return get_object(review)
 
 
 @app_views.route("/reviews/<string:review_id>", methods=["DELETE"],
@@ -83,5 +84,5 @@ def update_review(review_id):
     for k, v in data.items():
         if k not in ['id', 'place_id', 'user_id', 'created_at', 'updated_at']:
             setattr(review, k, v)
-    storage.save()
+    review.save()
     return jsonify(review.to_dict()), 200
@@ -0,0 +1,22 @@
+#!/usr/bin/python3
+"""Field projection (?fields=) of the GET endpoints"""
+from flask import abort, request
+from models.engine.query import parse_fields
+
+
+def requested_fields(cls):
+    """Return the attributes of cls the fields parameter names, e.g.
+    ?fields=id,name, or None when it is absent"""
+    fields = request.args.get("fields")
+    if fields is None:
+        return None
+    try:
+        return parse_fields(cls, [name.strip() for name in fields.split(",")
+                                  if name.strip()])
+    except ValueError as e:
+        abort(400, description=str(e))
+
+
+def project(obj):
+    """Return the dictionary of obj, limited to the requested fields"""
+    return obj.to_dict(fields=requested_fields(type(obj)))
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""Response cache of the read endpoints"""
+from collections import OrderedDict
+from functools import wraps
+from os import getenv
+import threading
+from flask import current_app, request
+from models import storage
+
+
+class ResponseCache:
+    """keeps the last responses of GET requests, least recently used
+    first, each with the generations of the classes it was built from"""
+
+    def __init__(self, size):
+        """creates an empty cache of at most size responses"""
+        self.size = size
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__counters = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, version):
+        """returns the (body, headers) cached for key at version, or None"""
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or entry[0] != version:
+                self.__counters["misses"] += 1
+                return None
+            self.__entries.move_to_end(key)
+            self.__counters["hits"] += 1
+            return entry[1]
+
+    def put(self, key, version, body, headers):
+        """caches body and headers for key at version"""
+        with self.__lock:
+            self.__entries[key] = (version, (body, headers))
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.size:
+                self.__entries.popitem(last=False)
+                self.__counters["evictions"] += 1
+
+    def clear(self):
+        """drops every cached response"""
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """returns the counters of the cache and its hit ratio"""
+        with self.__lock:
+            stats = dict(self.__counters)
+            stats["entries"] = len(self.__entries)
+        stats["size"] = self.size
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+# the responses of the views decorated with cached
+responses = ResponseCache(int(getenv("HBNB_API_CACHE_SIZE", "256")))
+
+
+def cached(*classes):
+    """Cache the responses of a GET view built from objects of classes
+
+    Responses are keyed by path, query string and Accept header; one is
+    served again, without calling the view, while the storage
+    generations of classes are unchanged. Streamed responses are not
+    cached. HBNB_API_CACHE_SIZE=0 turns the cache off.
+    """
+    def decorator(view):
+        """Return view, cached"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            """Return the cached response, else the one of view"""
+            if responses.size < 1:
+                return view(*args, **kwargs)
+            key = (request.full_path, request.headers.get("Accept"))
+            version = tuple(storage.generation(cls) for cls in classes)
+            hit = responses.get(key, version)
+            if hit is not None:
+                response = current_app.response_class(hit[0],
+                                                      headers=hit[1])
+                return response.make_conditional(request)
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                responses.put(key, version, response.get_data(),
+                              list(response.headers))
+            return response
+        return wrapper
+    return decorator
@@ -3,15 +3,18 @@
 """States view"""
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
+from api.v1.views.response_cache import cached
+from api.v1.views.conditional import get_object
 from models import storage
 from models.state import State
 
 
 @app_views.route("/states", methods=["GET"], strict_slashes=False)
+@cached(State)
 def get_states():
-    """Retrieve all states"""
-    list_states = [v.to_dict() for v in (storage.all(State).values())]
-    return jsonify(list_states)
+    """Retrieve all states, a page at a time given limit or cursor"""
+    return paginate(State)
 
 
 @app_views.route("/states/<string:state_id>", methods=["GET"],
@@ -21,7 +24,7 @@ def get_state(state_id):
     state = storage.get(State, state_id)
     if state is None:
         abort(404)
-    return jsonify(state.to_dict())
+    return get_object(state)
 
 
 @app_views.route("/states/<string:state_id>", methods=["DELETE"],
@@ -68,5 +71,5 @@ def update_state(state_id):
     for k, v in data.items():
         if k not in ['id', 'created_at', 'updated_at']:
             setattr(state, k, v)
-    storage.save()
+    state.save()
     return jsonify(state.to_dict()), 200
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Streamed (NDJSON or chunked JSON array) responses of the list
+endpoints"""
+from flask import abort, current_app, request, stream_with_context
+
+# streaming format -> media type of the response
+formats = {"ndjson": "application/x-ndjson", "json": "application/json"}
+# bytes of JSON sent at once
+chunk_size = 65536
+
+
+def stream_format():
+    """Return the streaming format the request asks for, or None
+
+    ?stream=ndjson or ?stream=json (an incrementally written JSON array)
+    choose it; otherwise an Accept header preferring application/x-ndjson
+    to application/json selects NDJSON.
+    """
+    name = request.args.get("stream")
+    if name is not None:
+        if name not in formats:
+            abort(400, description="Invalid stream")
+        return name
+    best = request.accept_mimetypes.best_match(
+        [formats["json"], formats["ndjson"]])
+    return "ndjson" if best == formats["ndjson"] else None
+
+
+def stream(objs, fields=None, name="json"):
+    """Return a response writing the dictionaries of objs (limited to
+    fields) as they are read from the iterator, in the format name
+
+    Neither the list of dictionaries nor the whole body is ever built,
+    so the first bytes leave at once and memory does not grow with the
+    number of objects.
+    """
+    dumps = current_app.json.dumps
+
+    def body():
+        """Yield the chunks of the body, then release objs"""
+        try:
+            if name == "ndjson":
+                yield from chunks(dumps(obj.to_dict(fields=fields)) + "\n"
+                                  for obj in objs)
+            else:
+                yield from chunks(array(dumps(obj.to_dict(fields=fields))
+                                        for obj in objs))
+        finally:
+            # a client gone mid-stream must not keep the rows open
+            if hasattr(objs, "close"):
+                objs.close()
+    return current_app.response_class(stream_with_context(body()),
+                                      mimetype=formats[name])
+
+
+def array(items):
+    """Yield the pieces of the JSON array of the JSON texts items"""
+    yield "["
+    separator = ""
+    for item in items:
+        yield separator + item
+        separator = ","
+    yield "]"
+
+
+def chunks(pieces):
+    """Yield the texts pieces joined in chunks of about chunk_size"""
+    buffer, size = [], 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
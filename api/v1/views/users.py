@@ -3,6 +3,8 @@
 """User view"""
 from flask import jsonify, abort, request
 from api.v1.views import app_views
+from api.v1.views.pagination import paginate
+from api.v1.views.conditional import get_object
 from models import storage
 from models.user import User
 
@@ -10,9 +12,8 @@ from models.user import User
 @app_views.route("/users", methods=["GET"],
                  strict_slashes=False)
 def get_users():
-    """Retrieve all users"""
-    list_users = [user.to_dict() for user in storage.all(User).values()]
-    return jsonify(list_users)
+    """Retrieve all users, a page at a time given limit or cursor"""
+    return paginate(User)
 
 
 @app_views.route("/users/<string:user_id>", methods=["GET"],
@@ -22,7 +23,7 @@ def get_user(user_id):
     user = storage.get(User, user_id)
     if user is None:
         abort(404)
-    return jsonify(user.to_dict())
+    return get_object(user)
 
 
 @app_views.route("/users/<string:user_id>", methods=["DELETE"],
@@ -73,5 +74,5 @@ def update_user(user_id):
     for k, v in data.items():
         if k not in ['id', 'email', 'created_at', 'updated_at']:
             setattr(user, k, v)
-    storage.save()
+    user.save()
     return jsonify(user.to_dict()), 200
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmarks the read endpoints of the API with the response cache off
+and on (warm), with the storage engine configured in the environment.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/api_response_cache.py [size ...]
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/bench.db \\
+        PYTHONPATH=. ./benchmarks/api_response_cache.py [size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import models
+from api.v1.app import app
+from api.v1.views.response_cache import responses
+from models.amenity import Amenity
+from models.city import City
+from models.state import State
+
+SIZES = [100, 1000]
+REQUESTS = 200
+
+
+def latency(client, url):
+    """returns the mean milliseconds of a GET of url"""
+    start = time.perf_counter()
+    for _ in range(REQUESTS):
+        client.get(url)
+    return (time.perf_counter() - start) * 1000 / REQUESTS
+
+
+def main(sizes):
+    """prints the latency of each endpoint without and with the cache"""
+    tmp = tempfile.TemporaryDirectory()
+    storage = models.storage
+    if models.storage_t != "db":
+        storage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    client = app.test_client()
+    size = responses.size
+    print("{:>7} {:>28} {:>10} {:>10}".format(
+        "size", "url", "off (ms)", "on (ms)"))
+    for count in sizes:
+        state = State(name="state")
+        objs = [state] + [State(name="state") for _ in range(count)] + \
+            [City(name="city", state_id=state.id) for _ in range(count)] + \
+            [Amenity(name="amenity") for _ in range(count)]
+        storage.new_many(objs)
+        storage.save()
+        for url in ("/api/v1/stats", "/api/v1/states", "/api/v1/amenities",
+                    "/api/v1/states/{}/cities".format(state.id)):
+            responses.size = 0
+            off = latency(client, url)
+            responses.size = size
+            client.get(url)
+            on = latency(client, url)
+            print("{:>7} {:>28.28} {:>10.3f} {:>10.3f}".format(
+                count, url, off, on))
+        storage.delete_many(objs)
+        storage.save()
+    print("hit ratio: {:.3f}".format(responses.stats()["hit_ratio"]))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Benchmarks GET /states as one JSON document against the streamed NDJSON
+and JSON array modes: time to first byte, total time and peak memory
+allocated while answering, with the storage engine configured in the
+environment.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/api_streaming.py [size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import models
+from api.v1.app import app
+from api.v1.views.response_cache import responses
+from models.state import State
+
+SIZES = [10000, 100000]
+MODES = {"jsonify": "/api/v1/states", "ndjson": "/api/v1/states?stream=ndjson",
+         "json array": "/api/v1/states?stream=json"}
+
+
+def measure(client, url):
+    """returns the milliseconds to the first byte and to the last one,
+    and the peak MiB allocated"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    response = client.get(url, buffered=False)
+    body = iter(response.response)
+    next(body)
+    first = time.perf_counter() - start
+    for _ in body:
+        pass
+    response.close()
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first * 1000, total * 1000, peak / 2 ** 20
+
+
+def main(sizes):
+    """prints the measures of each mode per number of states"""
+    tmp = tempfile.TemporaryDirectory()
+    storage = models.storage
+    if models.storage_t != "db":
+        storage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    responses.size = 0
+    client = app.test_client()
+    print("{:>7} {:>10} {:>10} {:>10} {:>10}".format(
+        "size", "mode", "TTFB (ms)", "total (ms)", "peak (MiB)"))
+    for size in sizes:
+        states = [State(name="state {}".format(i)) for i in range(size)]
+        storage.new_many(states)
+        storage.save()
+        for mode, url in MODES.items():
+            print("{:>7} {:>10} {:>10.1f} {:>10.1f} {:>10.1f}".format(
+                size, mode, *measure(client, url)))
+        storage.delete_many(states)
+        storage.save()
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.save throughput of concurrent writer threads, with
+synchronous saves and with the debounced background flush.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_flush.py [threads ...]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+THREADS = [1, 4, 16]
+OBJECTS = 10000
+WRITES = 100
+
+
+def writes_per_second(storage, states, threads, window):
+    """runs WRITES updates and saves in each of threads threads"""
+    FileStorage._FileStorage__flush_window = window
+    storage.compact()
+
+    def write(n):
+        """updates one object and saves, WRITES times"""
+        for i in range(WRITES):
+            states[(n * WRITES + i) % len(states)].name = "state_{}".format(i)
+            storage.save()
+
+    workers = [threading.Thread(target=write, args=(n,))
+               for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    storage.flush()
+    if FileStorage._FileStorage__flusher is not None:
+        FileStorage._FileStorage__flusher.stop()
+        FileStorage._FileStorage__flusher = None
+    return threads * WRITES / (time.perf_counter() - start)
+
+
+def main(threads):
+    """prints sync and windowed write throughput per thread count"""
+    tmp = tempfile.TemporaryDirectory()
+    FileStorage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    storage = FileStorage()
+    states = [State(name="state") for _ in range(OBJECTS)]
+    for state in states:
+        storage.new(state)
+    print("{:>9} {:>16} {:>22}".format(
+        "threads", "sync (writes/s)", "window 50ms (writes/s)"))
+    for count in threads:
+        print("{:>9} {:>16.1f} {:>22.1f}".format(
+            count, writes_per_second(storage, states, count, 0),
+            writes_per_second(storage, states, count, 0.05)))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or THREADS)
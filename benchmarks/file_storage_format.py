@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+"""
+Benchmarks the binary snapshot format of FileStorage against JSON:
+save time, file size and load time.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_format.py [objects]
+"""
+import os
+import sys
+import tempfile
+import time
+from models.engine.file_storage import FileStorage
+from models.place import Place
+
+OBJECTS = 100000
+
+
+def reset():
+    """empties the storage, including its encoding cache"""
+    for name in ("objects", "index", "relations", "changes", "encoded"):
+        setattr(FileStorage, "_FileStorage__" + name, {})
+    FileStorage._FileStorage__signature = None
+
+
+def run(places, path, binary):
+    """returns the save time, file size and load time of one format"""
+    FileStorage._FileStorage__file_path = path
+    FileStorage._FileStorage__binary = binary
+    reset()
+    storage = FileStorage()
+    for place in places:
+        storage.new(place)
+    start = time.perf_counter()
+    storage.save()
+    save = time.perf_counter() - start
+    reset()
+    start = time.perf_counter()
+    storage.reload()
+    load = time.perf_counter() - start
+    assert storage.count() == len(places)
+    return save, os.path.getsize(path) / 2**20, load
+
+
+def main(objects):
+    """prints the results of both formats"""
+    places = [Place(name="place {}".format(i), city_id="c", user_id="u",
+                    description="a cozy place " * 10, number_rooms=i % 5,
+                    price_by_night=i % 300, latitude=37.7, longitude=-122.4)
+              for i in range(objects)]
+    tmp = tempfile.TemporaryDirectory()
+    print("{} objects".format(objects))
+    print("{:>8} {:>10} {:>10} {:>10}".format(
+        "format", "save (s)", "size (MB)", "load (s)"))
+    for name, binary in (("json", False), ("binary", True)):
+        path = os.path.join(tmp.name, name)
+        print("{:>8} {:>10.2f} {:>10.1f} {:>10.2f}".format(
+            name, *run(places, path, binary)))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else OBJECTS)
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.get, all(cls) and count(cls) as the number of
+stored objects grows.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_get.py [size ...]
+"""
+import random
+import sys
+import timeit
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.state import State
+
+SIZES = [1000, 10000, 100000, 1000000]
+LOOKUPS = 10000
+
+
+def fill(storage, size):
+    """adds Place objects until storage holds size of them"""
+    ids = []
+    for i in range(size - storage.count(Place)):
+        place = Place(name="place_{}".format(i))
+        storage.new(place)
+        ids.append(place.id)
+    return ids
+
+
+def main(sizes):
+    """prints the latency of each operation for every dataset size"""
+    storage = FileStorage()
+    storage.new(State(name="bench"))
+    ids = []
+    print("{:>9} {:>12} {:>14} {:>12}".format(
+        "objects", "get (us)", "all(State) (us)", "count (us)"))
+    for size in sizes:
+        ids += fill(storage, size)
+        sample = random.sample(ids, min(LOOKUPS, len(ids)))
+        get = timeit.timeit(
+            lambda: [storage.get(Place, id) for id in sample], number=1)
+        everything = timeit.timeit(lambda: storage.all(State), number=1000)
+        count = timeit.timeit(lambda: storage.count(Place), number=1000)
+        print("{:>9} {:>12.3f} {:>14.3f} {:>12.3f}".format(
+            size, get / len(sample) * 1e6, everything * 1e3,
+            count * 1e3))
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
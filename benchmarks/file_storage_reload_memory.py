@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+Benchmarks the peak memory of FileStorage.reload on a generated file,
+against loading the whole file with json.load first.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_reload_memory.py [megabytes]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+
+MEGABYTES = 300
+
+
+def generate(path, megabytes):
+    """writes Place records to path until it reaches megabytes"""
+    limit = megabytes << 20
+    with open(path, "w") as f:
+        f.write("{")
+        separator = ""
+        while f.tell() < limit:
+            id = str(uuid.uuid4())
+            record = {"id": id, "created_at": "2025-02-07T23:25:06.682825",
+                      "updated_at": "2025-02-07T23:25:06.682825",
+                      "__class__": "Place", "city_id": str(uuid.uuid4()),
+                      "user_id": str(uuid.uuid4()), "name": "place",
+                      "description": "a cozy place " * 10,
+                      "number_rooms": 2, "price_by_night": 90}
+            f.write(separator + json.dumps("Place." + id) + ": " +
+                    json.dumps(record))
+            separator = ", "
+        f.write("}")
+
+
+def rss():
+    """returns the resident set size of this process in MB"""
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def load(loader, path):
+    """loads path into FileStorage and prints base, final and peak RSS"""
+    from models.engine.file_storage import FileStorage, classes
+    FileStorage._FileStorage__file_path = path
+    storage = FileStorage()
+    base = rss()
+    start = time.perf_counter()
+    if loader == "json.load":
+        with open(path) as f:
+            jo = json.load(f)
+        for key in jo:
+            storage.new(classes[jo[key]["__class__"]](**jo[key]))
+        del jo
+    else:
+        storage.reload()
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print("{:>10} {:>9} {:>10.1f} {:>10.1f} {:>10.1f} {:>8.1f}".format(
+        loader, storage.count(), rss() - base, peak - base,
+        peak - rss(), elapsed))
+
+
+def main(megabytes):
+    """generates the file and loads it in a fresh process per loader"""
+    tmp = tempfile.TemporaryDirectory()
+    path = os.path.join(tmp.name, "file.json")
+    generate(path, megabytes)
+    print("file: {:.1f} MB".format(os.path.getsize(path) / 2**20))
+    print("{:>10} {:>9} {:>10} {:>10} {:>10} {:>8}".format(
+        "loader", "objects", "final MB", "peak MB", "extra MB", "secs"))
+    for loader in ("json.load", "stream"):
+        sys.stdout.flush()
+        subprocess.run([sys.executable, __file__, "--child", loader, path],
+                       check=True)
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--child"]:
+        load(sys.argv[2], sys.argv[3])
+    else:
+        main(int(sys.argv[1]) if len(sys.argv) > 1 else MEGABYTES)
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage.save write throughput against dataset size, with
+full snapshots and with the append-only journal.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_save.py [size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+SIZES = [1000, 10000, 100000]
+WRITES = 200
+
+
+def writes_per_second(storage, states, journal):
+    """updates one object and saves, WRITES times"""
+    FileStorage._FileStorage__journal = journal
+    storage.compact()
+    start = time.perf_counter()
+    for i in range(WRITES):
+        states[i % len(states)].name = "state_{}".format(i)
+        storage.save()
+    return WRITES / (time.perf_counter() - start)
+
+
+def main(sizes):
+    """prints snapshot and journal write throughput per dataset size"""
+    tmp = tempfile.TemporaryDirectory()
+    FileStorage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    storage = FileStorage()
+    states = []
+    print("{:>9} {:>20} {:>20}".format(
+        "objects", "snapshot (writes/s)", "journal (writes/s)"))
+    for size in sizes:
+        while len(states) < size:
+            states.append(State(name="state"))
+            storage.new(states[-1])
+        print("{:>9} {:>20.1f} {:>20.1f}".format(
+            size, writes_per_second(storage, states, False),
+            writes_per_second(storage, states, True)))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
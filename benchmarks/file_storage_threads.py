@@ -0,0 +1,72 @@
+#!/usr/bin/python3
+"""
+Benchmarks FileStorage read throughput of concurrent reader threads while
+one thread keeps adding and deleting objects.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/file_storage_threads.py [threads ...]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+THREADS = [1, 2, 4, 8]
+OBJECTS = 10000
+SECONDS = 1
+
+
+def reads_per_second(storage, state, threads):
+    """counts the reads of threads threads during SECONDS seconds"""
+    done = threading.Event()
+    counts = [0] * threads
+
+    def read(n):
+        """reads through the storage until done"""
+        while not done.is_set():
+            storage.get(State, state.id)
+            storage.count(City)
+            len(storage.all(State))
+            len(state.cities)
+            counts[n] += 4
+
+    def write():
+        """adds and deletes a city until done"""
+        while not done.is_set():
+            city = City(name="city", state_id=state.id)
+            storage.new(city)
+            storage.delete(city)
+
+    workers = [threading.Thread(target=read, args=(n,))
+               for n in range(threads)] + [threading.Thread(target=write)]
+    for worker in workers:
+        worker.start()
+    time.sleep(SECONDS)
+    done.set()
+    for worker in workers:
+        worker.join()
+    return sum(counts) / SECONDS
+
+
+def main(threads):
+    """prints read throughput per reader thread count"""
+    tmp = tempfile.TemporaryDirectory()
+    FileStorage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    storage = FileStorage()
+    state = State(name="state")
+    storage.new(state)
+    for i in range(OBJECTS):
+        storage.new(City(name="city", state_id=state.id if i % 10 else ""))
+    print("{:>9} {:>14}".format("threads", "reads/s"))
+    for count in threads:
+        print("{:>9} {:>14.1f}".format(
+            count, reads_per_second(storage, state, count)))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or THREADS)
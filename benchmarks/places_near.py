@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Benchmarks the spatial index of FileStorage (models/engine/geo.py) on
+millions of synthetic places, three quarters of them clustered around
+cities and the others spread over the land: nearest and radius queries
+against a scan of every place.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/places_near.py [places ...]
+"""
+import random
+import sys
+import time
+from models.engine.geo import GridIndex, distance, nearest
+
+SIZES = [1000000, 3000000]
+CENTERS = 2000
+QUERIES = 200
+QUERY_TYPES = {"nearest 1": (None, 1), "nearest 10": (None, 10),
+               "nearest 100": (None, 100), "radius 1 km": (1, None),
+               "radius 10 km": (10, None), "radius 50 km": (50, None)}
+
+
+class Place:
+    """a synthetic place"""
+
+    __slots__ = ("id", "latitude", "longitude")
+
+    def __init__(self, id, latitude, longitude):
+        """creates the place id at latitude, longitude"""
+        self.id = id
+        self.latitude = latitude
+        self.longitude = longitude
+
+
+def places(size, rng):
+    """returns size synthetic places and the city centers"""
+    centers = [(rng.uniform(-60, 70), rng.uniform(-180, 180))
+               for _ in range(CENTERS)]
+    objs = []
+    for i in range(size):
+        if i % 4:
+            lat, lng = rng.choice(centers)
+            lat = min(90, max(-90, rng.gauss(lat, 0.2)))
+            lng = (rng.gauss(lng, 0.2) + 180) % 360 - 180
+        else:
+            lat, lng = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        objs.append(Place("{:08d}".format(i), lat, lng))
+    return objs, centers
+
+
+def latency(run, points):
+    """returns the mean milliseconds of run at each point, and the mean
+    number of places found"""
+    found = 0
+    start = time.perf_counter()
+    for lat, lng in points:
+        found += len(run(lat, lng))
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / len(points), found / len(points)
+
+
+def main(sizes):
+    """prints the build time and the query latencies per size"""
+    rng = random.Random(0)
+    for size in sizes:
+        objs, centers = places(size, rng)
+        index = GridIndex()
+        start = time.perf_counter()
+        for obj in objs:
+            index.add(obj)
+        print("{} places: indexed in {:.1f} s".format(
+            size, time.perf_counter() - start))
+        points = [(rng.gauss(lat, 0.1), rng.gauss(lng, 0.1))
+                  for lat, lng in rng.sample(centers, QUERIES)]
+        print("{:>14} {:>8} {:>12} {:>12}".format(
+            "query", "places", "index (ms)", "scan (ms)"))
+        for name, (radius, limit) in QUERY_TYPES.items():
+            ms, found = latency(
+                lambda lat, lng: index.near(lat, lng, radius, limit), points)
+            scan_ms, _ = latency(lambda lat, lng: nearest(
+                [(distance(lat, lng, obj.latitude, obj.longitude), obj)
+                 for obj in objs], radius, limit), points[:2])
+            print("{:>14} {:>8.1f} {:>12.3f} {:>12.0f}".format(
+                name, found, ms, scan_ms))
+        del objs, index
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""
+Benchmarks the range indexes of FileStorage (models/engine/ranges.py) on
+millions of synthetic places: lookups of price ranges of growing width
+against a scan of every place, and the cost of changing prices.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/places_ranges.py [places ...]
+"""
+import random
+import sys
+import time
+from models.engine.ranges import RangeIndex
+
+SIZES = [1000000, 3000000]
+PRICES = 100000
+QUERIES = 50
+# width of the price ranges looked up, in prices
+WIDTHS = [10, 100, 1000, 10000]
+
+
+class Place:
+    """a synthetic place"""
+
+    __slots__ = ("id", "price_by_night")
+
+    def __init__(self, id, price_by_night):
+        """creates the place id of price_by_night"""
+        self.id = id
+        self.price_by_night = price_by_night
+
+
+def mean_ms(run, times):
+    """returns the mean milliseconds of times calls of run, and the mean
+    number of ids they return"""
+    found = 0
+    start = time.perf_counter()
+    for _ in range(times):
+        found += len(run())
+    return (time.perf_counter() - start) * 1000 / times, found / times
+
+
+def main(sizes):
+    """prints the build time, then the lookup latencies per size"""
+    rng = random.Random(0)
+    for size in sizes:
+        objs = [Place("{:08d}".format(i), rng.randrange(PRICES))
+                for i in range(size)]
+        index = RangeIndex("price_by_night")
+        start = time.perf_counter()
+        for obj in objs:
+            index.add(obj)
+        # the first lookup sorts the index
+        index.count([("lt", 0)])
+        print("{} places: indexed in {:.1f} s".format(
+            size, time.perf_counter() - start))
+        print("{:>8} {:>8} {:>12} {:>12} {:>18}".format(
+            "width", "places", "index (ms)", "scan (ms)",
+            "1000 changes (ms)"))
+        for width in WIDTHS:
+            lows = [rng.randrange(PRICES - width) for _ in range(QUERIES)]
+            bounds = iter([[("ge", low), ("lt", low + width)]
+                           for low in lows])
+            ms, found = mean_ms(lambda: index.find(next(bounds)), QUERIES)
+            low = lows[0]
+            scan_ms, _ = mean_ms(lambda: [
+                obj.id for obj in objs
+                if low <= obj.price_by_night < low + width], 2)
+            start = time.perf_counter()
+            for obj in rng.sample(objs, 1000):
+                obj.price_by_night = rng.randrange(PRICES)
+                index.add(obj)
+            change_ms = (time.perf_counter() - start) * 1000
+            print("{:>8} {:>8.0f} {:>12.3f} {:>12.0f} {:>18.0f}".format(
+                width, found, ms, scan_ms, change_ms))
+        del objs, index
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+"""
+Benchmarks the places_search engine: the time to build its indexes,
+then the latency of searches by states, cities and amenities, against
+a scan of every place, with the storage engine configured in the
+environment.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/places_search.py [places ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.search import PlaceSearch
+from models.place import Place
+from models.state import State
+from models.user import User
+
+SIZES = [1000000]
+STATES = 50
+CITIES_PER_STATE = 20
+AMENITIES = 50
+REPEAT = 20
+
+
+def populate(storage, size):
+    """stores size places spread over the cities, with 3 amenities each,
+    and returns the states, cities and amenities"""
+    rng = random.Random(0)
+    user = User(email="bench@hbnb.io", password="pwd")
+    states = [State(name="state") for _ in range(STATES)]
+    cities = [City(name="city", state_id=state.id)
+              for state in states for _ in range(CITIES_PER_STATE)]
+    amenities = [Amenity(name="amenity") for _ in range(AMENITIES)]
+    storage.new_many([user] + states + cities + amenities)
+    for start in range(0, size, 100000):
+        places = []
+        for _ in range(start, min(size, start + 100000)):
+            place = Place(name="place", user_id=user.id,
+                          city_id=rng.choice(cities).id)
+            chosen = rng.sample(amenities, 3)
+            if models.storage_t == "db":
+                place.amenities = chosen
+            else:
+                place.amenity_ids = [amenity.id for amenity in chosen]
+            places.append(place)
+        storage.new_many(places)
+        storage.save()
+    return states, cities, amenities
+
+
+def scan(storage, states, cities, amenities):
+    """returns the places found by reading every place"""
+    city_ids = set(cities) | {city.id for city in storage.all(City).values()
+                              if city.state_id in states}
+    found = []
+    for place in storage.all(Place).values():
+        if city_ids and place.city_id not in city_ids:
+            continue
+        if all(id in place.amenity_ids for id in amenities):
+            found.append(place)
+    return sorted(found, key=lambda place: place.id)
+
+
+def latency(run, repeat=REPEAT):
+    """returns the mean milliseconds of run() and its number of places"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        found = run()
+    return (time.perf_counter() - start) * 1000 / repeat, len(found)
+
+
+def main(sizes):
+    """prints the build time and the search latencies per size"""
+    tmp = tempfile.TemporaryDirectory()
+    storage = models.storage
+    if models.storage_t != "db":
+        storage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    for size in sizes:
+        states, cities, amenities = populate(storage, size)
+        search = PlaceSearch(storage)
+        start = time.perf_counter()
+        search.search(states=["none"])
+        print("{} places: indexes built in {:.0f} ms".format(
+            size, (time.perf_counter() - start) * 1000))
+        filters = {
+            "1 state": ([states[0].id], [], []),
+            "5 cities": ([], [city.id for city in cities[:5]], []),
+            "1 state + 1 amenity": ([states[0].id], [], [amenities[0].id]),
+            "2 amenities": ([], [], [amenities[0].id, amenities[1].id]),
+            "3 amenities": ([], [], [amenity.id
+                                     for amenity in amenities[:3]])}
+        print("{:>22} {:>8} {:>12} {:>12}".format(
+            "search", "places", "index (ms)", "scan (ms)"))
+        for name, (s, c, a) in filters.items():
+            ms, found = latency(lambda: search.search(s, c, a))
+            scan_ms = "-"
+            if models.storage_t != "db":
+                scan_ms = "{:.1f}".format(latency(
+                    lambda: scan(storage, s, c, a), 3)[0])
+            print("{:>22} {:>8} {:>12.2f} {:>12}".format(
+                name, found, ms, scan_ms))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
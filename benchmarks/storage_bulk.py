@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""
+Benchmarks inserting, updating and deleting objects one at a time (one
+save each) against the bulk methods (one save per batch), with the
+storage engine configured in the environment.
+
+Usage (from the repository root):
+    PYTHONPATH=. ./benchmarks/storage_bulk.py [size ...]
+    HBNB_TYPE_STORAGE=db HBNB_DB_URL=sqlite:////tmp/bench.db \\
+        PYTHONPATH=. ./benchmarks/storage_bulk.py [size ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import models
+from models.state import State
+
+SIZES = [100, 1000]
+
+
+def per_object(storage, size):
+    """returns the objects per second of new, update and delete, saving
+    after each object"""
+    states = [State(name="state") for _ in range(size)]
+    rates = []
+    start = time.perf_counter()
+    for state in states:
+        storage.new(state)
+        storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    start = time.perf_counter()
+    for state in states:
+        state.name = "renamed"
+        storage.new(state)
+        storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    start = time.perf_counter()
+    for state in states:
+        storage.delete(state)
+        storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    return rates
+
+
+def bulk(storage, size):
+    """returns the objects per second of new_many, update_many and
+    delete_many, saving after each batch"""
+    states = [State(name="state") for _ in range(size)]
+    rates = []
+    start = time.perf_counter()
+    storage.new_many(states)
+    storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    start = time.perf_counter()
+    storage.update_many(State, [{"id": state.id, "name": "renamed"}
+                                for state in states])
+    storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    start = time.perf_counter()
+    storage.delete_many(states)
+    storage.save()
+    rates.append(size / (time.perf_counter() - start))
+    return rates
+
+
+def main(sizes):
+    """prints per-object and bulk throughput per batch size"""
+    tmp = tempfile.TemporaryDirectory()
+    storage = models.storage
+    if models.storage_t != "db":
+        storage._FileStorage__file_path = os.path.join(tmp.name, "file.json")
+    print("{:>7} {:>10} {:>12} {:>12} {:>12}".format(
+        "size", "mode", "new/s", "update/s", "delete/s"))
+    for size in sizes:
+        for mode, run in (("per-object", per_object), ("bulk", bulk)):
+            print("{:>7} {:>10} {:>12.1f} {:>12.1f} {:>12.1f}".format(
+                size, mode, *run(storage, size)))
+    tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or SIZES)
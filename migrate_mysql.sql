@@ -0,0 +1,18 @@
+-- brings a database created by an older version up to the current schema
+-- (Base.metadata.create_all only creates missing tables, with their indexes)
+-- run each section once per database, e.g.: cat migrate_mysql.sql | mysql hbnb_dev_db
+
+-- indexes of the places table
+CREATE INDEX ix_places_location ON places (latitude, longitude);
+CREATE INDEX ix_places_max_guest ON places (max_guest);
+CREATE INDEX ix_places_number_bathrooms ON places (number_bathrooms);
+CREATE INDEX ix_places_number_rooms ON places (number_rooms);
+CREATE INDEX ix_places_price_by_night ON places (price_by_night);
+
+-- microseconds in the dates
+ALTER TABLE amenities MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE cities MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE places MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE reviews MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE states MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
+ALTER TABLE users MODIFY created_at DATETIME(6), MODIFY updated_at DATETIME(6);
@@ -7,6 +7,7 @@ from datetime import datetime, timezone
 from os import getenv
 import sqlalchemy
 from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects import mysql
 from sqlalchemy.ext.declarative import declarative_base
 import uuid
 import models
@@ -17,6 +18,9 @@ if models.storage_t == "db":
     Base = declarative_base()
 else:
     Base = object
+# microseconds, which MySQL drops from a plain DATETIME: two changes
+# within a second keep distinct updated_at, hence distinct ETags
+timestamp = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
 
 
 class BaseModel:
@@ -24,9 +28,9 @@ class BaseModel:
     if models.storage_t == "db":
         id = Column(String(60), primary_key=True)
         created_at = Column(
-            DateTime, default=lambda: datetime.now(timezone.utc))
+            timestamp, default=lambda: datetime.now(timezone.utc))
         updated_at = Column(
-            DateTime, default=lambda: datetime.now(timezone.utc))
+            timestamp, default=lambda: datetime.now(timezone.utc))
 
     def __init__(self, *args, **kwargs):
         """Initialization of the base model"""
@@ -36,12 +40,12 @@ class BaseModel:
                     setattr(self, key, value)
             if kwargs.get("created_at", None) and type(self.created_at) is str:
                 self.created_at = datetime.strptime(kwargs["created_at"], time)
-            else:
+            elif type(kwargs.get("created_at", None)) is not datetime:
                 self.created_at = datetime.now(timezone.utc)
             if kwargs.get("updated_at", None) and type(self.updated_at) is str:
                 self.updated_at = datetime.strptime(
                     kwargs["updated_at"], time).replace(tzinfo=timezone.utc)
-            else:
+            elif type(kwargs.get("updated_at", None)) is not datetime:
                 self.updated_at = datetime.now(timezone.utc)
             if kwargs.get("id", None) is None:
                 self.id = str(uuid.uuid4())
@@ -50,6 +54,14 @@ class BaseModel:
             self.created_at = datetime.now(timezone.utc)
             self.updated_at = self.created_at
 
+    if models.storage_t != "db":
+        def __setattr__(self, name, value):
+            """sets an attribute and lets the storage reindex the object"""
+            old_value = self.__dict__.get(name,
+                                          getattr(type(self), name, None))
+            super().__setattr__(name, value)
+            models.storage.notify(self, name, old_value)
+
     def __str__(self):
         """String representation of the BaseModel class"""
         return "[{:s}] ({:s}) {}".format(self.__class__.__name__, self.id,
@@ -61,16 +73,24 @@ class BaseModel:
         models.storage.new(self)
         models.storage.save()
 
-    def to_dict(self, save_to_disk=False):
-        """returns a dictionary containing all keys/values of the instance"""
-        new_dict = self.__dict__.copy()
+    def to_dict(self, save_to_disk=False, fields=None):
+        """returns a dictionary containing all keys/values of the instance,
+        or only the attributes named in fields"""
+        if fields is None:
+            new_dict = self.__dict__.copy()
+        else:
+            new_dict = {name: getattr(self, name, None) for name in fields}
         if "created_at" in new_dict:
             new_dict["created_at"] = new_dict["created_at"].strftime(time)
         if "updated_at" in new_dict:
             new_dict["updated_at"] = new_dict["updated_at"].strftime(time)
-        new_dict["__class__"] = self.__class__.__name__
+        if fields is None:
+            new_dict["__class__"] = self.__class__.__name__
         if "_sa_instance_state" in new_dict:
             del new_dict["_sa_instance_state"]
+            # relationships loaded with the object are not attributes
+            for name in self.__mapper__.relationships.keys():
+                new_dict.pop(name, None)
         if not save_to_disk and "password" in new_dict:
             del new_dict["password"]
         return new_dict
@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""
+Contains the binary snapshot format of FileStorage
+
+A file starts with the magic bytes, followed by one record per object:
+    uint32 length of the rest of the record
+    uint16 length + utf-8 key (<class name>.id)
+    uint8 number of fields, then for each field
+        uint8 length + utf-8 name, one type tag byte and the value
+Values are typed: int64, float64, length-prefixed utf-8 strings, lists,
+and datetimes as int64 microseconds since the epoch, so loading needs
+neither JSON parsing nor strptime.
+"""
+
+from datetime import datetime, timedelta, timezone
+import json
+import struct
+
+magic = b"HBNB\x01"
+epoch = datetime(1970, 1, 1)
+epoch_utc = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+u8 = struct.Struct("<B")
+u16 = struct.Struct("<H")
+u32 = struct.Struct("<I")
+i64 = struct.Struct("<q")
+f64 = struct.Struct("<d")
+one_us = timedelta(microseconds=1)
+
+
+def encode(key, record):
+    """returns the bytes of the record of key, length prefix included"""
+    parts = [u16.pack(len(key.encode())), key.encode(), u8.pack(len(record))]
+    for name, value in record.items():
+        name = name.encode()
+        parts.append(u8.pack(len(name)))
+        parts.append(name)
+        encode_value(value, parts)
+    body = b"".join(parts)
+    return u32.pack(len(body)) + body
+
+
+def encode_value(value, parts):
+    """appends the type tag and the bytes of value to parts"""
+    if value is None:
+        parts.append(b"n")
+    elif value is True:
+        parts.append(b"t")
+    elif value is False:
+        parts.append(b"f")
+    elif type(value) is int:
+        parts.append(b"i" + i64.pack(value))
+    elif type(value) is float:
+        parts.append(b"d" + f64.pack(value))
+    elif type(value) is str:
+        value = value.encode()
+        parts.append(b"s" + u32.pack(len(value)))
+        parts.append(value)
+    elif type(value) is datetime:
+        if value.tzinfo is None:
+            parts.append(b"T" + i64.pack((value - epoch) // one_us))
+        else:
+            parts.append(b"Z" + i64.pack((value - epoch_utc) // one_us))
+    elif type(value) is list:
+        parts.append(b"l" + u32.pack(len(value)))
+        for item in value:
+            encode_value(item, parts)
+    else:
+        value = json.dumps(value).encode()
+        parts.append(b"j" + u32.pack(len(value)))
+        parts.append(value)
+
+
+def decode(body):
+    """returns the key and the record dict of a record body"""
+    size, = u16.unpack_from(body, 0)
+    pos = 2 + size
+    key = body[2:pos].decode()
+    count = body[pos]
+    pos += 1
+    record = {}
+    for _ in range(count):
+        size = body[pos]
+        name = body[pos + 1:pos + 1 + size].decode()
+        record[name], pos = decode_value(body, pos + 1 + size)
+    return key, record
+
+
+def decode_value(body, pos):
+    """returns the value at pos in body and the position after it"""
+    tag = body[pos]
+    pos += 1
+    if tag == 115:  # s
+        size, = u32.unpack_from(body, pos)
+        return body[pos + 4:pos + 4 + size].decode(), pos + 4 + size
+    if tag == 84:  # T
+        us, = i64.unpack_from(body, pos)
+        return epoch + timedelta(microseconds=us), pos + 8
+    if tag == 90:  # Z
+        us, = i64.unpack_from(body, pos)
+        return epoch_utc + timedelta(microseconds=us), pos + 8
+    if tag == 105:  # i
+        return i64.unpack_from(body, pos)[0], pos + 8
+    if tag == 100:  # d
+        return f64.unpack_from(body, pos)[0], pos + 8
+    if tag == 110:  # n
+        return None, pos
+    if tag == 116:  # t
+        return True, pos
+    if tag == 102:  # f
+        return False, pos
+    if tag == 108:  # l
+        count, = u32.unpack_from(body, pos)
+        pos += 4
+        items = []
+        for _ in range(count):
+            item, pos = decode_value(body, pos)
+            items.append(item)
+        return items, pos
+    if tag == 106:  # j
+        size, = u32.unpack_from(body, pos)
+        return json.loads(body[pos + 4:pos + 4 + size]), pos + 4 + size
+    raise ValueError("Unknown type tag {!r} in binary snapshot".format(
+        chr(tag)))
+
+
+def items(f):
+    """yields the (key, record) pairs of the binary file f, after magic"""
+    while True:
+        header = f.read(4)
+        if not header:
+            return
+        if len(header) < 4:
+            raise ValueError("Truncated record in binary snapshot")
+        size, = u32.unpack(header)
+        body = f.read(size)
+        if len(body) < size:
+            raise ValueError("Truncated record in binary snapshot")
+        yield decode(body)
@@ -3,12 +3,24 @@
 Contains the class DBStorage
 """
 
+from collections import OrderedDict
+from datetime import datetime, timezone
+from itertools import chain
 from os import getenv
-from sqlalchemy import create_engine
+import threading
+from time import monotonic
+from sqlalchemy import and_, create_engine, false, func, make_url, or_, orm
+from sqlalchemy import update
+from sqlalchemy.exc import InvalidRequestError, OperationalError
 from sqlalchemy.orm import scoped_session, sessionmaker
 from models.amenity import Amenity
 from models.base_model import Base
 from models.city import City
+from models.engine.geo import bounding_box, distance, max_distance, nearest
+from models.engine.pool import MeteredQueuePool
+from models.engine.query import (operators, parse_fields, parse_filters,
+                                 parse_order)
+from models.engine.replicas import Router, RoutingSession
 from models.place import Place
 from models.review import Review
 from models.state import State
@@ -16,6 +28,8 @@ from models.user import User
 
 classes = {"Amenity": Amenity, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# loading strategy of a load hint -> sqlalchemy.orm loader option
+loaders = {"selectin": "selectinload", "joined": "joinedload"}
 
 
 class DBStorage:
@@ -30,20 +44,94 @@ class DBStorage:
         HBNB_MYSQL_HOST = getenv('HBNB_MYSQL_HOST')
         HBNB_MYSQL_DB = getenv('HBNB_MYSQL_DB')
         HBNB_ENV = getenv('HBNB_ENV')
-        self.__engine = create_engine('mysql+mysqldb://{}:{}@{}/{}'.
-                                      format(HBNB_MYSQL_USER,
-                                             HBNB_MYSQL_PWD,
-                                             HBNB_MYSQL_HOST,
-                                             HBNB_MYSQL_DB))
+        # seconds a count stays cached, so /stats does not hit every table
+        self.__count_ttl = float(getenv('HBNB_COUNT_TTL', '2'))
+        self.__counts = {}
+        self.__geo_reach = float(getenv('HBNB_GEO_REACH', '10'))
+        self.__generations = {}
+        # class name -> number of saves that changed its objects in this
+        # process: a change within the precision of updated_at (a second
+        # in MySQL) leaves the number of rows and the latest updated_at
+        # read by generation as they were
+        self.__saves = {}
+        self.__saves_lock = threading.Lock()
+        # LRU cache of the objects get fetched, shared by all the threads
+        # and sessions, emptied by save
+        self.__cache_size = int(getenv('HBNB_GET_CACHE', '256'))
+        self.__cache = OrderedDict()
+        self.__cache_lock = threading.Lock()
+        # HBNB_DB_URL replaces the MySQL settings, e.g. with sqlite:///...
+        url = getenv('HBNB_DB_URL') or 'mysql+mysqldb://{}:{}@{}/{}'.format(
+            HBNB_MYSQL_USER, HBNB_MYSQL_PWD, HBNB_MYSQL_HOST, HBNB_MYSQL_DB)
+        self.__engine = create_engine(url, **self.__pool_options(url))
+        # HBNB_DB_REPLICA_URLS: comma separated URLs of read replicas,
+        # each skipped HBNB_DB_REPLICA_RETRY seconds after it failed
+        replicas = [create_engine(replica, **self.__pool_options(replica))
+                    for replica in
+                    getenv('HBNB_DB_REPLICA_URLS', '').split(',')
+                    if replica.strip()]
+        self.__router = Router(replicas,
+                               float(getenv('HBNB_DB_REPLICA_RETRY', '30')))
         if HBNB_ENV == "test":
             Base.metadata.drop_all(self.__engine)
 
-    def all(self, cls=None):
-        """query on the current database session"""
+    @staticmethod
+    def __pool_options(url):
+        """returns the create_engine pool arguments set in the environment
+
+        HBNB_DB_POOL_SIZE, HBNB_DB_MAX_OVERFLOW and HBNB_DB_POOL_TIMEOUT
+        (seconds) size the pool, HBNB_DB_POOL_RECYCLE replaces connections
+        older than that many seconds and HBNB_DB_PRE_PING=0 turns off the
+        liveness check made on each checkout.
+        """
+        options = {"pool_pre_ping": getenv('HBNB_DB_PRE_PING', '1') == '1'}
+        if getenv('HBNB_DB_POOL_RECYCLE'):
+            options["pool_recycle"] = int(getenv('HBNB_DB_POOL_RECYCLE'))
+        url = make_url(url)
+        if url.get_backend_name() == "sqlite" and \
+                url.database in (None, "", ":memory:"):
+            # one in-memory database per connection: keep SQLite's pool
+            return options
+        options["poolclass"] = MeteredQueuePool
+        for option, name, convert in (
+                ("pool_size", 'HBNB_DB_POOL_SIZE', int),
+                ("max_overflow", 'HBNB_DB_MAX_OVERFLOW', int),
+                ("pool_timeout", 'HBNB_DB_POOL_TIMEOUT', float)):
+            if getenv(name):
+                options[option] = convert(getenv(name))
+        return options
+
+    def pool_stats(self):
+        """returns the statistics of the connection pool, with the ones
+        of the replica pools under "replicas" if there are any"""
+        stats = self.__pool_stats(self.__engine)
+        if self.__router.replicas:
+            stats["replicas"] = [self.__pool_stats(engine)
+                                 for engine in self.__router.replicas]
+        return stats
+
+    @staticmethod
+    def __pool_stats(engine):
+        """returns the statistics of the pool of engine"""
+        if isinstance(engine.pool, MeteredQueuePool):
+            return engine.pool.stats()
+        return {"status": engine.pool.status()}
+
+    def all(self, cls=None, load=()):
+        """query on the current database session
+
+        load names relationships of cls to load with the objects, in one
+        query per relationship, e.g. ("cities", "places.reviews"); prefix
+        a name with "joined:" to load it in the same query instead.
+        """
         new_dict = {}
         for clss in classes:
-            if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
+            if cls is None or cls is classes[clss] or cls == clss:
+                query = self.__session.query(classes[clss])
+                if cls is not None and load:
+                    query = query.options(
+                        *self.__options(classes[clss], load))
+                objs = self.__read(query.all)
                 for obj in objs:
                     key = obj.__class__.__name__ + '.' + obj.id
                     new_dict[key] = obj
@@ -51,44 +139,358 @@ class DBStorage:
 
     def new(self, obj):
         """add the object to the current database session"""
+        self.__session.info["primary"] = True
         self.__session.add(obj)
+        self.__change(obj.__class__.__name__)
+        self.__uncache(obj)
 
     def save(self):
         """commit all changes of the current database session"""
-        self.__session.commit()
+        session = self.__session
+        changed = session.info.pop("changed", set())
+        changed.update(obj.__class__.__name__ for obj in
+                       chain(session.new, session.dirty, session.deleted))
+        session.commit()
+        with self.__saves_lock:
+            for clss in changed:
+                self.__saves[clss] = self.__saves.get(clss, 0) + 1
+        self.__counts.clear()
+        self.__generations.clear()
+        with self.__cache_lock:
+            self.__cache.clear()
 
     def delete(self, obj=None):
         """delete from the current database session obj if not None"""
         if obj is not None:
+            self.__session.info["primary"] = True
+            self.__session.delete(obj)
+            self.__change(obj.__class__.__name__)
+            self.__uncache(obj)
+
+    def new_many(self, objs):
+        """add all the objects to the current database session
+
+        They are inserted by the next save in batched INSERT statements.
+        """
+        objs = list(objs)
+        self.__session.info["primary"] = True
+        self.__session.add_all(objs)
+        for obj in objs:
+            self.__change(obj.__class__.__name__)
+            self.__uncache(obj)
+
+    def delete_many(self, objs):
+        """delete all the objects from the current database session
+
+        They are deleted by the next save in executemany DELETE statements.
+        """
+        self.__session.info["primary"] = True
+        for obj in objs:
             self.__session.delete(obj)
+            self.__change(obj.__class__.__name__)
+            self.__uncache(obj)
+
+    def update_many(self, cls, rows):
+        """set the attributes of the objects of cls, one dictionary per
+        object holding its id and the new values
+
+        The rows are sent as one executemany UPDATE by primary key, made
+        permanent by the next save; the updated attributes of the objects
+        already loaded are expired so they read the new values.
+        """
+        for clss in classes:
+            if cls is classes[clss] or cls == clss:
+                break
+        else:
+            return
+        cls = classes[clss]
+        now = datetime.now(timezone.utc)
+        rows = [dict(row) if "updated_at" in row
+                else dict(row, updated_at=now) for row in rows]
+        if not rows:
+            return
+        self.__session.info["primary"] = True
+        self.__session.execute(update(cls), rows)
+        self.__change(clss)
+        for row in rows:
+            obj = self.__session.identity_map.get(
+                self.__session.identity_key(cls, row["id"]))
+            if obj is not None:
+                self.__session.expire(obj, [name for name in row
+                                            if name != "id"])
+        with self.__cache_lock:
+            for row in rows:
+                self.__cache.pop("{}.{}".format(clss, row["id"]), None)
 
     def reload(self):
         """reloads data from the database"""
         Base.metadata.create_all(self.__engine)
-        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False)
+        sess_factory = sessionmaker(bind=self.__engine, expire_on_commit=False,
+                                    class_=RoutingSession,
+                                    router=self.__router)
         Session = scoped_session(sess_factory)
         self.__session = Session
+        with self.__cache_lock:
+            self.__cache.clear()
 
     def close(self):
         """call remove() method on the private session attribute"""
         self.__session.remove()
 
-    def get(self, cls, id):
-        """Method to retrieve one object"""
+    def __read(self, run):
+        """returns run(), a read-only operation of the session
+
+        Reads go to a replica until the session writes (see
+        RoutingSession); if the replica fails, it is skipped for a while
+        and run is retried on the next replica or on the primary.
+        """
+        info = self.__session.info
+        info.pop("replica", None)
+        try:
+            return run()
+        except OperationalError:
+            replica = info.pop("replica", None)
+            if replica is None:
+                raise
+            self.__router.fail(replica)
+            self.__session.rollback()
+            return run()
+
+    def get(self, cls, id, load=()):
+        """Method to retrieve one object
+
+        The object is fetched by primary key, and the last HBNB_GET_CACHE
+        objects fetched are served again without a query. load names the
+        relationships to load with it, as for all.
+        """
         for clss in classes:
-            if cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    if id == obj.id:
-                        return (obj)
-        return None
+            if cls is classes[clss] or cls == clss:
+                break
+        else:
+            return None
+        if load:
+            cls = classes[clss]
+            return self.__read(self.__session.query(cls).options(
+                *self.__options(cls, load)).filter(cls.id == id).first)
+        key = "{}.{}".format(clss, id)
+        with self.__cache_lock:
+            obj = self.__cache.get(key)
+            if obj is not None:
+                self.__cache.move_to_end(key)
+        if obj is not None:
+            if obj in self.__session:
+                return obj
+            try:
+                # cached by another session: attach a copy without a query
+                return self.__session.merge(obj, load=False)
+            except InvalidRequestError:
+                self.__uncache(obj)
+        obj = self.__read(lambda: self.__session.get(classes[clss], id))
+        if obj is not None and self.__cache_size > 0:
+            with self.__cache_lock:
+                self.__cache[key] = obj
+                if len(self.__cache) > self.__cache_size:
+                    self.__cache.popitem(last=False)
+        return obj
+
+    def query(self, cls, filters=None, order_by=None, limit=None, offset=0,
+              cursor=None, load=(), fields=None):
+        """returns the objects of cls that match filters, sorted by order_by
+        (see models/engine/query.py)
+
+        The filters, order, cursor (id of the last object of the previous
+        page), offset and limit are sent as WHERE, ORDER BY, OFFSET and
+        LIMIT; load names relationships to load, as for all, and fields
+        the only columns to load (the others load when first read).
+        """
+        for clss in classes:
+            if cls is classes[clss] or cls == clss:
+                break
+        else:
+            return []
+        cls = classes[clss]
+        order = parse_order(cls, order_by)
+        query = self.__where(self.__session.query(cls), cls, filters)
+        if cursor is not None:
+            last = self.get(cls, cursor)
+            if last is None:
+                raise ValueError("Unknown cursor: {}".format(cursor))
+            query = query.filter(self.__after(cls, order, last))
+        query = query.order_by(*[getattr(cls, name).desc() if descending
+                                 else getattr(cls, name).asc()
+                                 for name, descending in order])
+        if load:
+            query = query.options(*self.__options(cls, load))
+        fields = parse_fields(cls, fields)
+        if fields is not None:
+            query = query.options(orm.load_only(
+                *[getattr(cls, name) for name in fields]))
+        if offset:
+            query = query.offset(offset)
+        if limit is not None:
+            query = query.limit(limit)
+        return self.__read(query.all)
+
+    def iterate(self, cls, filters=None, fields=None, batch=1000):
+        """returns an iterator over the objects of cls that match filters,
+        sorted by id (see query)
+
+        The rows are streamed from the database batch at a time, so the
+        objects are not all in memory at once. The filters and fields are
+        checked at once, but the query runs in the session current when
+        the first object is read, and the iterator must be closed (or
+        used up) before that session is.
+        """
+        for clss in classes:
+            if cls is classes[clss] or cls == clss:
+                break
+        else:
+            return iter(())
+        cls = classes[clss]
+        parse_filters(cls, filters)
+        fields = parse_fields(cls, fields)
+
+        def objects():
+            """yields the objects, read from the current session"""
+            query = self.__where(self.__session.query(cls), cls, filters)
+            if fields is not None:
+                query = query.options(orm.load_only(
+                    *[getattr(cls, name) for name in fields]))
+            yield from query.order_by(cls.id).yield_per(batch)
+        return objects()
+
+    @staticmethod
+    def __where(query, cls, filters):
+        """returns query narrowed to the objects of cls matching filters"""
+        for name, op, value in parse_filters(cls, filters):
+            column = getattr(cls, name)
+            query = query.filter(column.in_(value) if op == "in"
+                                 else operators[op](column, value))
+        return query
+
+    @staticmethod
+    def __after(cls, order, last):
+        """returns the condition of the rows sorting after last in order,
+        NULL first as in MySQL"""
+        clauses, same = [], []
+        for name, descending in order:
+            column, value = getattr(cls, name), getattr(last, name)
+            if value is None:
+                after = false() if descending else column.isnot(None)
+                equal = column.is_(None)
+            else:
+                after = or_(column < value, column.is_(None)) \
+                    if descending else column > value
+                equal = column == value
+            clauses.append(and_(*same, after))
+            same.append(equal)
+        return or_(*clauses)
+
+    @staticmethod
+    def __options(cls, load):
+        """returns the loader options of the relationship paths in load"""
+        options = []
+        for hint in load:
+            strategy, _, path = hint.rpartition(":")
+            loader = loaders[strategy or "selectin"]
+            option, owner = orm, cls
+            for name in path.split("."):
+                relationship = getattr(owner, name)
+                option = getattr(option, loader)(relationship)
+                owner = relationship.property.mapper.class_
+            options.append(option)
+        return options
+
+    def __uncache(self, obj):
+        """drops obj from the cache of get"""
+        with self.__cache_lock:
+            self.__cache.pop("{}.{}".format(obj.__class__.__name__, obj.id),
+                             None)
 
     def count(self, cls=None):
         """count the number of objects in storage"""
         count = 0
         for clss in classes:
             if cls is None or cls is classes[clss] or cls is clss:
-                objs = self.__session.query(classes[clss]).all()
-                for obj in objs:
-                    count += 1
+                count += self.__count(clss)
         return (count)
+
+    def __count(self, clss):
+        """SELECT COUNT(*) for one class, cached for HBNB_COUNT_TTL seconds"""
+        expires, count = self.__counts.get(clss, (0, 0))
+        now = monotonic()
+        if expires <= now:
+            count = self.__read(self.__session.query(
+                func.count(classes[clss].id)).scalar)
+            self.__counts[clss] = (now + self.__count_ttl, count)
+        return count
+
+    def generation(self, cls):
+        """returns the version of the objects of cls, which changes
+        whenever one of them is added, changed or deleted
+
+        It counts the saves of this process that changed objects of cls,
+        so none goes unnoticed here, and adds the number of rows and the
+        latest updated_at read from the database, which tell the changes
+        of other processes, except those made within the precision of the
+        updated_at column. As counts, those are cached for HBNB_COUNT_TTL
+        seconds, or until this storage changes the objects of cls.
+        """
+        for clss in classes:
+            if cls is classes[clss] or cls == clss:
+                break
+        else:
+            return None
+        expires, rows = self.__generations.get(clss, (0, None))
+        now = monotonic()
+        if expires <= now:
+            cls = classes[clss]
+            count, latest = self.__read(self.__session.query(
+                func.count(cls.id), func.max(cls.updated_at)).one)
+            rows = "{}-{}".format(count, latest)
+            self.__generations[clss] = (now + self.__count_ttl, rows)
+        return "{}-{}".format(self.__saves.get(clss, 0), rows)
+
+    def near(self, latitude, longitude, radius=None, limit=None):
+        """returns the (distance, place) pairs of the places within radius
+        kilometers of latitude, longitude, nearest first, at most limit
+        of them (see models/engine/geo.py)
+
+        Only the places in a bounding box are read, through the index on
+        (latitude, longitude); without a radius, the box starts at
+        HBNB_GEO_REACH kilometers and grows until it holds limit places.
+        """
+        if limit is not None and limit < 1:
+            return []
+        if radius is not None:
+            reach = radius
+        elif limit is not None:
+            reach = self.__geo_reach
+        else:
+            reach = max_distance
+        while True:
+            (lat_min, lat_max), ranges = bounding_box(latitude, longitude,
+                                                      reach)
+            query = self.__session.query(Place).filter(
+                Place.latitude.between(lat_min, lat_max),
+                or_(*[Place.longitude.between(lng_min, lng_max)
+                      for lng_min, lng_max in ranges]))
+            found = nearest([(distance(latitude, longitude, place.latitude,
+                                       place.longitude), place)
+                             for place in self.__read(query.all)],
+                            reach, limit)
+            if radius is not None or limit is None or \
+                    len(found) >= limit or reach >= max_distance:
+                return found
+            reach = min(reach * 4, max_distance)
+
+    def __change(self, clss):
+        """records that the session changes objects of the class clss,
+        whose generation the next save bumps"""
+        self.__session.info.setdefault("changed", set()).add(clss)
+        self.__forget(clss)
+
+    def __forget(self, clss):
+        """drops the cached count and generation of the class clss"""
+        self.__counts.pop(clss, None)
+        self.__generations.pop(clss, None)
@@ -3,17 +3,39 @@
 Contains the FileStorage class
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import heapq
+import io
+from itertools import islice
 import json
+from operator import attrgetter
+from os import fsync, getenv, makedirs, path, remove, replace, scandir, stat
+import threading
+from uuid import uuid4
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
-from models.place import Place
+from models.engine import binary_format, json_stream, shards
+from models.engine.flusher import Flusher
+from models.engine.geo import GridIndex
+from models.engine.query import (SortKey, matches, parse_fields,
+                                 parse_filters, parse_order)
+from models.engine.ranges import RangeIndex, number, range_operators, text
+from models.engine.rwlock import ReadWriteLock
+from models.place import Place, range_attributes
 from models.review import Review
 from models.state import State
 from models.user import User
 
 classes = {"Amenity": Amenity, "BaseModel": BaseModel, "City": City,
            "Place": Place, "Review": Review, "State": State, "User": User}
+# attributes FileStorage keeps a reverse index on
+foreign_keys = ("state_id", "city_id", "place_id", "user_id")
+# list attributes FileStorage keeps a reverse index on, by each item
+list_keys = ("amenity_ids",)
+# attributes of the position of a place
+geo_attributes = ("latitude", "longitude")
 
 
 class FileStorage:
@@ -23,81 +45,730 @@ class FileStorage:
     __file_path = "file.json"
     # dictionary - empty but will store all objects by <class name>.id
     __objects = {}
+    # dictionary - the same objects keyed by <class name> then by id
+    __index = {}
+    # dictionary - <class name>.<foreign key> -> key value -> id -> object
+    __relations = {}
+    # GridIndex - the places by position, in cells of HBNB_GEO_CELL degrees
+    __geo = GridIndex(float(getenv("HBNB_GEO_CELL", "0.1")))
+    # dictionary - range attribute -> RangeIndex of the places by its value
+    __ranges = {name: RangeIndex(name) for name in range_attributes}
+    # dictionary - <class name> -> RangeIndex of its objects by id, which
+    # query and iterate walk in id order
+    __ids = {}
+    # string - directory of the sharded layout, one file per class (and
+    # bucket), used instead of __file_path when set
+    __shard_dir = getenv("HBNB_FILE_DIR")
+    # int - number of files each class is split into by a hash of the id
+    __buckets = int(getenv("HBNB_FILE_BUCKETS", "1"))
+    # set - shard files holding objects changed since the last snapshot
+    __touched = set()
+    # bool - write snapshots in the binary format instead of JSON; the
+    # format of a file is detected when it is read
+    __binary = getenv("HBNB_FILE_FORMAT") == "binary"
+    # float - seconds a background thread waits to coalesce saves; 0
+    # writes synchronously in save()
+    __flush_window = float(getenv("HBNB_FLUSH_WINDOW", "0"))
+    # bool - fsync every file written before it replaces the old one
+    __fsync = getenv("HBNB_FLUSH_FSYNC") == "1"
+    # Flusher - the background writer, started by the first save
+    __flusher = None
+    # locks - __lock guards the objects and their indexes: many threads
+    # may read them at once, writers hold it alone; __io_lock orders the
+    # writes to the files
+    __lock = ReadWriteLock()
+    __io_lock = threading.Lock()
+    # bool - append changes to a log next to the snapshot on save
+    __journal = getenv("HBNB_FILE_JOURNAL") == "1"
+    # dictionary - <class name>.id -> object, or None once deleted, changed
+    # since the last save
+    __changes = {}
+    # dictionary - <class name>.id -> JSON text of the object as last
+    # saved, reused by save for objects absent from __changes
+    __encoded = {}
+    # int - number of records in the log since the last full snapshot
+    __log_size = 0
+    # int - bytes of the log already applied to __objects
+    __log_offset = 0
+    # dictionary - path -> (inode, size, mtime) of the snapshot files and
+    # of the log as of the last reload or save, so close() can skip
+    # unchanged files
+    __signature = None
+    # string - random token of this process, so the generations of
+    # another run never match the ones of this run
+    __epoch = uuid4().hex
+    # dictionary - <class name> -> number of changes to its objects
+    __generations = {}
 
-    def all(self, cls=None):
-        """returns the dictionary __objects"""
-        if cls is not None:
-            new_dict = {}
-            for key, value in self.__objects.items():
-                if cls == value.__class__ or cls == value.__class__.__name__:
-                    new_dict[key] = value
-            return new_dict
-        return self.__objects
+    @staticmethod
+    def _class_name(cls):
+        """returns the class name for cls given as a class or a string"""
+        if isinstance(cls, str):
+            return cls
+        return cls.__name__
+
+    def all(self, cls=None, load=()):
+        """returns a copy of the dictionary __objects, safe to iterate
+        while other threads change the storage
+
+        load is accepted for DBStorage compatibility: relationships are
+        read from the indexes, never loaded.
+        """
+        with self.__lock.read():
+            if cls is not None:
+                name = self._class_name(cls)
+                prefix = name + "."
+                return {prefix + id: obj
+                        for id, obj in self.__index.get(name, {}).items()}
+            return self.__objects.copy()
 
     def new(self, obj):
         """sets in __objects the obj with key <obj class name>.id"""
-        if obj is not None:
-            key = obj.__class__.__name__ + "." + obj.id
-            self.__objects[key] = obj
+        if obj is None:
+            return
+        name = obj.__class__.__name__
+        with self.__lock.write():
+            old = self.__index.get(name, {}).get(obj.id)
+            if old is not None and old is not obj:
+                self.__unlink(old)
+            self.__objects[name + "." + obj.id] = obj
+            self.__index.setdefault(name, {})[obj.id] = obj
+            self.__ids.setdefault(name, RangeIndex("id", valid=text)).add(obj)
+            self.__link(obj)
+            self.__changes[name + "." + obj.id] = obj
+            self.__bump(name)
 
     def save(self):
-        """serializes __objects to the JSON file (path: __file_path)"""
-        json_objects = {}
-        for key in self.__objects:
-            json_objects[key] = self.__objects[key].to_dict()
-        with open(self.__file_path, 'w') as f:
-            json.dump(json_objects, f)
-
-    def reload(self):
-        """deserializes the JSON file to __objects"""
+        """serializes __objects to the JSON file (path: __file_path)
+
+        Only the objects changed since the last save are encoded again:
+        changes are tracked through new, delete and attribute assignment,
+        so in-place mutations (e.g. list.append) need a reassignment to
+        be saved. In journal mode only those objects are appended to the
+        log, until the log outgrows the snapshot and is compacted into it.
+        With HBNB_FLUSH_WINDOW set, the write is left to a background
+        thread that coalesces the saves made within that many seconds.
+        """
+        if self.__flush_window > 0:
+            with self.__lock.write():
+                if self.__flusher is None:
+                    FileStorage.__flusher = Flusher(self.__persist,
+                                                    self.__flush_window)
+            self.__flusher.request()
+        else:
+            self.__persist()
+
+    def flush(self):
+        """writes now what a background flush has not written yet"""
+        if self.__flusher is not None:
+            self.__flusher.flush()
+
+    def compact(self):
+        """writes the objects to the snapshot and empties the log
+
+        In the sharded layout only the shards holding an object changed
+        since the last snapshot are written.
+        """
+        self.__persist(compact=True)
+
+    def __persist(self, compact=False):
+        """writes the changes to the log, or the snapshot when compacting
+
+        The data is prepared under __lock but written under __io_lock
+        only: other threads keep changing objects during the write, while
+        writes still reach the files in the order they were prepared.
+        """
+        with self.__lock.write():
+            if not compact and self.__journal and \
+                    self.__log_size < max(len(self.__objects), 1000):
+                write, batch = self.__append, self.__log_batch()
+            else:
+                write, batch = self.__replace, self.__snapshot_batch()
+            self.__io_lock.acquire()
+        try:
+            write(batch)
+        finally:
+            self.__io_lock.release()
+
+    def reload(self, paths=None):
+        """deserializes the JSON file, then the log, to __objects
+
+        Records are parsed one at a time, and only the ones that differ
+        from the object already in memory are instantiated again. paths
+        limits which snapshot files are read; shards are read concurrently.
+        """
+        with self.__lock.write():
+            FileStorage.__signature = self.__stat()
+            if paths is None:
+                paths = self.__snapshots()
+            if len(paths) > 1:
+                with ThreadPoolExecutor() as pool:
+                    loaded = list(pool.map(self.__read, paths))
+            else:
+                loaded = map(self.__read, paths)
+            for path, (objs, keys) in zip(paths, loaded):
+                for obj in objs:
+                    self.__store(obj.__class__.__name__ + "." + obj.id, obj)
+                if keys is not None:
+                    self.__prune(path, keys)
+            FileStorage.__log_size = 0
+            FileStorage.__log_offset = 0
+            self.__replay()
+
+    def __read(self, path):
+        """returns the objects of the snapshot file path that changed and
+        the keys it holds (None if it could not be parsed)"""
+        objs, keys = [], set()
+        try:
+            with open(path, 'rb') as f:
+                binary = f.read(len(binary_format.magic)) == \
+                    binary_format.magic
+                if binary:
+                    records = binary_format.items(f)
+                else:
+                    f.seek(0)
+                    records = json_stream.items(io.TextIOWrapper(f))
+                for key, record in records:
+                    keys.add(key)
+                    obj = self.__objects.get(key)
+                    if obj is None or self.__record(obj, binary) != record:
+                        objs.append(classes[record["__class__"]](**record))
+        except FileNotFoundError:
+            pass
+        except ValueError as e:
+            print(f"Error loading {path}: {e}")
+            keys = None
+        return objs, keys
+
+    def __prune(self, path, keys):
+        """deletes the objects of the snapshot file path that are not in
+        keys any more, i.e. another process deleted them, but not the
+        changes not saved yet"""
+        if self.__shard_dir is None:
+            stale = self.__objects.keys() - keys
+        else:
+            stale = {key for key, obj in self.__group({path})[path]} - keys
+        for key in stale - self.__changes.keys():
+            self.__store(key, None)
+
+    def __snapshot_batch(self):
+        """returns snapshot path -> encoded (key, object) pairs to write"""
+        if self.__shard_dir is None:
+            groups = {self.__file_path: self.__objects.items()}
+        else:
+            self.__touched.update(self.__shard(key)
+                                  for key in self.__changes)
+            groups = self.__group(self.__touched)
+            self.__touched.clear()
+        batch = {}
+        for file, pairs in groups.items():
+            batch[file] = [(json.dumps(key), self.__encode(key, obj))
+                           for key, obj in pairs]
+        self.__changes.clear()
+        FileStorage.__log_size = 0
+        FileStorage.__log_offset = 0
+        return batch
+
+    def __replace(self, batch):
+        """writes each snapshot file of batch, then removes the log"""
+        if self.__shard_dir is not None:
+            makedirs(self.__shard_dir, exist_ok=True)
+        for file, pairs in batch.items():
+            self.__write(file, pairs)
+        try:
+            remove(self.__log_path())
+        except FileNotFoundError:
+            pass
+        FileStorage.__signature = self.__stat()
+
+    def __write(self, file, pairs):
+        """writes the encoded pairs to a temporary file renamed to file,
+        as one JSON object or as a binary snapshot
+
+        Each write gets a temporary file of its own, so processes saving
+        at the same time never write to the same one.
+        """
+        tmp = "{}.{}.tmp".format(file, uuid4().hex)
+        try:
+            self.__write_pairs(tmp, pairs)
+            replace(tmp, file)
+        except BaseException:
+            try:
+                remove(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+
+    def __write_pairs(self, tmp, pairs):
+        """writes the encoded pairs to the new file tmp"""
+        with open(tmp, 'xb' if self.__binary else 'x') as f:
+            if self.__binary:
+                f.write(binary_format.magic)
+                for key, text in pairs:
+                    f.write(text)
+            else:
+                separator = "{"
+                for key, text in pairs:
+                    f.write(separator + key + ": " + text)
+                    separator = ", "
+                f.write("}" if separator == ", " else "{}")
+            if self.__fsync:
+                f.flush()
+                fsync(f.fileno())
+
+    @staticmethod
+    def __record(obj, binary):
+        """returns the record saved for obj, with typed values if binary"""
+        if not binary:
+            return obj.to_dict()
+        record = obj.__dict__.copy()
+        record.pop("_sa_instance_state", None)
+        record["__class__"] = obj.__class__.__name__
+        return record
+
+    def __shard(self, key):
+        """returns the path of the shard file that holds key"""
+        return path.join(self.__shard_dir, shards.name(key, self.__buckets))
+
+    def __group(self, touched):
+        """returns the (key, object) pairs of each shard in touched"""
+        groups = {shard: [] for shard in touched}
+        for cls_name in {shards.class_name(shard) for shard in touched}:
+            for id, obj in self.__index.get(cls_name, {}).items():
+                key = cls_name + "." + id
+                shard = self.__shard(key)
+                if shard in groups:
+                    groups[shard].append((key, obj))
+        return groups
+
+    def __snapshots(self):
+        """returns the paths of the snapshot files"""
+        if self.__shard_dir is None:
+            return [self.__file_path]
+        try:
+            return [entry.path for entry in scandir(self.__shard_dir)
+                    if entry.name.endswith(".json")]
+        except FileNotFoundError:
+            return []
+
+    def __log_path(self):
+        """returns the path of the journal log"""
+        if self.__shard_dir is None:
+            return self.__file_path + ".log"
+        return path.join(self.__shard_dir, shards.log_name)
+
+    def __stat(self):
+        """returns path -> (inode, size, mtime) of the snapshot and log"""
+        signature = {}
+        for file in self.__snapshots() + [self.__log_path()]:
+            try:
+                st = stat(file)
+                signature[file] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except FileNotFoundError:
+                pass
+        return signature
+
+    def __log_batch(self):
+        """returns the log lines of the changed objects and tombstones"""
+        lines = []
+        for key, obj in self.__changes.items():
+            if obj is None:
+                text = "null"
+            elif self.__binary:
+                text = json.dumps(obj.to_dict())
+                self.__encoded.pop(key, None)
+            else:
+                text = self.__encode(key, obj)
+            lines.append("[" + json.dumps(key) + ", " + text + "]\n")
+        FileStorage.__log_size += len(self.__changes)
+        if self.__shard_dir is not None:
+            self.__touched.update(self.__shard(key)
+                                  for key in self.__changes)
+        self.__changes.clear()
+        return "".join(lines).encode()
+
+    def __append(self, data):
+        """appends data to the log"""
+        if not data:
+            return
+        if self.__shard_dir is not None:
+            makedirs(self.__shard_dir, exist_ok=True)
+        with open(self.__log_path(), 'ab') as f:
+            start = f.tell()
+            f.write(data)
+            end = f.tell()
+            if self.__fsync:
+                f.flush()
+                fsync(f.fileno())
+        if start == self.__log_offset:
+            # nobody else appended since our last read: our own write
+            # must not make close() replay the log
+            FileStorage.__log_offset = end
+            FileStorage.__signature = self.__stat()
+
+    def __encode(self, key, obj):
+        """returns the JSON text (or binary record) of obj, encoding it
+        only if it changed"""
+        text = self.__encoded.get(key)
+        if text is None or key in self.__changes:
+            if self.__binary:
+                text = binary_format.encode(key, self.__record(obj, True))
+            else:
+                text = json.dumps(obj.to_dict())
+            self.__encoded[key] = text
+        return text
+
+    def __replay(self):
+        """applies the log records after __log_offset"""
         try:
-            with open(self.__file_path, 'r') as f:
-                jo = json.load(f)
-            for key in jo:
-                self.__objects[key] = classes[jo[key]["__class__"]](**jo[key])
+            with open(self.__log_path(), 'rb') as f:
+                f.seek(self.__log_offset)
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # torn write at the end of the log
+                        break
+                    key, record = json.loads(line)
+                    if record is not None:
+                        record = classes[record["__class__"]](**record)
+                    self.__store(key, record)
+                    if self.__shard_dir is not None:
+                        # not in its shard until the next compaction
+                        self.__touched.add(self.__shard(key))
+                    FileStorage.__log_size += 1
+                    FileStorage.__log_offset += len(line)
         except FileNotFoundError:
             pass
-        except json.JSONDecodeError as e:
-            print(f"Error loading JSON file: {e}")
+
+    def __store(self, key, obj):
+        """stores obj read for key (None deletes it) as already saved"""
+        if obj is None:
+            self.delete(self.__objects.get(key))
+        else:
+            self.new(obj)
+        self.__changes.pop(key, None)
+        self.__encoded.pop(key, None)
 
     def delete(self, obj=None):
         """delete obj from __objects if it’s inside"""
-        if obj is not None:
-            key = obj.__class__.__name__ + '.' + obj.id
-            if key in self.__objects:
-                del self.__objects[key]
+        if obj is None:
+            return
+        name = obj.__class__.__name__
+        key = name + '.' + obj.id
+        with self.__lock.write():
+            # the object stored for the key, which may not be obj itself
+            stored = self.__index.get(name, {}).pop(obj.id, None)
+            self.__objects.pop(key, None)
+            if stored is None:
+                return
+            self.__ids[name].remove(obj.id)
+            self.__unlink(stored)
+            self.__changes[key] = None
+            self.__encoded.pop(key, None)
+            self.__bump(name)
+
+    def new_many(self, objs):
+        """sets in __objects all the objs, to be written by one save"""
+        with self.__lock.write():
+            for obj in objs:
+                self.new(obj)
+
+    def delete_many(self, objs):
+        """deletes all the objs from __objects, to be written by one save"""
+        with self.__lock.write():
+            for obj in objs:
+                self.delete(obj)
+
+    def update_many(self, cls, rows):
+        """sets the attributes of the objects of cls, one dictionary per
+        object holding its id and the new values; ids not stored are
+        skipped, and the changes are written by one save"""
+        now = datetime.now(timezone.utc)
+        with self.__lock.write():
+            for row in rows:
+                obj = self.get(cls, row["id"])
+                if obj is None:
+                    continue
+                for name, value in row.items():
+                    if name not in ("id", "created_at", "__class__"):
+                        setattr(obj, name, value)
+                if "updated_at" not in row:
+                    obj.updated_at = now
 
     def close(self):
-        """call reload() method for deserializing the JSON file to objects"""
-        self.reload()
+        """applies the changes made to the files since the last reload
 
-    def get(self, cls, id):
-        """Method to retrieve one object"""
-        if isinstance(cls, str):
-            clss = classes[cls]
+        Nothing is read when no file changed, only the new log records
+        are read when the log is the only file that grew, and otherwise
+        only the snapshot files that changed are read again. The files are
+        checked before locking, so requests only wait for each other when
+        something changed; the check is skipped while this process is
+        writing the files itself.
+        """
+        if self.__stat() == self.__signature:
+            return
+        with self.__lock.write():
+            if not self.__io_lock.acquire(blocking=False):
+                return
+            try:
+                self.__refresh()
+            finally:
+                self.__io_lock.release()
+
+    def __refresh(self):
+        """reads what changed in the files since the last reload"""
+        signature, last = self.__stat(), self.__signature
+        if signature == last:
+            return
+        if last is None:
+            self.reload()
+            return
+        log_path = self.__log_path()
+        changed = [file for file in set(signature) | set(last)
+                   if file != log_path and
+                   signature.get(file) != last.get(file)]
+        log, last_log = signature.get(log_path), last.get(log_path)
+        if not changed and log is not None and \
+                log[1] >= self.__log_offset and \
+                (last_log is None or log[0] == last_log[0]):
+            FileStorage.__signature = signature
+            self.__replay()
         else:
-            clss = cls.__name__
+            self.reload(changed)
 
-        for k, v in self.__objects.items():
-            class_name = k.split(".")[0]
-            class_id = k.split(".")[1]
-            if class_name == clss and class_id == id:
-                return v
-        return None
+    def get(self, cls, id, load=()):
+        """Method to retrieve one object (load: see all)"""
+        return self.__index.get(self._class_name(cls), {}).get(id)
 
     def count(self, cls=None):
         """count the number of objects in storage"""
-        dict_classes = {}
-        count = 0
         if cls is None:
-            dict_classes = classes
+            with self.__lock.read():
+                return sum(len(objs) for objs in self.__index.values())
+        return len(self.__index.get(self._class_name(cls), {}))
+
+    def query(self, cls, filters=None, order_by=None, limit=None, offset=0,
+              cursor=None, load=(), fields=None):
+        """returns the objects of cls that match filters, sorted by order_by
+        (see models/engine/query.py)
+
+        cursor is the id of the last object of the previous page: the
+        objects sorting after it are returned, minus the first offset
+        ones, up to limit of them. Equality on the id or on a foreign key,
+        and bounds on a range attribute of places, read the candidates
+        from the indexes instead of the whole class; otherwise a limited
+        query sorted by id only reads the objects in id order until
+        enough of them match, so a page costs what it returns.
+        fields is only checked: the objects are all in memory.
+        """
+        name = self._class_name(cls)
+        if name not in classes:
+            return []
+        parse_fields(classes[name], fields)
+        conditions = parse_filters(classes[name], filters)
+        order = parse_order(classes[name], order_by)
+        with self.__lock.read():
+            if cursor is not None:
+                last = self.__index.get(name, {}).get(cursor)
+                if last is None:
+                    raise ValueError("Unknown cursor: {}".format(cursor))
+            candidates = self.__candidates(name, conditions)
+            if candidates is None and limit is not None and \
+                    order == [("id", False)]:
+                if cursor is not None:
+                    conditions.append(("id", "gt", cursor))
+                return list(islice(self.__by_id(name, conditions,
+                                                max(offset + limit, 100)),
+                                   offset, offset + limit))
+            if candidates is None:
+                candidates = self.__index.get(name, {}).values()
+            objs = [obj for obj in candidates if matches(obj, conditions)]
+            if cursor is not None:
+                after = SortKey(last, order)
+                objs = [obj for obj in objs if after < SortKey(obj, order)]
+
+        def key(obj):
+            """returns the sort key of obj"""
+            return SortKey(obj, order)
+        if limit is None:
+            objs.sort(key=key)
         else:
-            if isinstance(cls, str):
-                dict_classes = classes[cls]
-            else:
-                dict_classes = cls.__name__
+            objs = heapq.nsmallest(offset + limit, objs, key=key)
+        return objs[offset:]
+
+    def iterate(self, cls, filters=None, fields=None, batch=1000):
+        """returns an iterator over the objects of cls that match filters,
+        sorted by id (see query)
+
+        Without an index narrowing the filters, the objects are read from
+        the id index batch at a time, each batch under the lock, so the
+        first one comes at once however many follow and writers are not
+        held up until the iterator is done.
+        """
+        name = self._class_name(cls)
+        if name not in classes:
+            return iter(())
+        parse_fields(classes[name], fields)
+        conditions = parse_filters(classes[name], filters)
+        with self.__lock.read():
+            objs = self.__candidates(name, conditions)
+        if objs is None:
+            return self.__by_id(name, conditions, batch)
+        objs.sort(key=attrgetter("id"))
+        return (obj for obj in objs if matches(obj, conditions))
+
+    def __by_id(self, name, conditions, batch):
+        """yields the objects of class name that meet the conditions, by
+        id, reading batch ids of the id index at a time"""
+        bounds = [(op, value) for attribute, op, value in conditions
+                  if attribute == "id" and op in range_operators and
+                  text(value)]
+        last = None
+        while True:
+            with self.__lock.read():
+                ids = self.__ids.get(name)
+                if ids is None:
+                    return
+                chunk = ids.find(bounds if last is None
+                                 else bounds + [("gt", last)], batch)
+                index = self.__index.get(name, {})
+                objs = [obj for obj in map(index.get, chunk)
+                        if obj is not None and matches(obj, conditions)]
+            if not chunk:
+                return
+            yield from objs
+            last = chunk[-1]
+
+    def __candidates(self, name, conditions):
+        """returns the objects of class name the indexes narrow the
+        conditions down to, or None if no index does"""
+        index = self.__index.get(name, {})
+        for attribute, op, value in conditions:
+            if attribute == "id" and op == "eq":
+                return [index[value]] if value in index else []
+            if attribute == "id" and op == "in":
+                return [index[id] for id in dict.fromkeys(value)
+                        if id in index]
+            if attribute in foreign_keys and op == "eq":
+                relation = self.__relations.get(name + "." + attribute, {})
+                return list(relation.get(value, {}).values())
+        if name == "Place":
+            ranges = []
+            for attribute in range_attributes:
+                bounds = [(op, value) for key, op, value in conditions
+                          if key == attribute and op in range_operators and
+                          number(value)]
+                if bounds:
+                    ranges.append((self.__ranges[attribute], bounds))
+            if ranges:
+                # the narrowest range; matches checks the others
+                found, bounds = min(ranges, key=lambda pair:
+                                    pair[0].count(pair[1]))
+                return [index[id] for id in found.find(bounds)]
+        return None
+
+    def generation(self, cls):
+        """returns the version of the objects of cls, which changes
+        whenever one of them is added, changed or deleted"""
+        name = self._class_name(cls)
+        return "{}-{}".format(self.__epoch, self.__generations.get(name, 0))
+
+    def __bump(self, name):
+        """records a change to the objects of class name"""
+        self.__generations[name] = self.__generations.get(name, 0) + 1
+
+    def near(self, latitude, longitude, radius=None, limit=None):
+        """returns the (distance, place) pairs of the places within radius
+        kilometers of latitude, longitude, nearest first, at most limit
+        of them (see models/engine/geo.py)"""
+        with self.__lock.read():
+            return self.__geo.near(latitude, longitude, radius, limit)
+
+    def related(self, cls, foreign_key, value):
+        """returns the objects of cls whose foreign_key attribute is value,
+        or holds value for a list attribute (e.g. amenity_ids)"""
+        relation = self._class_name(cls) + "." + foreign_key
+        with self.__lock.read():
+            return list(self.__relations.get(relation, {}).get(value, {})
+                        .values())
+
+    def related_by_id(self, cls, foreign_key, value):
+        """returns the objects related returns by id, to intersect them
+        without reading their attributes"""
+        relation = self._class_name(cls) + "." + foreign_key
+        with self.__lock.read():
+            return dict(self.__relations.get(relation, {}).get(value, {}))
+
+    def notify(self, obj, name, old_value):
+        """records that attribute name of a stored obj changed value"""
+        cls_name = obj.__class__.__name__
+        id = obj.__dict__.get("id")
+        if self.__index.get(cls_name, {}).get(id) is not obj:
+            return
+        with self.__lock.write():
+            self.__changes[cls_name + "." + id] = obj
+            self.__bump(cls_name)
+            if name in foreign_keys or name in list_keys:
+                relation = self.__relations.setdefault(
+                    cls_name + "." + name, {})
+                for key in self.__keys(name, old_value):
+                    self.__drop(relation, key, obj.id)
+                for key in self.__keys(name, getattr(obj, name)):
+                    relation.setdefault(key, {})[obj.id] = obj
+            if cls_name == "Place" and name in geo_attributes:
+                self.__locate(obj)
+            if cls_name == "Place" and name in range_attributes:
+                self.__ranges[name].add(obj)
+
+    def __link(self, obj):
+        """adds obj to the reverse index of each of its foreign keys"""
+        cls_name = obj.__class__.__name__
+        for name in foreign_keys + list_keys:
+            keys = self.__keys(name, getattr(obj, name, None))
+            if keys:
+                relation = self.__relations.setdefault(
+                    cls_name + "." + name, {})
+                for key in keys:
+                    relation.setdefault(key, {})[obj.id] = obj
+        if cls_name == "Place":
+            self.__locate(obj)
+            for ranges in self.__ranges.values():
+                ranges.add(obj)
+
+    def __locate(self, obj):
+        """indexes the place obj at its position, unless it was given none:
+        the 0.0 defaults of the class are no position, as NULL columns
+        are none for DBStorage"""
+        if all(name in obj.__dict__ for name in geo_attributes):
+            self.__geo.add(obj)
+        else:
+            self.__geo.remove(obj.id)
+
+    def __unlink(self, obj):
+        """removes obj from the reverse index of each of its foreign keys"""
+        cls_name = obj.__class__.__name__
+        for name in foreign_keys + list_keys:
+            relation = self.__relations.get(cls_name + "." + name)
+            if relation is not None:
+                for key in self.__keys(name, getattr(obj, name, None)):
+                    self.__drop(relation, key, obj.id)
+        if cls_name == "Place":
+            self.__geo.remove(obj.id)
+            for ranges in self.__ranges.values():
+                ranges.remove(obj.id)
+
+    @staticmethod
+    def __keys(name, value):
+        """returns the keys the attribute name of value is indexed under:
+        its items for a list attribute, else value unless it is None"""
+        if name in list_keys:
+            return value if isinstance(value, list) else []
+        return [] if value is None else [value]
 
-        for obj in self.__objects:
-            if obj.split(".")[0] in dict_classes:
-                count += 1
-        return count
+    @staticmethod
+    def __drop(relation, value, id):
+        """removes id from the bucket of value in relation"""
+        bucket = relation.get(value)
+        if bucket is not None:
+            bucket.pop(id, None)
+            if not bucket:
+                del relation[value]
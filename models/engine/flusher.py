@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+"""
+Contains the Flusher class
+"""
+
+import atexit
+import threading
+from time import monotonic
+
+
+class Flusher:
+    """coalesces the save requests made within window seconds into one
+    call of flush, run by a background thread"""
+
+    def __init__(self, flush, window):
+        """starts the background thread; pending saves are flushed at exit"""
+        self.__flush = flush
+        self.__window = window
+        self.__condition = threading.Condition()
+        self.__pending = False
+        # whether the background thread is running a flush
+        self.__flushing = False
+        self.__stopped = False
+        self.__error = None
+        self.__thread = threading.Thread(target=self.__run, daemon=True,
+                                         name="storage-flusher")
+        self.__thread.start()
+        atexit.register(self.stop)
+
+    def request(self):
+        """schedules a flush within the window
+
+        Raises the error of the previous background flush, if it failed.
+        """
+        with self.__condition:
+            self.__raise()
+            if self.__stopped:
+                raise RuntimeError("storage flusher is stopped")
+            self.__pending = True
+            self.__condition.notify()
+
+    def flush(self):
+        """runs the pending flush now, in the calling thread, after the
+        background flush in progress if any, so the data is written when
+        it returns"""
+        with self.__condition:
+            while self.__flushing:
+                self.__condition.wait()
+            self.__raise()
+            pending, self.__pending = self.__pending, False
+        if pending:
+            self.__flush()
+
+    def stop(self):
+        """stops the background thread and flushes what is pending"""
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+        self.__thread.join()
+        atexit.unregister(self.stop)
+        self.flush()
+
+    def __raise(self):
+        """raises and forgets the error of the last background flush"""
+        error, self.__error = self.__error, None
+        if error is not None:
+            raise error
+
+    def __run(self):
+        """waits for a request, then the window, then flushes"""
+        while True:
+            with self.__condition:
+                while not self.__pending and not self.__stopped:
+                    self.__condition.wait()
+                if self.__stopped:
+                    return
+                # later requests within the window join this flush
+                deadline = monotonic() + self.__window
+                while not self.__stopped and deadline > monotonic():
+                    self.__condition.wait(deadline - monotonic())
+                if self.__stopped:
+                    return
+                if not self.__pending:
+                    # flushed in the meantime by flush()
+                    continue
+                self.__pending = False
+                self.__flushing = True
+            try:
+                self.__flush()
+            except Exception as e:
+                with self.__condition:
+                    self.__error = e
+            finally:
+                with self.__condition:
+                    self.__flushing = False
+                    self.__condition.notify_all()
@@ -0,0 +1,182 @@
+#!/usr/bin/python3
+"""
+Contains the GridIndex class, which finds the objects near a point, and
+the distance helpers of the near method of the storage engines
+
+Distances are great-circle distances in kilometers; latitudes and
+longitudes are in degrees.
+"""
+
+import heapq
+from math import asin, cos, degrees, floor, radians, sin, sqrt
+
+# mean radius of the Earth, in kilometers
+earth_radius = 6371.0088
+# kilometers per degree of latitude
+km_per_degree = radians(earth_radius)
+# half the circumference of the Earth: no two points are further apart
+max_distance = earth_radius * radians(180)
+
+
+def distance(lat1, lng1, lat2, lng2):
+    """returns the kilometers between two points (haversine formula)"""
+    lat1, lng1, lat2, lng2 = map(radians, (lat1, lng1, lat2, lng2))
+    h = sin((lat2 - lat1) / 2) ** 2 + \
+        cos(lat1) * cos(lat2) * sin((lng2 - lng1) / 2) ** 2
+    return 2 * earth_radius * asin(min(1.0, sqrt(h)))
+
+
+def coordinates(obj):
+    """returns the (latitude, longitude) of obj as floats, or None if it
+    has no valid position"""
+    try:
+        lat, lng = float(obj.latitude), float(obj.longitude)
+    except (AttributeError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return lat, lng
+
+
+def bounding_box(lat, lng, reach):
+    """returns the latitude range and the longitude ranges (two when the
+    box crosses the antimeridian) holding every point within reach
+    kilometers of lat, lng"""
+    angle = reach / earth_radius
+    lat_min, lat_max = lat - degrees(angle), lat + degrees(angle)
+    if lat_min <= -90 or lat_max >= 90 or \
+            sin(angle) >= cos(radians(lat)):
+        return (max(lat_min, -90), min(lat_max, 90)), [(-180, 180)]
+    spread = degrees(asin(sin(angle) / cos(radians(lat))))
+    lng_min, lng_max = lng - spread, lng + spread
+    if lng_min < -180:
+        return (lat_min, lat_max), [(lng_min + 360, 180), (-180, lng_max)]
+    if lng_max > 180:
+        return (lat_min, lat_max), [(lng_min, 180), (-180, lng_max - 360)]
+    return (lat_min, lat_max), [(lng_min, lng_max)]
+
+
+def nearest(found, radius=None, limit=None):
+    """returns the (distance, obj) pairs of found within radius, nearest
+    (then lowest id) first, at most limit of them"""
+    if radius is not None:
+        found = [pair for pair in found if pair[0] <= radius]
+
+    def key(pair):
+        """returns the sort key of a (distance, obj) pair"""
+        return pair[0], pair[1].id
+    if limit is None:
+        return sorted(found, key=key)
+    return heapq.nsmallest(limit, found, key=key)
+
+
+class GridIndex:
+    """indexes objects by position in cells of cell x cell degrees
+
+    A search visits the rings of cells around the point, nearest first,
+    until no object of the next ring can be within the radius or closer
+    than the limit-th object found; when the rings outnumber the
+    non-empty cells, the objects are scanned instead.
+    """
+
+    def __init__(self, cell=0.1):
+        """creates an empty index of cell degrees wide cells"""
+        self.cell = cell
+        self.__columns = max(1, round(360 / cell))
+        self.__rows = (floor(-90 / cell), floor(90 / cell))
+        # dictionary - (row, column) -> id -> (latitude, longitude, obj)
+        self.__cells = {}
+        # dictionary - id -> (row, column) of the cell holding it
+        self.__where = {}
+
+    def __len__(self):
+        """returns the number of objects indexed"""
+        return len(self.__where)
+
+    def __key(self, lat, lng):
+        """returns the (row, column) of the cell of lat, lng"""
+        return floor(lat / self.cell), \
+            floor((lng + 180) / self.cell) % self.__columns
+
+    def add(self, obj):
+        """indexes obj at its position, or unindexes it if it has none"""
+        position = coordinates(obj)
+        if position is None:
+            self.remove(obj.id)
+            return
+        key = self.__key(*position)
+        if self.__where.get(obj.id) != key:
+            self.remove(obj.id)
+            self.__where[obj.id] = key
+        self.__cells.setdefault(key, {})[obj.id] = position + (obj,)
+
+    def remove(self, id):
+        """unindexes the object id"""
+        key = self.__where.pop(id, None)
+        if key is not None:
+            cell = self.__cells[key]
+            del cell[id]
+            if not cell:
+                del self.__cells[key]
+
+    def near(self, lat, lng, radius=None, limit=None):
+        """returns the (distance, obj) pairs of the objects within radius
+        kilometers of lat, lng, nearest first, at most limit of them"""
+        if limit is not None and limit < 1:
+            return []
+        row, column = self.__key(lat, lng)
+        found = []
+        cutoff = max_distance if radius is None else radius
+        ring = 0
+        while True:
+            if (2 * ring + 1) ** 2 > len(self.__cells) or \
+                    2 * ring + 1 >= self.__columns:
+                found = self.__scan(lat, lng)
+                break
+            if self.__bound(lat, ring) > cutoff:
+                break
+            found.extend(self.__ring(lat, lng, row, column, ring))
+            if limit is not None and len(found) >= limit:
+                found = nearest(found, radius, limit)
+                if len(found) == limit:
+                    cutoff = min(cutoff, found[-1][0])
+            ring += 1
+        return nearest(found, radius, limit)
+
+    def __bound(self, lat, ring):
+        """returns the kilometers within which no object of ring, or of
+        the rings beyond, lies
+
+        Those objects are at least gap degrees away in latitude, or in
+        longitude; in the latter case, either they are also gap degrees
+        away in latitude or they are nearer the equator than pole.
+        """
+        if ring < 2:
+            return 0.0
+        gap = (ring - 1) * self.cell
+        pole = min(90.0, abs(lat) + gap)
+        across = 2 * earth_radius * asin(
+            cos(radians(pole)) * sin(radians(min(gap, 180)) / 2))
+        return min(gap * km_per_degree, across)
+
+    def __ring(self, lat, lng, row, column, ring):
+        """returns the (distance, obj) pairs of the cells ring cells away
+        from (row, column)"""
+        found = []
+        for r in range(row - ring, row + ring + 1):
+            if not self.__rows[0] <= r <= self.__rows[1]:
+                continue
+            edge = r in (row - ring, row + ring)
+            step = 1 if edge else 2 * ring or 1
+            for c in range(column - ring, column + ring + 1, step):
+                cell = self.__cells.get((r, c % self.__columns))
+                if cell:
+                    found.extend((distance(lat, lng, y, x), obj)
+                                 for y, x, obj in cell.values())
+        return found
+
+    def __scan(self, lat, lng):
+        """returns the (distance, obj) pairs of every object"""
+        return [(distance(lat, lng, y, x), obj)
+                for cell in self.__cells.values()
+                for y, x, obj in cell.values()]
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the items function, an incremental reader for the JSON object
+FileStorage writes
+"""
+
+import json
+
+decoder = json.JSONDecoder()
+whitespace = " \t\n\r"
+
+
+def items(f, size=1 << 16):
+    """yields the (key, value) pairs of the JSON object in text file f
+
+    The file is read size characters at a time and each value is decoded
+    on its own, so only one record is held as a dict at any time.
+    """
+    buf, pos = fill(f, "", 0, size)
+    if pos == len(buf) or buf[pos] != "{":
+        raise json.JSONDecodeError("Expecting '{'", buf, pos)
+    pos += 1
+    first = True
+    while True:
+        buf, pos = fill(f, buf, skip(buf, pos), size)
+        if pos < len(buf) and buf[pos] == "}":
+            return
+        if not first:
+            if pos == len(buf) or buf[pos] != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter",
+                                           buf, pos)
+            buf, pos = fill(f, buf, skip(buf, pos + 1), size)
+        buf, key, pos = decode(f, buf, pos, size)
+        buf, pos = fill(f, buf, skip(buf, pos), size)
+        if pos == len(buf) or buf[pos] != ":":
+            raise json.JSONDecodeError("Expecting ':' delimiter", buf, pos)
+        buf, pos = fill(f, buf, skip(buf, pos + 1), size)
+        buf, value, pos = decode(f, buf, pos, size)
+        yield key, value
+        first = False
+
+
+def skip(buf, pos):
+    """returns the position of the first non-whitespace character"""
+    while pos < len(buf) and buf[pos] in whitespace:
+        pos += 1
+    return pos
+
+
+def fill(f, buf, pos, size):
+    """drops the consumed part of buf and reads more if pos reached its end
+
+    Returns the new buffer and the position of pos in it.
+    """
+    if pos < len(buf):
+        if pos >= size:
+            return buf[pos:], 0
+        return buf, pos
+    while True:
+        buf = f.read(size)
+        pos = skip(buf, 0)
+        if pos < len(buf) or not buf:
+            return buf, pos
+
+
+def decode(f, buf, pos, size):
+    """decodes the JSON value at pos, reading more of f until it is whole
+
+    Returns the buffer, the value and the position after the value.
+    """
+    while True:
+        try:
+            value, end = decoder.raw_decode(buf, pos)
+            if end < len(buf):
+                return buf, value, end
+        except json.JSONDecodeError:
+            end = None
+        more = f.read(size)
+        if not more:
+            if end is None:
+                # raises the error for the incomplete value
+                decoder.raw_decode(buf, pos)
+            return buf, value, end
+        buf = buf[pos:] + more
+        pos = 0
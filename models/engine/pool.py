@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Contains the MeteredQueuePool class
+"""
+
+import threading
+from time import monotonic
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that keeps statistics on its checkouts and connections"""
+
+    def __init__(self, *args, **kwargs):
+        """creates the pool and starts counting"""
+        super().__init__(*args, **kwargs)
+        self.__lock = threading.Lock()
+        self.__counters = {"checkouts": 0, "timeouts": 0, "connects": 0,
+                           "invalidations": 0}
+        self.__wait = 0.0
+        self.__max_wait = 0.0
+        event.listen(self, "connect", self.__on_connect)
+        event.listen(self, "invalidate", self.__on_invalidate)
+
+    def connect(self):
+        """checks out a connection, timing the wait for it"""
+        start = monotonic()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.__count("timeouts")
+            raise
+        finally:
+            wait = monotonic() - start
+            with self.__lock:
+                self.__counters["checkouts"] += 1
+                self.__wait += wait
+                self.__max_wait = max(self.__max_wait, wait)
+
+    def stats(self):
+        """returns the live state of the pool and its counters
+
+        wait_total and wait_max are in seconds and include the time spent
+        opening and pre-pinging connections.
+        """
+        with self.__lock:
+            stats = dict(self.__counters)
+            stats["wait_total"] = self.__wait
+            stats["wait_max"] = self.__max_wait
+        stats["size"] = self.size()
+        stats["checked_in"] = self.checkedin()
+        stats["checked_out"] = self.checkedout()
+        stats["overflow"] = self.overflow()
+        return stats
+
+    def __count(self, name):
+        """adds one to the counter name"""
+        with self.__lock:
+            self.__counters[name] += 1
+
+    def __on_connect(self, dbapi_connection, connection_record):
+        """counts a new DBAPI connection"""
+        self.__count("connects")
+
+    def __on_invalidate(self, dbapi_connection, connection_record,
+                        exception):
+        """counts a connection discarded as stale or broken"""
+        self.__count("invalidations")
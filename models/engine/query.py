@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the helpers of the query method of the storage engines
+
+Filters map "<attribute>" or "<attribute>__<operator>" to a value, e.g.
+{"city_id": id, "price_by_night__le": 100}; operators are eq (the
+default), ne, lt, le, gt, ge and in (value is a list). order_by is an
+attribute name, or a list of them, prefixed with "-" to sort in
+descending order; objects are sorted by id last, so pages are stable.
+fields names the attributes to load, e.g. ["id", "name"].
+"""
+
+import operator
+
+operators = {"eq": operator.eq, "ne": operator.ne, "lt": operator.lt,
+             "le": operator.le, "gt": operator.gt, "ge": operator.ge,
+             "in": lambda value, values: value in values}
+# attributes of every object, declared on the class in DB mode only
+base_attributes = ("id", "created_at", "updated_at")
+
+
+def parse_filters(cls, filters):
+    """returns the (attribute, operator, value) conditions of filters
+
+    Raises ValueError for an unknown attribute or operator.
+    """
+    conditions = []
+    for key, value in (filters or {}).items():
+        name, _, op = key.partition("__")
+        op = op or "eq"
+        check(cls, name)
+        if op not in operators:
+            raise ValueError("Unknown operator: {}".format(op))
+        if op == "in":
+            value = list(value)
+        conditions.append((name, op, value))
+    return conditions
+
+
+def parse_order(cls, order_by):
+    """returns the (attribute, descending) pairs of order_by, ending
+    with id"""
+    if order_by is None:
+        order_by = []
+    elif isinstance(order_by, str):
+        order_by = [order_by]
+    order = []
+    for name in order_by:
+        descending = name.startswith("-")
+        name = name.lstrip("-")
+        check(cls, name)
+        order.append((name, descending))
+    if "id" not in [name for name, _ in order]:
+        order.append(("id", False))
+    return order
+
+
+def parse_fields(cls, fields):
+    """returns the list of attribute names fields, None for all of them
+
+    Raises ValueError for a name that is not a stored attribute of cls.
+    """
+    if fields is None:
+        return None
+    known = attributes(cls)
+    for name in fields:
+        if name not in known:
+            raise ValueError("Unknown field: {}".format(name))
+    return list(fields)
+
+
+def attributes(cls):
+    """returns the names of the stored attributes of the objects of cls:
+    its columns in DB mode, else its attributes with a default value"""
+    table = getattr(cls, "__table__", None)
+    if table is not None:
+        return set(table.columns.keys())
+    names = set(base_attributes)
+    for klass in cls.__mro__:
+        names.update(name for name, value in vars(klass).items()
+                     if not name.startswith("_") and
+                     isinstance(value, (str, int, float, list)))
+    return names
+
+
+def check(cls, name):
+    """raises ValueError if objects of cls have no attribute name"""
+    if name not in base_attributes and \
+            (name.startswith("_") or not hasattr(cls, name)):
+        raise ValueError("Unknown attribute: {}".format(name))
+
+
+def matches(obj, conditions):
+    """returns whether obj meets all the conditions
+
+    As in SQL, a missing (None) value meets no condition but ne; nor
+    does a value that cannot be compared to the one of the condition
+    (e.g. the text "90" to the number 50).
+    """
+    for name, op, value in conditions:
+        attribute = getattr(obj, name, None)
+        if attribute is None:
+            if op != "ne" or value is None:
+                return False
+            continue
+        try:
+            if not operators[op](attribute, value):
+                return False
+        except TypeError:
+            return False
+    return True
+
+
+class SortKey:
+    """orders objects by their values of the attributes of an order,
+    None first"""
+
+    __slots__ = ("values", "order")
+
+    def __init__(self, obj, order):
+        """reads the values of the attributes of order from obj"""
+        self.values = [getattr(obj, name, None) for name, _ in order]
+        self.order = order
+
+    def __lt__(self, other):
+        """returns whether self sorts before other"""
+        for (_, descending), a, b in zip(self.order, self.values,
+                                         other.values):
+            if a == b:
+                continue
+            if a is None or b is None:
+                return (a is None) != descending
+            return (a > b) if descending else (a < b)
+        return False
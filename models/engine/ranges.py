@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+"""
+Contains the RangeIndex class, which finds the objects whose numeric (or
+other ordered) attribute is within bounds
+"""
+
+from bisect import bisect_left, bisect_right
+import threading
+
+# query operators (see models/engine/query.py) a RangeIndex answers
+range_operators = ("eq", "lt", "le", "gt", "ge")
+
+
+def number(value):
+    """returns whether value is a number a RangeIndex can order: values
+    that are not meet no bound, as in matches (models/engine/query.py)"""
+    return isinstance(value, (int, float)) and value == value
+
+
+def text(value):
+    """returns whether value is a text a RangeIndex can order, e.g. an id"""
+    return isinstance(value, str)
+
+
+class RangeIndex:
+    """indexes objects by the value of one attribute, sorted by (value,
+    id) in blocks of about block objects; valid tells which values are
+    indexed, numbers by default
+
+    A lookup bisects the blocks, then the values in the first and the
+    last of them, so it costs the logarithm of the number of objects
+    plus the number found; a change only shifts the values of one block.
+    The blocks are sorted at the first lookup, so loading objects that
+    are never looked up by range costs little.
+    """
+
+    def __init__(self, attribute, block=1000, valid=number):
+        """creates an empty index of the attribute of the objects"""
+        self.attribute = attribute
+        self.block = block
+        self.valid = valid
+        # dictionary - id -> value of each object indexed
+        self.__values = {}
+        # list - [values, ids] of each block, in (value, id) order, or
+        # None until the first lookup
+        self.__blocks = None
+        # lists - (value, id) of the first object of each block, and value
+        self.__firsts = []
+        self.__floors = []
+        self.__lock = threading.Lock()
+
+    def __len__(self):
+        """returns the number of objects indexed"""
+        return len(self.__values)
+
+    def add(self, obj):
+        """indexes obj at its value, or unindexes it if it is not valid"""
+        value = getattr(obj, self.attribute, None)
+        if not self.valid(value):
+            self.remove(obj.id)
+            return
+        old = self.__values.get(obj.id)
+        if old == value:
+            return
+        self.__values[obj.id] = value
+        if self.__blocks is not None:
+            if old is not None:
+                self.__delete(old, obj.id)
+            self.__insert(value, obj.id)
+
+    def remove(self, id):
+        """unindexes the object id"""
+        value = self.__values.pop(id, None)
+        if value is not None and self.__blocks is not None:
+            self.__delete(value, id)
+
+    def __insert(self, value, id):
+        """inserts (value, id) in its block, split if it grew too big"""
+        if not self.__blocks:
+            self.__blocks.append([[value], [id]])
+            self.__firsts.append((value, id))
+            self.__floors.append(value)
+            return
+        b = max(0, bisect_right(self.__firsts, (value, id)) - 1)
+        values, ids = self.__blocks[b]
+        i = self.__offset(values, ids, value, id)
+        values.insert(i, value)
+        ids.insert(i, id)
+        if i == 0:
+            self.__firsts[b], self.__floors[b] = (value, id), value
+        if len(values) > 2 * self.block:
+            half = len(values) // 2
+            self.__blocks.insert(b + 1, [values[half:], ids[half:]])
+            self.__firsts.insert(b + 1, (values[half], ids[half]))
+            self.__floors.insert(b + 1, values[half])
+            del values[half:], ids[half:]
+
+    def __delete(self, value, id):
+        """deletes (value, id) from its block, dropped if left empty"""
+        b = bisect_right(self.__firsts, (value, id)) - 1
+        values, ids = self.__blocks[b]
+        i = self.__offset(values, ids, value, id)
+        del values[i], ids[i]
+        if not values:
+            del self.__blocks[b], self.__firsts[b], self.__floors[b]
+        elif i == 0:
+            self.__firsts[b], self.__floors[b] = (values[0], ids[0]), \
+                values[0]
+
+    @staticmethod
+    def __offset(values, ids, value, id):
+        """returns the position of (value, id) in a block"""
+        start = bisect_left(values, value)
+        end = bisect_right(values, value, start)
+        return bisect_left(ids, id, start, end)
+
+    def __sorted(self):
+        """returns the blocks, sorting the values in them if needed"""
+        if self.__blocks is None:
+            with self.__lock:
+                if self.__blocks is None:
+                    # by id, then by value: a stable sort keeps ids in
+                    # order among equal values
+                    ids = sorted(self.__values)
+                    ids.sort(key=self.__values.__getitem__)
+                    blocks = []
+                    for i in range(0, len(ids), self.block):
+                        chunk = ids[i:i + self.block]
+                        blocks.append([[self.__values[id] for id in chunk],
+                                       chunk])
+                    self.__firsts = [(values[0], ids[0])
+                                     for values, ids in blocks]
+                    self.__floors = [values[0] for values, _ in blocks]
+                    self.__blocks = blocks
+        return self.__blocks
+
+    def count(self, bounds):
+        """returns how many objects meet the (operator, value) bounds,
+        without reading them"""
+        blocks = self.__sorted()
+        (b1, i1), (b2, i2) = self.__span(bounds)
+        if (b1, i1) >= (b2, i2):
+            return 0
+        return sum(len(ids) for _, ids in blocks[b1:b2]) - i1 + i2
+
+    def find(self, bounds, limit=None):
+        """returns the ids, by value, of the objects whose value meets
+        all the (operator, value) bounds, e.g. [("ge", 50), ("lt", 100)],
+        only the first limit of them if limit is given"""
+        blocks = self.__sorted()
+        (b1, i1), (b2, i2) = self.__span(bounds)
+        if (b1, i1) >= (b2, i2):
+            return []
+        if b1 == b2:
+            return blocks[b1][1][i1:i2 if limit is None
+                                 else min(i2, i1 + limit)]
+        found = blocks[b1][1][i1:]
+        b = b1 + 1
+        while b < b2 and (limit is None or len(found) < limit):
+            found.extend(blocks[b][1])
+            b += 1
+        if b == b2:
+            found.extend(blocks[b2][1][:i2])
+        return found if limit is None else found[:limit]
+
+    def __span(self, bounds):
+        """returns the (block, offset) of the first object meeting the
+        bounds and the one after the last"""
+        blocks = self.__blocks
+        start = (0, 0)
+        end = (len(blocks) - 1, len(blocks[-1][0])) if blocks else (0, 0)
+        for op, value in bounds:
+            if op in ("eq", "ge", "gt"):
+                start = max(start, self.__position(value, op == "gt"))
+            if op in ("eq", "le", "lt"):
+                end = min(end, self.__position(value, op != "lt"))
+        return start, end
+
+    def __position(self, value, after):
+        """returns the (block, offset) where value would be inserted,
+        after the equal values if after, else before them"""
+        if not self.__blocks:
+            return (0, 0)
+        if after:
+            b = max(0, bisect_right(self.__floors, value) - 1)
+            return b, bisect_right(self.__blocks[b][0], value)
+        b = max(0, bisect_left(self.__floors, value) - 1)
+        return b, bisect_left(self.__blocks[b][0], value)
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Contains the Router and RoutingSession classes, which send the reads of
+DBStorage to read replicas of the database
+"""
+
+from itertools import count
+import threading
+from time import monotonic
+from sqlalchemy import Select
+from sqlalchemy.orm import Session
+
+
+class Router:
+    """hands out the replica engines in turn, skipping the failed ones"""
+
+    def __init__(self, replicas, retry=30):
+        """replicas are engines; a failed one is skipped retry seconds"""
+        self.replicas = list(replicas)
+        self.__retry = retry
+        self.__turn = count()
+        self.__down = {}
+        self.__lock = threading.Lock()
+
+    def replica(self):
+        """returns the next replica up, or None if all of them are down"""
+        if not self.replicas:
+            return None
+        start = next(self.__turn)
+        now = monotonic()
+        with self.__lock:
+            for i in range(len(self.replicas)):
+                engine = self.replicas[(start + i) % len(self.replicas)]
+                if self.__down.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def fail(self, engine):
+        """skips engine for the next retry seconds"""
+        with self.__lock:
+            self.__down[engine] = monotonic() + self.__retry
+
+
+class RoutingSession(Session):
+    """Session that runs reads on a replica until it writes
+
+    Once the session flushed or was told it writes (info["primary"]),
+    every statement goes to its primary bind until it is closed, so a
+    request reads its own writes.
+    """
+
+    def __init__(self, router=None, **kwargs):
+        """creates the session; router picks the replica of reads"""
+        super().__init__(**kwargs)
+        self.router = router
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """returns the engine clause runs on"""
+        if self._flushing:
+            self.info["primary"] = True
+        elif self.router is not None and isinstance(clause, Select) and \
+                not self.info.get("primary"):
+            engine = self.router.replica()
+            if engine is not None:
+                self.info["replica"] = engine
+                return engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
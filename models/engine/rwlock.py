@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Contains the ReadWriteLock class
+"""
+
+from contextlib import contextmanager
+import threading
+
+
+class ReadWriteLock:
+    """lets any number of threads read at once, or one thread write
+
+    A waiting writer blocks new readers, so writers are not starved. The
+    write side is reentrant and the writing thread may also read; a
+    thread that reads may read again but may not start writing.
+    """
+
+    def __init__(self):
+        """creates an unlocked lock"""
+        self.__condition = threading.Condition(threading.Lock())
+        self.__readers = 0
+        self.__writer = None
+        self.__waiting = 0
+        self.__local = threading.local()
+
+    @contextmanager
+    def read(self):
+        """holds the lock for reading during the with block"""
+        local = self.__local
+        if self.__writer == threading.get_ident() or \
+                getattr(local, "reading", False):
+            yield
+            return
+        with self.__condition:
+            while self.__writer is not None or self.__waiting:
+                self.__condition.wait()
+            self.__readers += 1
+        local.reading = True
+        try:
+            yield
+        finally:
+            local.reading = False
+            with self.__condition:
+                self.__readers -= 1
+                if not self.__readers:
+                    self.__condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        """holds the lock for writing during the with block"""
+        me = threading.get_ident()
+        if self.__writer == me:
+            yield
+            return
+        if getattr(self.__local, "reading", False):
+            raise RuntimeError("cannot write while holding the lock "
+                               "for reading")
+        with self.__condition:
+            self.__waiting += 1
+            try:
+                while self.__writer is not None or self.__readers:
+                    self.__condition.wait()
+            finally:
+                self.__waiting -= 1
+            self.__writer = me
+        try:
+            yield
+        finally:
+            with self.__condition:
+                self.__writer = None
+                self.__condition.notify_all()
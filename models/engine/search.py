@@ -0,0 +1,160 @@
+#!/usr/bin/python3
+"""
+Contains the PlaceSearch class, the search engine of places_search
+"""
+
+import threading
+from models.city import City
+from models.engine.query import matches, parse_filters
+from models.place import Place
+
+
+class PlaceSearch:
+    """finds the places of states, cities and amenities from inverted
+    indexes: state id -> cities, city id -> places and amenity id ->
+    places
+
+    FileStorage keeps those indexes up to date as objects change (see
+    its related method), so they are read from it. Other storages get
+    indexes built on the first search and rebuilt when the generation
+    of the class they come from changes, so they suit data read far
+    more often than it is written.
+    """
+
+    def __init__(self, storage):
+        """creates a search engine over the objects of storage"""
+        self.storage = storage
+        self.__live = callable(getattr(storage, "related_by_id", None))
+        self.__lock = threading.Lock()
+        self.__cities = (None, {})
+        self.__places = (None, {}, {}, {}, ())
+
+    def search(self, states=(), cities=(), amenities=(), filters=None):
+        """returns the places, sorted by id, that are in one of the
+        states or cities, have all the amenities and match filters (see
+        models/engine/query.py), e.g. {"price_by_night__le": 100}
+
+        Without states and cities, every place is a candidate; unknown
+        ids match no place. The filters are checked on the candidates
+        left by the other criteria if there are any, else they are sent
+        to the storage, whose indexes answer ranges.
+        """
+        return list(self.iterate(states, cities, amenities, filters))
+
+    def iterate(self, states=(), cities=(), amenities=(), filters=None):
+        """returns an iterator over the places search returns
+
+        Without states, cities and amenities, the places are read from
+        the iterate method of a storage that keeps the indexes (see
+        FileStorage.iterate) as the iterator is consumed, so the first
+        comes at once however many follow.
+        """
+        conditions = parse_filters(Place, filters)
+        if self.__live:
+            found = self.__related(states, cities, amenities)
+            if found is None:
+                return self.storage.iterate(Place, filters)
+        else:
+            found, places, ordered = self.__indexed(states, cities,
+                                                    amenities)
+            if found is None and not conditions:
+                return iter(ordered)
+            if found is None:
+                return iter([places[place.id] for place in
+                             self.storage.query(Place, filters,
+                                                fields=["id"])
+                             if place.id in places])
+        if conditions:
+            found = {id: place for id, place in found.items()
+                     if matches(place, conditions)}
+        return iter([found[id] for id in sorted(found)])
+
+    def __related(self, states, cities, amenities):
+        """returns place id -> place of the places in one of the states
+        or cities (None: every place) with all the amenities, read from
+        the reverse indexes of storage"""
+        related = self.storage.related_by_id
+        found = None
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in set(states):
+                city_ids.update(related(City, "state_id", state_id))
+            found = {}
+            for city_id in city_ids:
+                found.update(related(Place, "city_id", city_id))
+        # intersect the smallest sets first, so the work stays small
+        for places in sorted((related(Place, "amenity_ids", id)
+                              for id in set(amenities)), key=len):
+            if found is None:
+                found = places
+            else:
+                found = {id: places[id] for id in found.keys() & places}
+            if not found:
+                break
+        return found
+
+    def __indexed(self, states, cities, amenities):
+        """returns place id -> place of the places in one of the states
+        or cities (None: every place) with all the amenities, place id ->
+        place and the places sorted by id, read from the indexes built
+        by this search engine"""
+        cities_of = self.__city_index()
+        places, places_of, with_amenity, ordered = self.__place_index()
+        ids = None
+        if states or cities:
+            city_ids = set(cities)
+            for state_id in states:
+                city_ids |= cities_of.get(state_id, set())
+            ids = set()
+            for city_id in city_ids:
+                ids |= places_of.get(city_id, set())
+        # intersect the smallest sets first, so the work stays small
+        for amenity_ids in sorted((with_amenity.get(id, set())
+                                   for id in set(amenities)), key=len):
+            ids = amenity_ids & ids if ids is not None else set(amenity_ids)
+            if not ids:
+                break
+        if ids is None:
+            return None, places, ordered
+        return {id: places[id] for id in ids}, places, ordered
+
+    def __city_index(self):
+        """returns state id -> city ids, rebuilt if cities changed"""
+        generation = self.storage.generation(City)
+        index = self.__cities
+        if index[0] != generation:
+            with self.__lock:
+                index = self.__cities
+                if index[0] != generation:
+                    cities_of = {}
+                    for city in self.storage.all(City).values():
+                        cities_of.setdefault(city.state_id, set()).add(
+                            city.id)
+                    index = self.__cities = (generation, cities_of)
+        return index[1]
+
+    def __place_index(self):
+        """returns place id -> place, city id -> place ids, amenity id ->
+        place ids and the places sorted by id, rebuilt if places changed"""
+        generation = self.storage.generation(Place)
+        index = self.__places
+        if index[0] != generation:
+            with self.__lock:
+                index = self.__places
+                if index[0] != generation:
+                    index = self.__places = (generation,) + self.__build()
+        return index[1:]
+
+    def __build(self):
+        """returns the indexes of the places in storage"""
+        places, places_of, with_amenity = {}, {}, {}
+        for place in self.storage.all(Place, load=("amenities",)).values():
+            places[place.id] = place
+            places_of.setdefault(place.city_id, set()).add(place.id)
+            amenity_ids = getattr(place, "amenity_ids", None)
+            if amenity_ids is None:
+                amenity_ids = [amenity.id for amenity in place.amenities]
+            for amenity_id in amenity_ids:
+                with_amenity.setdefault(amenity_id, set()).add(place.id)
+        ordered = tuple(places[id] for id in sorted(places))
+        return places, places_of, with_amenity, ordered
@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the helpers for the sharded layout of FileStorage: one JSON file
+per class, optionally split into buckets by a hash of the id
+
+Converts an existing file.json when run as a script, by its path so the
+models package, which loads file.json on import, is not imported:
+    python3 models/engine/shards.py file.json <directory> [buckets]
+"""
+
+import json
+from os import makedirs, path as os_path, remove, replace
+import sys
+from uuid import uuid4
+from zlib import crc32
+if __package__:
+    from models.engine import json_stream
+else:
+    import json_stream
+
+# name of the journal log inside the shard directory
+log_name = "journal.log"
+
+
+def name(key, buckets=1):
+    """returns the name of the shard file that holds <class name>.id key"""
+    cls_name, id = key.split(".", 1)
+    if buckets > 1:
+        return "{}.{}.json".format(cls_name, crc32(id.encode()) % buckets)
+    return cls_name + ".json"
+
+
+def class_name(shard):
+    """returns the class name of the objects the shard file holds"""
+    return os_path.basename(shard).split(".", 1)[0]
+
+
+def convert(src, directory, buckets=1):
+    """splits the JSON file src into shard files in directory
+
+    Records are streamed from src and appended to their shard, so the
+    source is never held in memory as a whole. The shards are written to
+    temporary files, renamed only once all of src is read: on an error,
+    none is left in directory.
+    """
+    makedirs(directory, exist_ok=True)
+    suffix = ".{}.tmp".format(uuid4().hex)
+    files = {}
+    try:
+        with open(src, 'r') as f:
+            for key, record in json_stream.items(f):
+                shard = name(key, buckets)
+                if shard not in files:
+                    files[shard] = open(os_path.join(directory,
+                                                     shard + suffix), 'w')
+                    files[shard].write("{")
+                else:
+                    files[shard].write(", ")
+                files[shard].write(json.dumps(key) + ": " +
+                                   json.dumps(record))
+        for out in files.values():
+            out.write("}")
+            out.close()
+        for shard in files:
+            replace(os_path.join(directory, shard + suffix),
+                    os_path.join(directory, shard))
+    except BaseException:
+        for shard, out in files.items():
+            out.close()
+            try:
+                remove(os_path.join(directory, shard + suffix))
+            except FileNotFoundError:
+                pass
+        raise
+    return sorted(files)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (3, 4):
+        print("Usage: {} <file.json> <directory> [buckets]".format(
+            sys.argv[0]))
+        sys.exit(1)
+    buckets = int(sys.argv[3]) if len(sys.argv) == 4 else 1
+    for shard in convert(sys.argv[1], sys.argv[2], buckets):
+        print(shard)
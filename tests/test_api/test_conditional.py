@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""
+Contains the TestConditional classes
+"""
+
+from datetime import datetime
+import inspect
+import pep8
+import unittest
+from unittest import mock
+from api.v1.app import app
+from api.v1.views import conditional
+from models import storage
+from models.state import State
+
+
+class TestConditionalDocs(unittest.TestCase):
+    """Tests to check the documentation and style of conditional"""
+
+    def test_pep8_conformance_conditional(self):
+        """Test that api/v1/views/conditional.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/conditional.py',
+                                    'tests/test_api/test_conditional.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_conditional_docstrings(self):
+        """Test for the presence of docstrings in conditional"""
+        self.assertTrue(len(conditional.__doc__) >= 1)
+        for name, func in inspect.getmembers(conditional,
+                                             inspect.isfunction):
+            if func.__module__ == conditional.__name__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestConditional(unittest.TestCase):
+    """Test the ETag and Last-Modified headers of the GET endpoints"""
+
+    def setUp(self):
+        """Adds a state"""
+        self.client = app.test_client()
+        self.state = State(name="Iowa")
+        storage.new(self.state)
+        storage.save()
+        self.url = "/api/v1/states/{}".format(self.state.id)
+
+    def tearDown(self):
+        """Removes the state"""
+        storage.delete(storage.get(State, self.state.id))
+        storage.save()
+
+    def test_if_none_match(self):
+        """Test that a current ETag is answered 304 without a body"""
+        response = self.client.get(self.url)
+        etag = response.headers["ETag"]
+        with mock.patch.object(State, "to_dict") as to_dict:
+            response = self.client.get(self.url,
+                                       headers={"If-None-Match": etag})
+            to_dict.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+    def test_changed_object(self):
+        """Test that a changed object gets a new ETag"""
+        etag = self.client.get(self.url).headers["ETag"]
+        self.client.put(self.url, json={"name": "Utah"})
+        response = self.client.get(self.url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Utah")
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_fields_etag(self):
+        """Test that every projection has its own ETag"""
+        etag = self.client.get(self.url).headers["ETag"]
+        response = self.client.get(self.url + "?fields=name",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_if_modified_since(self):
+        """Test that If-Modified-Since is honored"""
+        response = self.client.get(self.url)
+        last_modified = response.headers["Last-Modified"]
+        response = self.client.get(
+            self.url, headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(self.url, headers={
+            "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_collection(self):
+        """Test that a list is 304 until one of its objects changes"""
+        response = self.client.get("/api/v1/states")
+        etag = response.headers["ETag"]
+        with mock.patch.object(storage, "query") as query:
+            response = self.client.get("/api/v1/states",
+                                       headers={"If-None-Match": etag})
+            query.assert_not_called()
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get("/api/v1/states?limit=1",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.client.put(self.url, json={"name": "Utah"})
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Utah", [state.get("name")
+                               for state in response.get_json()])
+
+    def test_collection_same_time(self):
+        """Test that a change made at the same updated_at as the one
+        before still changes the ETag of a list"""
+        class Frozen(datetime):
+            """datetime whose now is always the same"""
+            @classmethod
+            def now(cls, tz=None):
+                """Return the same time"""
+                return datetime(2100, 1, 1, tzinfo=tz)
+        with mock.patch("models.base_model.datetime", Frozen):
+            self.client.put(self.url, json={"name": "Utah"})
+            etag = self.client.get("/api/v1/states").headers["ETag"]
+            self.client.put(self.url, json={"name": "Ohio"})
+            response = self.client.get("/api/v1/states",
+                                       headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
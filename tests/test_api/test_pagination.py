@@ -0,0 +1,121 @@
+#!/usr/bin/python3
+"""
+Contains the TestPagination classes
+"""
+
+import inspect
+import pep8
+import re
+import unittest
+from api.v1.app import app
+from api.v1.views import pagination
+from models import storage
+from models.city import City
+from models.state import State
+
+
+class TestPaginationDocs(unittest.TestCase):
+    """Tests to check the documentation and style of pagination"""
+
+    def test_pep8_conformance_pagination(self):
+        """Test that api/v1/views/pagination.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/pagination.py',
+                                    'tests/test_api/test_pagination.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pagination_docstrings(self):
+        """Test for the presence of docstrings in pagination"""
+        self.assertTrue(len(pagination.__doc__) >= 1)
+        for name, func in inspect.getmembers(pagination, inspect.isfunction):
+            if func.__module__ == pagination.__name__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestPagination(unittest.TestCase):
+    """Test the limit and cursor parameters of the list endpoints"""
+
+    def setUp(self):
+        """Adds states and cities"""
+        self.client = app.test_client()
+        self.states = [State(name="State {}".format(i)) for i in range(7)]
+        self.cities = [City(name="City {}".format(i),
+                            state_id=self.states[0].id) for i in range(3)]
+        storage.new_many(self.states + self.cities)
+        storage.save()
+
+    def tearDown(self):
+        """Removes the states and cities"""
+        storage.delete_many(filter(None, (storage.get(City, city.id)
+                                          for city in self.cities)))
+        storage.save()
+        storage.delete_many(self.states)
+        storage.save()
+
+    def pages(self, url):
+        """Returns the pages of url, following the next links"""
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.get_json())
+            link = re.match('<(.*)>; rel="next"',
+                            response.headers.get("Link", ""))
+            url = link.group(1) if link else None
+        return pages
+
+    def test_pages(self):
+        """Test that the pages hold every state once, sorted by id"""
+        pages = self.pages("/api/v1/states?limit=3")
+        ids = [state["id"] for page in pages for state in page]
+        self.assertEqual(ids, sorted(state.id for state in
+                                     storage.all(State).values()))
+        self.assertTrue(all(len(page) == 3 for page in pages[:-1]))
+        self.assertTrue(0 < len(pages[-1]) <= 3)
+
+    def test_nested_pages(self):
+        """Test that the cities of a state are paginated"""
+        url = "/api/v1/states/{}/cities?limit=2".format(self.states[0].id)
+        pages = self.pages(url)
+        self.assertEqual([len(page) for page in pages], [2, 1])
+        self.assertEqual(sorted(city["id"] for page in pages
+                                for city in page),
+                         sorted(city.id for city in self.cities))
+
+    def test_deleted_cursor(self):
+        """Test that the next page is found once the object of the cursor
+        is deleted"""
+        url = "/api/v1/states/{}/cities?limit=2".format(self.states[0].id)
+        response = self.client.get(url)
+        first = [city["id"] for city in response.get_json()]
+        storage.delete(storage.get(City, first[-1]))
+        storage.save()
+        link = re.match('<(.*)>; rel="next"', response.headers["Link"])
+        pages = self.pages(link.group(1))
+        self.assertEqual([city["id"] for page in pages for city in page],
+                         sorted(city.id for city in self.cities)[2:])
+
+    def test_without_limit(self):
+        """Test that without limit or cursor every object is returned"""
+        response = self.client.get("/api/v1/states/{}/cities".format(
+            self.states[0].id))
+        self.assertEqual(len(response.get_json()), 3)
+        self.assertNotIn("Link", response.headers)
+
+    def test_invalid(self):
+        """Test that a bad limit or cursor is a bad request"""
+        for query in ("limit=0", "limit=x", "cursor=%%%"):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/states?" + query)
+                self.assertEqual(response.status_code, 400)
+
+    def test_cursor(self):
+        """Test that a cursor round trips to the id"""
+        self.assertEqual(pagination.decode_cursor(
+            pagination.encode_cursor("State.1234")), "State.1234")
+
+
+if __name__ == "__main__":
+    unittest.main()
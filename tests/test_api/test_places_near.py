@@ -0,0 +1,82 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesNear class
+"""
+
+import unittest
+from api.v1.app import app
+from models import storage
+from models.city import City
+from models.engine.geo import distance
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestPlacesNear(unittest.TestCase):
+    """Test the places_near endpoint"""
+
+    def setUp(self):
+        """Adds three places a kilometer apart"""
+        self.client = app.test_client()
+        self.state = State(name="Nowhere")
+        self.city = City(name="Camp", state_id=self.state.id)
+        self.user = User(email="a@b.c", password="pwd")
+        self.places = [Place(name=str(i), city_id=self.city.id,
+                             user_id=self.user.id, latitude=-80,
+                             longitude=100 + i * 0.05163)
+                       for i in range(3)]
+        self.objs = [self.state, self.city, self.user] + self.places
+        storage.new_many(self.objs)
+        storage.save()
+
+    def tearDown(self):
+        """Removes the objects"""
+        storage.delete_many(filter(None, (
+            storage.get(type(obj), obj.id) for obj in reversed(self.objs))))
+        storage.save()
+
+    def near(self, query):
+        """returns the places found for query"""
+        response = self.client.get("/api/v1/places_near?" + query)
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()
+
+    def test_radius(self):
+        """Test that the places within the radius come nearest first"""
+        places = self.near("lat=-80&lng=100.11&radius=1.5")
+        self.assertEqual([place["name"] for place in places], ["2", "1"])
+        self.assertLess(places[0]["distance"], places[1]["distance"])
+        self.assertAlmostEqual(places[1]["distance"],
+                               distance(-80, 100.11, -80, 100.05163),
+                               places=3)
+
+    def test_no_position(self):
+        """Test that a place created without a position is not found"""
+        response = self.client.post(
+            "/api/v1/cities/{}/places".format(self.city.id),
+            json={"user_id": self.user.id, "name": "Nowhere"})
+        self.assertEqual(response.status_code, 201)
+        self.objs.append(storage.get(Place, response.get_json()["id"]))
+        self.assertEqual(self.near("lat=0.01&lng=0.01&radius=5"), [])
+
+    def test_limit(self):
+        """Test that limit keeps the nearest places"""
+        places = self.near("lat=-80&lng=99&limit=2&fields=id,name")
+        self.assertEqual([place["name"] for place in places], ["0", "1"])
+        self.assertEqual(set(places[0]), {"id", "name", "distance"})
+        self.assertEqual(len(self.near("lat=-80&lng=99&radius=50")), 3)
+
+    def test_invalid(self):
+        """Test that missing or bad parameters are a bad request"""
+        for query in ("lng=1", "lat=1", "lat=91&lng=0", "lat=x&lng=0",
+                      "lat=0&lng=nan", "lat=0&lng=0&radius=-1",
+                      "lat=0&lng=0&limit=0", "lat=0&lng=0&limit=x",
+                      "lat=0&lng=0&limit=100000"):
+            with self.subTest(query=query):
+                response = self.client.get("/api/v1/places_near?" + query)
+                self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
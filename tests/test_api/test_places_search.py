@@ -0,0 +1,173 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlacesSearch class
+"""
+
+import unittest
+import models
+from api.v1.app import app
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+
+
+class TestPlacesSearch(unittest.TestCase):
+    """Test the places_search endpoint"""
+
+    def setUp(self):
+        """Adds a state of two cities with three places"""
+        self.client = app.test_client()
+        self.state = State(name="Iowa")
+        self.cities = [City(name=name, state_id=self.state.id)
+                       for name in ("Ames", "Ankeny")]
+        self.user = User(email="a@b.c", password="pwd")
+        self.wifi, self.pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        self.places = [Place(name=str(i), city_id=self.cities[i // 2].id,
+                             user_id=self.user.id, price_by_night=50 * i,
+                             max_guest=i + 2) for i in range(3)]
+        self.link(self.places[0], [self.wifi, self.pool])
+        self.link(self.places[2], [self.wifi])
+        self.objs = [self.state, self.user, self.wifi, self.pool] + \
+            self.cities + self.places
+        storage.new_many(self.objs)
+        storage.save()
+
+    def tearDown(self):
+        """Removes the objects"""
+        storage.delete_many(filter(None, (
+            storage.get(type(obj), obj.id) for obj in reversed(self.objs))))
+        storage.save()
+
+    @staticmethod
+    def link(place, amenities):
+        """links the amenities to place"""
+        if models.storage_t == "db":
+            place.amenities.extend(amenities)
+        else:
+            place.amenity_ids = [amenity.id for amenity in amenities]
+
+    def search(self, filters):
+        """returns the names of the places found, in order"""
+        response = self.client.post("/api/v1/places_search", json=filters)
+        self.assertEqual(response.status_code, 200)
+        return [place.get("name") for place in response.get_json()]
+
+    def names(self, places):
+        """returns the names of places sorted by id"""
+        return [place.name for place in sorted(places, key=lambda p: p.id)]
+
+    def test_no_filter(self):
+        """Test that an empty search finds every place"""
+        for filters in ({}, {"states": [], "cities": [], "amenities": []}):
+            with self.subTest(filters=filters):
+                found = self.search(filters)
+                for place in self.places:
+                    self.assertIn(place.name, found)
+
+    def test_states_and_cities(self):
+        """Test that the places of the states and cities are found once"""
+        self.assertEqual(self.search({"states": [self.state.id]}),
+                         self.names(self.places))
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "cities": [self.cities[1].id]}),
+                         self.names(self.places))
+        self.assertEqual(self.search({"cities": [self.cities[1].id]}),
+                         ["2"])
+
+    def test_amenities(self):
+        """Test that the places found have all the amenities"""
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "amenities": [self.wifi.id]}),
+                         self.names([self.places[0], self.places[2]]))
+        self.assertEqual(self.search({"amenities": [self.wifi.id,
+                                                    self.pool.id]}),
+                         ["0"])
+
+    def test_ranges(self):
+        """Test that the places found are within the bounds"""
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "price_by_night": {"min": 50}}),
+                         self.names(self.places[1:]))
+        self.assertEqual(self.search({"amenities": [self.wifi.id],
+                                      "price_by_night": {"max": 99.5},
+                                      "max_guest": {"min": 2, "max": 3}}),
+                         ["0"])
+        found = self.search({"price_by_night": {"min": 25, "max": 75},
+                             "max_guest": {"min": 3}})
+        self.assertIn("1", found)
+        self.assertNotIn("0", found)
+        self.assertNotIn("2", found)
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "number_rooms": {"min": 1}}), [])
+
+    def test_ranges_text(self):
+        """Test that a range attribute written as text is stored as a
+        number, found whichever way the search goes, and that other
+        values are refused"""
+        url = "/api/v1/places/{}".format(self.places[2].id)
+        response = self.client.put(url, json={"price_by_night": "90"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["price_by_night"], 90)
+        self.assertEqual(self.search({"cities": [self.cities[1].id],
+                                      "price_by_night": {"min": 80}}),
+                         ["2"])
+        self.assertIn("2", self.search({"price_by_night": {"min": 80,
+                                                           "max": 90}}))
+        for value in ("cheap", 9.5, True, None):
+            with self.subTest(value=value):
+                response = self.client.put(url,
+                                           json={"max_guest": value})
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post(
+            "/api/v1/cities/{}/places".format(self.cities[0].id),
+            json={"user_id": self.user.id, "name": "x",
+                  "number_rooms": "many"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_link_amenity(self):
+        """Test that amenities linked and unlinked through the API are
+        searched"""
+        url = "/api/v1/places/{}/amenities/{}".format(self.places[1].id,
+                                                      self.pool.id)
+        self.assertEqual(self.client.post(url).status_code, 201)
+        response = self.client.get(
+            "/api/v1/places/{}/amenities".format(self.places[1].id))
+        self.assertEqual([amenity["id"] for amenity in response.get_json()],
+                         [self.pool.id])
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "amenities": [self.pool.id]}),
+                         self.names(self.places[:2]))
+        self.assertEqual(self.client.delete(url).status_code, 200)
+        self.assertEqual(self.search({"states": [self.state.id],
+                                      "amenities": [self.pool.id]}),
+                         ["0"])
+
+    def test_new_place(self):
+        """Test that a new place is found"""
+        place = Place(name="3", city_id=self.cities[1].id,
+                      user_id=self.user.id)
+        self.objs.append(place)
+        storage.new(place)
+        storage.save()
+        self.assertEqual(self.search({"cities": [self.cities[1].id]}),
+                         self.names(self.places[2:] + [place]))
+
+    def test_invalid(self):
+        """Test that a bad body is a bad request"""
+        for data in ([], {"states": "nope"}, {"cities": [1]},
+                     {"max_guest": 2}, {"max_guest": {"low": 2}},
+                     {"price_by_night": {"min": "2"}},
+                     {"price_by_night": {"max": True}}):
+            with self.subTest(data=data):
+                response = self.client.post("/api/v1/places_search",
+                                            json=data)
+                self.assertEqual(response.status_code, 400)
+        response = self.client.post("/api/v1/places_search", data="x")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
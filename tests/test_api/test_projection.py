@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""
+Contains the TestProjection classes
+"""
+
+import inspect
+import pep8
+import re
+import unittest
+from api.v1.app import app
+from api.v1.views import projection
+from models import storage
+from models.state import State
+from models.user import User
+
+
+class TestProjectionDocs(unittest.TestCase):
+    """Tests to check the documentation and style of projection"""
+
+    def test_pep8_conformance_projection(self):
+        """Test that api/v1/views/projection.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/projection.py',
+                                    'tests/test_api/test_projection.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_projection_docstrings(self):
+        """Test for the presence of docstrings in projection"""
+        self.assertTrue(len(projection.__doc__) >= 1)
+        for name, func in inspect.getmembers(projection, inspect.isfunction):
+            if func.__module__ == projection.__name__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestProjection(unittest.TestCase):
+    """Test the fields parameter of the GET endpoints"""
+
+    def setUp(self):
+        """Adds a state and a user"""
+        self.client = app.test_client()
+        self.state = State(name="Iowa")
+        self.user = User(email="a@b.c", password="pwd")
+        storage.new_many([self.state, self.user])
+        storage.save()
+
+    def tearDown(self):
+        """Removes the state and the user"""
+        storage.delete_many([self.state, self.user])
+        storage.save()
+
+    def test_get_one(self):
+        """Test that only the named fields are returned"""
+        response = self.client.get("/api/v1/states/{}?fields=id,name".format(
+            self.state.id))
+        self.assertEqual(response.get_json(),
+                         {"id": self.state.id, "name": "Iowa"})
+
+    def test_list(self):
+        """Test that every object of a list is projected"""
+        response = self.client.get("/api/v1/states?fields=name")
+        states = response.get_json()
+        self.assertIn({"name": "Iowa"}, states)
+        self.assertTrue(all(list(state) == ["name"] for state in states))
+
+    def test_next_link_keeps_fields(self):
+        """Test that the next page is projected as well"""
+        storage.new(State(name="Utah"))
+        response = self.client.get("/api/v1/states?fields=id&limit=1")
+        link = re.match('<(.*)>; rel="next"', response.headers["Link"])
+        self.assertIn("fields=id", link.group(1))
+
+    def test_unknown_field(self):
+        """Test that an unknown field is a bad request"""
+        for fields in ("nope", "__class__", "cities"):
+            with self.subTest(fields=fields):
+                response = self.client.get(
+                    "/api/v1/states?fields=" + fields)
+                self.assertEqual(response.status_code, 400)
+
+    def test_password_hidden(self):
+        """Test that the password is never returned"""
+        response = self.client.get("/api/v1/users/{}?fields=id,password"
+                                   .format(self.user.id))
+        self.assertIn(response.status_code, (200, 400))
+        self.assertNotIn(b"pwd", response.data)
+        self.assertNotIn(b'"password"', response.data)
+
+
+if __name__ == "__main__":
+    unittest.main()
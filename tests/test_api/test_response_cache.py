@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""
+Contains the TestResponseCache classes
+"""
+
+from datetime import datetime
+import inspect
+import pep8
+import unittest
+from unittest import mock
+from api.v1.app import app
+from api.v1.views import response_cache
+from api.v1.views.response_cache import ResponseCache, responses
+from models import storage
+from models.city import City
+from models.state import State
+
+
+class TestResponseCacheDocs(unittest.TestCase):
+    """Tests to check the documentation and style of response_cache"""
+
+    def test_pep8_conformance_response_cache(self):
+        """Test that api/v1/views/response_cache.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/response_cache.py',
+                                    'tests/test_api/test_response_cache.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_response_cache_docstrings(self):
+        """Test for the presence of docstrings in response_cache"""
+        self.assertTrue(len(response_cache.__doc__) >= 1)
+        self.assertTrue(len(ResponseCache.__doc__) >= 1)
+        for name, func in inspect.getmembers(ResponseCache,
+                                             inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+        self.assertTrue(len(response_cache.cached.__doc__) >= 1)
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test the ResponseCache class"""
+
+    def test_version(self):
+        """Test that an entry is served only at its version"""
+        cache = ResponseCache(2)
+        cache.put("/a", (1,), b"a", [])
+        self.assertEqual(cache.get("/a", (1,)), (b"a", []))
+        self.assertIsNone(cache.get("/a", (2,)))
+        self.assertIsNone(cache.get("/b", (1,)))
+
+    def test_lru(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResponseCache(2)
+        cache.put("/a", 1, b"a", [])
+        cache.put("/b", 1, b"b", [])
+        cache.get("/a", 1)
+        cache.put("/c", 1, b"c", [])
+        self.assertIsNone(cache.get("/b", 1))
+        self.assertIsNotNone(cache.get("/a", 1))
+        self.assertIsNotNone(cache.get("/c", 1))
+
+    def test_stats(self):
+        """Test the counters and hit ratio"""
+        cache = ResponseCache(1)
+        cache.put("/a", 1, b"a", [])
+        cache.put("/b", 1, b"b", [])
+        cache.get("/b", 1)
+        cache.get("/a", 1)
+        self.assertEqual(cache.stats(), {
+            "hits": 1, "misses": 1, "evictions": 1, "entries": 1,
+            "size": 1, "hit_ratio": 0.5})
+
+
+class TestResponseCacheViews(unittest.TestCase):
+    """Test the cached endpoints"""
+
+    def setUp(self):
+        """Adds a state with a city"""
+        self.client = app.test_client()
+        self.state = State(name="Iowa")
+        self.city = City(name="Ames", state_id=self.state.id)
+        storage.new_many([self.state, self.city])
+        storage.save()
+
+    def tearDown(self):
+        """Removes the state and the city"""
+        storage.delete_many(filter(None, [
+            storage.get(City, self.city.id),
+            storage.get(State, self.state.id)]))
+        storage.save()
+
+    def test_hit(self):
+        """Test that a warm request does not read the objects"""
+        first = self.client.get("/api/v1/states")
+        with mock.patch.object(storage, "query") as query:
+            second = self.client.get("/api/v1/states")
+            query.assert_not_called()
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.get_json(), first.get_json())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+
+    def test_query_string(self):
+        """Test that the query string is part of the key"""
+        self.client.get("/api/v1/states")
+        response = self.client.get("/api/v1/states?fields=name")
+        self.assertIn({"name": "Iowa"}, response.get_json())
+
+    def test_invalidation(self):
+        """Test that a change to a class refreshes its responses"""
+        url = "/api/v1/states/{}/cities".format(self.state.id)
+        self.assertEqual(len(self.client.get(url).get_json()), 1)
+        city = City(name="Des Moines", state_id=self.state.id)
+        storage.new(city)
+        storage.save()
+        try:
+            self.assertEqual(len(self.client.get(url).get_json()), 2)
+        finally:
+            storage.delete(city)
+            storage.save()
+        count = self.client.get("/api/v1/stats").get_json()["cities"]
+        storage.delete(storage.get(City, self.city.id))
+        storage.save()
+        self.assertEqual(
+            self.client.get("/api/v1/stats").get_json()["cities"], count - 1)
+
+    def test_invalidation_same_time(self):
+        """Test that changes made at the same updated_at refresh the
+        responses"""
+        class Frozen(datetime):
+            """datetime whose now is always the same"""
+            @classmethod
+            def now(cls, tz=None):
+                """Return the same time"""
+                return datetime(2100, 1, 1, tzinfo=tz)
+        other = State(name="Utah")
+        storage.new(other)
+        storage.save()
+        url = "/api/v1/states/{}"
+        try:
+            with mock.patch("models.base_model.datetime", Frozen):
+                for state, name in ((self.state, "Ohio"), (other, "Utah2")):
+                    self.client.put(url.format(state.id), json={"name": name})
+                    names = [state.get("name") for state in
+                             self.client.get("/api/v1/states").get_json()]
+                    self.assertIn(name, names)
+        finally:
+            storage.delete(storage.get(State, other.id))
+            storage.save()
+
+    def test_conditional_hit(self):
+        """Test that a cached response honors If-None-Match"""
+        etag = self.client.get("/api/v1/states").headers["ETag"]
+        self.client.get("/api/v1/states")
+        response = self.client.get("/api/v1/states",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_cache_stats(self):
+        """Test that the hit ratio is exposed"""
+        self.client.get("/api/v1/amenities")
+        hits = responses.stats()["hits"]
+        self.client.get("/api/v1/amenities")
+        stats = self.client.get("/api/v1/stats/cache").get_json()
+        self.assertEqual(stats["hits"], hits + 1)
+        self.assertTrue(0 < stats["hit_ratio"] <= 1)
+
+    def test_disabled(self):
+        """Test that a size of 0 turns the cache off"""
+        with mock.patch.object(responses, "size", 0):
+            self.client.get("/api/v1/states")
+            with mock.patch.object(storage, "query",
+                                   return_value=[]) as query:
+                self.client.get("/api/v1/states")
+                query.assert_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""
+Contains the TestStreaming classes
+"""
+
+import inspect
+import json
+import pep8
+import unittest
+from unittest import mock
+import models
+from api.v1.app import app
+from api.v1.views import streaming
+from models import storage
+from models.state import State
+
+
+class TestStreamingDocs(unittest.TestCase):
+    """Tests to check the documentation and style of streaming"""
+
+    def test_pep8_conformance_streaming(self):
+        """Test that api/v1/views/streaming.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['api/v1/views/streaming.py',
+                                    'tests/test_api/test_streaming.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_streaming_docstrings(self):
+        """Test for the presence of docstrings in streaming"""
+        self.assertTrue(len(streaming.__doc__) >= 1)
+        for name, func in inspect.getmembers(streaming, inspect.isfunction):
+            if func.__module__ == streaming.__name__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestChunks(unittest.TestCase):
+    """Test the chunks and array generators"""
+
+    def test_chunks(self):
+        """Test that pieces are joined in chunks of about chunk_size"""
+        with mock.patch.object(streaming, "chunk_size", 4):
+            self.assertEqual(list(streaming.chunks(["ab", "cd", "e", "f"])),
+                             ["abcd", "ef"])
+        self.assertEqual(list(streaming.chunks([])), [])
+
+    def test_array(self):
+        """Test that items are written as a JSON array"""
+        self.assertEqual("".join(streaming.array(["1", "2"])), "[1,2]")
+        self.assertEqual("".join(streaming.array([])), "[]")
+
+
+class TestStreaming(unittest.TestCase):
+    """Test the streamed responses of the list endpoints"""
+
+    def setUp(self):
+        """Adds states"""
+        self.client = app.test_client()
+        self.states = [State(name="State {}".format(i)) for i in range(5)]
+        storage.new_many(self.states)
+        storage.save()
+
+    def tearDown(self):
+        """Removes the states"""
+        storage.delete_many(filter(None, (storage.get(State, state.id)
+                                          for state in self.states)))
+        storage.save()
+
+    def test_ndjson(self):
+        """Test that ?stream=ndjson writes one object per line"""
+        response = self.client.get("/api/v1/states?stream=ndjson")
+        self.assertNotIn("Content-Length", response.headers)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        states = [json.loads(line) for line in lines]
+        self.assertEqual(len(states), storage.count(State))
+        for state in self.states:
+            self.assertIn(state.id, [s["id"] for s in states])
+
+    def test_accept(self):
+        """Test that the Accept header selects NDJSON"""
+        response = self.client.get(
+            "/api/v1/states", headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        response = self.client.get("/api/v1/states",
+                                   headers={"Accept": "application/json"})
+        self.assertIn("Content-Length", response.headers)
+
+    def test_json_array(self):
+        """Test that ?stream=json writes the same list as a JSON array"""
+        streamed = self.client.get("/api/v1/states?stream=json&fields=id")
+        self.assertNotIn("Content-Length", streamed.headers)
+        listed = self.client.get("/api/v1/states?fields=id")
+        self.assertEqual(sorted(streamed.get_json(), key=str),
+                         sorted(listed.get_json(), key=str))
+
+    def test_lazy(self):
+        """Test that the objects are read as the body is written"""
+        with mock.patch.object(streaming, "chunk_size", 1):
+            response = self.client.get("/api/v1/states?stream=ndjson",
+                                       buffered=False)
+            body = iter(response.response)
+            json.loads(next(body))
+            response.close()
+
+    def test_invalid(self):
+        """Test that an unknown format is a bad request"""
+        response = self.client.get("/api/v1/states?stream=xml")
+        self.assertEqual(response.status_code, 400)
+
+    def test_places_search(self):
+        """Test that places_search can be streamed"""
+        response = self.client.post("/api/v1/places_search?stream=ndjson",
+                                    json={})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_places_search_lazy(self):
+        """Test that an unfiltered places_search is streamed from the
+        storage without reading every place first"""
+        with mock.patch.object(streaming, "chunk_size", 1), \
+                mock.patch.object(storage, "all",
+                                  side_effect=AssertionError):
+            response = self.client.post(
+                "/api/v1/places_search?stream=ndjson", json={},
+                buffered=False)
+            self.assertEqual(response.status_code, 200)
+            b"".join(response.response)
+            response.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,8 @@ import time
 import unittest
 from unittest import mock
 import models
-from models.base_model import BaseModel
+from models.base_model import BaseModel, timestamp
+from sqlalchemy.dialects import mysql
 
 BaseModel = models.base_model.BaseModel
 module_doc = models.base_model.__doc__
@@ -140,6 +141,15 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(new_d["created_at"], bm.created_at.strftime(t_format))
         self.assertEqual(new_d["updated_at"], bm.updated_at.strftime(t_format))
 
+    def test_to_dict_fields(self):
+        """test that to_dict with fields returns only those attributes"""
+        t_format = "%Y-%m-%dT%H:%M:%S.%f"
+        bm = BaseModel()
+        bm.name = "Holberton"
+        new_d = bm.to_dict(fields=["id", "created_at"])
+        self.assertEqual(new_d, {"id": bm.id, "created_at":
+                                 bm.created_at.strftime(t_format)})
+
     def test_str(self):
         """test that the str method has the correct output"""
         inst = BaseModel()
@@ -160,3 +170,8 @@ class TestBaseModel(unittest.TestCase):
         self.assertEqual(old_created_at, new_created_at)
         self.assertTrue(mock_storage.new.called)
         self.assertTrue(mock_storage.save.called)
+
+    def test_timestamp_microseconds(self):
+        """Test that MySQL keeps the microseconds of the dates"""
+        self.assertEqual(str(timestamp.compile(dialect=mysql.dialect())),
+                         "DATETIME(6)")
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Contains the TestBinaryFormat classes
+"""
+
+from datetime import datetime, timezone
+import inspect
+import io
+import pep8
+import unittest
+from models.engine import binary_format
+
+
+class TestBinaryFormatDocs(unittest.TestCase):
+    """Tests to check the documentation and style of binary_format"""
+
+    def test_pep8_conformance_binary_format(self):
+        """Test that models/engine/binary_format.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/binary_format.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_binary_format.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_binary_format_docstrings(self):
+        """Test for the presence of docstrings in binary_format"""
+        self.assertTrue(len(binary_format.__doc__) >= 1)
+        for name, func in inspect.getmembers(binary_format,
+                                             inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestBinaryFormat(unittest.TestCase):
+    """Test the encode and items functions"""
+    record = {"id": "1", "created_at": datetime(2025, 2, 7, 23, 25, 6, 682825),
+              "updated_at": datetime(2025, 2, 7, 23, 25, 6, 682825,
+                                     tzinfo=timezone.utc),
+              "name": "Café \"Iowa\"", "number_rooms": -3,
+              "latitude": 37.773972, "amenity_ids": ["a", "b"],
+              "description": None, "active": True, "closed": False,
+              "extra": {"nested": [1, 2]}, "__class__": "Place"}
+
+    def round_trip(self, pairs):
+        """Returns the pairs read back from their encoded form"""
+        f = io.BytesIO(b"".join(binary_format.encode(key, record)
+                                for key, record in pairs))
+        return list(binary_format.items(f))
+
+    def test_round_trip(self):
+        """Test that every value type reads back equal and typed"""
+        pairs = [("Place.1", self.record), ("State.2", {"id": "2"}),
+                 ("City.3", {})]
+        result = self.round_trip(pairs)
+        self.assertEqual(result, pairs)
+        record = result[0][1]
+        self.assertIs(type(record["created_at"]), datetime)
+        self.assertIsNone(record["created_at"].tzinfo)
+        self.assertEqual(record["updated_at"].tzinfo, timezone.utc)
+        self.assertIs(type(record["number_rooms"]), int)
+        self.assertIs(record["active"], True)
+
+    def test_empty(self):
+        """Test that no records read back as nothing"""
+        self.assertEqual(self.round_trip([]), [])
+
+    def test_truncated(self):
+        """Test that a truncated file raises ValueError"""
+        data = binary_format.encode("Place.1", self.record)
+        for size in (2, 10, len(data) - 1):
+            with self.subTest(size=size):
+                with self.assertRaises(ValueError):
+                    list(binary_format.items(io.BytesIO(data[:size])))
+
+
+if __name__ == "__main__":
+    unittest.main()
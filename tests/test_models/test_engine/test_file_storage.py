@@ -7,15 +7,23 @@ from datetime import datetime
 import json
 import os
 import pep8
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
 import inspect
 import models
 from models import storage
-from models.engine import file_storage
+from models.engine import file_storage, shards
+from models.engine.geo import GridIndex
+from models.engine.ranges import RangeIndex
 from models.amenity import Amenity
 from models.base_model import BaseModel
 from models.city import City
-from models.place import Place
+from models.place import Place, range_attributes
 from models.review import Review
 from models.state import State
 from models.user import User
@@ -75,11 +83,12 @@ class TestFileStorage(unittest.TestCase):
     """Test the FileStorage class"""
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_all_returns_dict(self):
-        """Test that all returns the FileStorage.__objects attr"""
+        """Test that all returns a copy of the FileStorage.__objects attr"""
         storage = FileStorage()
         new_dict = storage.all()
         self.assertEqual(type(new_dict), dict)
-        self.assertIs(new_dict, storage._FileStorage__objects)
+        self.assertEqual(new_dict, storage._FileStorage__objects)
+        self.assertIsNot(new_dict, storage._FileStorage__objects)
 
     @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
     def test_new(self):
@@ -117,6 +126,930 @@ class TestFileStorage(unittest.TestCase):
             js = f.read()
         self.assertEqual(json.loads(string), json.loads(js))
 
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_get(self):
+        """Test that get returns the object by class and id"""
+        storage = FileStorage()
+        instance = State()
+        storage.new(instance)
+        self.assertIs(storage.get(State, instance.id), instance)
+        self.assertIs(storage.get("State", instance.id), instance)
+        self.assertIsNone(storage.get(City, instance.id))
+        self.assertIsNone(storage.get("InvalidClass", instance.id))
+        storage.delete(instance)
+        self.assertIsNone(storage.get(State, instance.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_all_cls(self):
+        """Test that all(cls) returns only the objects of that class"""
+        storage = FileStorage()
+        state = State()
+        city = City()
+        storage.new(state)
+        storage.new(city)
+        states = storage.all(State)
+        self.assertEqual(states, storage.all("State"))
+        self.assertIs(states["State." + state.id], state)
+        self.assertNotIn("City." + city.id, states)
+        for value in states.values():
+            self.assertIs(type(value), State)
+        storage.delete(state)
+        storage.delete(city)
+        self.assertNotIn("State." + state.id, storage.all(State))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related(self):
+        """Test that related follows new, delete and foreign key changes"""
+        storage = FileStorage()
+        state = State()
+        other = State()
+        city = City(state_id=state.id)
+        for obj in (state, other, city):
+            storage.new(obj)
+        self.assertEqual(storage.related(City, "state_id", state.id), [city])
+        self.assertEqual(state.cities, [city])
+        city.state_id = other.id
+        self.assertEqual(state.cities, [])
+        self.assertEqual(other.cities, [city])
+        storage.delete(city)
+        self.assertEqual(other.cities, [])
+        for obj in (state, other):
+            storage.delete(obj)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_related_list(self):
+        """Test that related follows the ids of a list attribute"""
+        storage = FileStorage()
+        place = Place(amenity_ids=["a1", "a2"])
+        storage.new(place)
+        self.assertEqual(storage.related(Place, "amenity_ids", "a1"),
+                         [place])
+        self.assertEqual(storage.related_by_id(Place, "amenity_ids", "a2"),
+                         {place.id: place})
+        place.amenity_ids = ["a2", "a3"]
+        self.assertEqual(storage.related(Place, "amenity_ids", "a1"), [])
+        self.assertEqual(storage.related(Place, "amenity_ids", "a3"),
+                         [place])
+        storage.delete(place)
+        self.assertEqual(storage.related_by_id(Place, "amenity_ids", "a2"),
+                         {})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_place_relations(self):
+        """Test the reviews, amenities and places properties"""
+        storage = FileStorage()
+        user = User()
+        city = City()
+        place = Place(city_id=city.id, user_id=user.id)
+        review = Review(place_id=place.id, user_id=user.id)
+        amenity = Amenity()
+        place.amenity_ids = [amenity.id]
+        objs = (user, city, place, review, amenity)
+        for obj in objs:
+            storage.new(obj)
+        self.assertEqual(place.reviews, [review])
+        self.assertEqual(place.amenities, [amenity])
+        self.assertEqual(city.places, [place])
+        self.assertEqual(user.places, [place])
+        self.assertEqual(user.reviews, [review])
+        for obj in objs:
+            storage.delete(obj)
+        self.assertEqual(user.reviews, [])
+
+
+class FileStorageTestCase(unittest.TestCase):
+    """Runs each test against an empty storage in a temporary directory"""
+    journal = False
+    state = ("objects", "index", "relations", "changes", "encoded",
+             "log_size", "log_offset", "signature", "file_path", "journal",
+             "shard_dir", "buckets", "touched", "binary", "flush_window",
+             "flusher", "geo", "ranges", "ids")
+
+    def setUp(self):
+        """Swaps the storage state for an empty one"""
+        self.saved = {name: getattr(FileStorage, "_FileStorage__" + name)
+                      for name in self.state}
+        for name in ("objects", "index", "relations", "changes", "encoded",
+                     "ids"):
+            setattr(FileStorage, "_FileStorage__" + name, {})
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "file.json")
+        FileStorage._FileStorage__file_path = self.path
+        FileStorage._FileStorage__journal = self.journal
+        FileStorage._FileStorage__log_size = 0
+        FileStorage._FileStorage__log_offset = 0
+        FileStorage._FileStorage__signature = None
+        FileStorage._FileStorage__shard_dir = None
+        FileStorage._FileStorage__buckets = 1
+        FileStorage._FileStorage__touched = set()
+        FileStorage._FileStorage__binary = False
+        FileStorage._FileStorage__geo = GridIndex()
+        FileStorage._FileStorage__ranges = self.ranges()
+
+    def tearDown(self):
+        """Restores the storage state"""
+        if FileStorage._FileStorage__flusher is not None:
+            FileStorage._FileStorage__flusher.stop()
+        for name, value in self.saved.items():
+            setattr(FileStorage, "_FileStorage__" + name, value)
+        self.tmp.cleanup()
+
+    @staticmethod
+    def ranges():
+        """Returns empty range indexes of places"""
+        return {name: RangeIndex(name)
+                for name in range_attributes}
+
+    def reloaded(self):
+        """Returns the objects a fresh reload reads back"""
+        FileStorage._FileStorage__objects = {}
+        FileStorage._FileStorage__index = {}
+        FileStorage._FileStorage__relations = {}
+        FileStorage._FileStorage__ids = {}
+        FileStorage._FileStorage__touched = set()
+        FileStorage._FileStorage__geo = GridIndex()
+        FileStorage._FileStorage__ranges = self.ranges()
+        storage = FileStorage()
+        storage.reload()
+        return storage.all()
+
+    def log_lines(self):
+        """Returns the records in the log"""
+        with open(self.path + ".log") as f:
+            return [json.loads(line) for line in f]
+
+
+class TestFileStorageDirty(FileStorageTestCase):
+    """Test that save only encodes the objects that changed"""
+
+    def records(self):
+        """Returns the records in the JSON file"""
+        with open(self.path) as f:
+            return json.load(f)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_reuses_clean_objects(self):
+        """Test that save does not encode unchanged objects again"""
+        storage = FileStorage()
+        clean = State(name="Iowa")
+        dirty = State(name="Utah")
+        storage.new(clean)
+        storage.new(dirty)
+        storage.save()
+        # bypasses attribute assignment, so the change is not tracked
+        clean.__dict__["name"] = "untracked"
+        dirty.name = "Nevada"
+        storage.save()
+        records = self.records()
+        self.assertEqual(records["State." + clean.id]["name"], "Iowa")
+        self.assertEqual(records["State." + dirty.id]["name"], "Nevada")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_after_model_save(self):
+        """Test that BaseModel.save marks the object as changed"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        state.__dict__["name"] = "Ohio"
+        state.save()
+        self.assertEqual(self.records()["State." + state.id]["name"], "Ohio")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_own_temporary_file(self):
+        """Test that save leaves the temporary file of another writer"""
+        other = self.path + ".tmp"
+        with open(other, "w") as f:
+            f.write('{"half')
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        with open(other) as f:
+            self.assertEqual(f.read(), '{"half')
+        self.assertEqual(sorted(os.listdir(self.tmp.name)),
+                         ["file.json", "file.json.tmp"])
+        self.assertIn("State." + state.id, self.records())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_empty(self):
+        """Test that saving no objects writes an empty JSON object"""
+        FileStorage().save()
+        self.assertEqual(self.records(), {})
+
+
+class TestFileStorageJournal(FileStorageTestCase):
+    """Test the journal mode of the FileStorage class"""
+    journal = True
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_appends_changes(self):
+        """Test that save appends only changed objects and tombstones"""
+        storage = FileStorage()
+        first = State(name="Iowa")
+        second = State(name="Utah")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        self.assertEqual(len(self.log_lines()), 2)
+        first.name = "Idaho"
+        storage.delete(second)
+        storage.save()
+        lines = self.log_lines()
+        self.assertEqual(len(lines), 4)
+        self.assertEqual(lines[2][1]["name"], "Idaho")
+        self.assertEqual(lines[3], ["State." + second.id, None])
+        self.assertFalse(os.path.exists(self.path))
+        objects = self.reloaded()
+        self.assertEqual(list(objects), ["State." + first.id])
+        self.assertEqual(objects["State." + first.id].name, "Idaho")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_delete_copy(self):
+        """Test that deleting a copy deletes the object of its key"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        city = City(state_id=state.id)
+        storage.new_many([state, city])
+        storage.save()
+        storage.delete(City(**city.to_dict()))
+        self.assertIsNone(storage.get(City, city.id))
+        self.assertEqual(storage.count(City), 0)
+        self.assertEqual(state.cities, [])
+        storage.save()
+        self.assertEqual(self.log_lines()[-1], ["City." + city.id, None])
+        self.assertEqual(list(self.reloaded()), ["State." + state.id])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact(self):
+        """Test that compact folds the log into the snapshot"""
+        storage = FileStorage()
+        state = State(name="Maine")
+        storage.new(state)
+        storage.save()
+        state.name = "Vermont"
+        storage.save()
+        storage.compact()
+        self.assertFalse(os.path.exists(self.path + ".log"))
+        with open(self.path) as f:
+            self.assertEqual(json.load(f)["State." + state.id]["name"],
+                             "Vermont")
+        self.assertEqual(self.reloaded()["State." + state.id].name,
+                         "Vermont")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reload_ignores_torn_record(self):
+        """Test that a partial last log line is ignored on reload"""
+        storage = FileStorage()
+        state = State(name="Texas")
+        storage.new(state)
+        storage.save()
+        with open(self.path + ".log", "a") as f:
+            f.write('["State.x", {"id": ')
+        self.assertEqual(list(self.reloaded()), ["State." + state.id])
+
+
+class TestFileStorageClose(FileStorageTestCase):
+    """Test that close only reads what changed on disk"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged(self):
+        """Test that close keeps the objects when the file is unchanged"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged_unlocked(self):
+        """Test that close does not lock when the files are unchanged"""
+        storage = FileStorage()
+        storage.new(State(name="Iowa"))
+        storage.save()
+        # a thread reading may not write: close must not take the lock
+        with FileStorage._FileStorage__lock.read():
+            storage.close()
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_changed_record(self):
+        """Test that close reinstantiates only the changed records"""
+        storage = FileStorage()
+        first = State(name="Iowa")
+        second = State(name="Utah")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        with open(self.path) as f:
+            records = json.load(f)
+        records["State." + first.id]["name"] = "Idaho"
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        storage.close()
+        self.assertEqual(storage.get(State, first.id).name, "Idaho")
+        self.assertIsNot(storage.get(State, first.id), first)
+        self.assertIs(storage.get(State, second.id), second)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_replays_new_log_records(self):
+        """Test that close applies only the log records appended since"""
+        FileStorage._FileStorage__journal = True
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        storage.close()
+        self.assertIs(storage.get(State, state.id), state)
+        record = dict(state.to_dict(), name="Ohio")
+        with open(self.path + ".log", "a") as f:
+            f.write(json.dumps(["State." + state.id, record]) + "\n")
+        storage.close()
+        self.assertEqual(storage.get(State, state.id).name, "Ohio")
+        with open(self.path + ".log", "a") as f:
+            f.write(json.dumps(["State." + state.id, None]) + "\n")
+        storage.close()
+        self.assertIsNone(storage.get(State, state.id))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_deleted_record(self):
+        """Test that close drops the objects deleted from the file, but
+        keeps the ones not saved yet"""
+        storage = FileStorage()
+        first = State(name="Iowa")
+        second = State(name="Utah")
+        storage.new(first)
+        storage.new(second)
+        storage.save()
+        with open(self.path) as f:
+            records = json.load(f)
+        del records["State." + first.id]
+        with open(self.path, "w") as f:
+            json.dump(records, f)
+        unsaved = State(name="Ohio")
+        storage.new(unsaved)
+        storage.close()
+        self.assertIsNone(storage.get(State, first.id))
+        self.assertIs(storage.get(State, second.id), second)
+        self.assertIs(storage.get(State, unsaved.id), unsaved)
+        storage.save()
+        self.assertEqual(sorted(self.reloaded()),
+                         sorted(["State." + second.id, "State." + unsaved.id]))
+
+
+class TestFileStorageShards(FileStorageTestCase):
+    """Test the sharded layout of the FileStorage class"""
+
+    def setUp(self):
+        """Points the storage at an empty shard directory"""
+        super().setUp()
+        self.dir = os.path.join(self.tmp.name, "shards")
+        FileStorage._FileStorage__shard_dir = self.dir
+
+    def shard(self, name):
+        """Returns the records in the shard file name"""
+        with open(os.path.join(self.dir, name)) as f:
+            return json.load(f)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_writes_touched_shards(self):
+        """Test that save writes one file per class, only when touched"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        review = Review(text="Nice")
+        storage.new(state)
+        storage.new(review)
+        storage.save()
+        self.assertEqual(sorted(os.listdir(self.dir)),
+                         ["Review.json", "State.json"])
+        self.assertEqual(self.shard("State.json")["State." + state.id]
+                         ["name"], "Iowa")
+        with open(os.path.join(self.dir, "State.json"), "w") as f:
+            f.write("{}")
+        review.text = "Great"
+        storage.save()
+        self.assertEqual(self.shard("State.json"), {})
+        self.assertEqual(self.shard("Review.json")["Review." + review.id]
+                         ["text"], "Great")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_deleted_record(self):
+        """Test that close drops the objects deleted from a shard, and
+        only from that shard"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        review = Review(text="Nice")
+        storage.new(state)
+        storage.new(review)
+        storage.save()
+        with open(os.path.join(self.dir, "State.json"), "w") as f:
+            f.write("{}")
+        storage.close()
+        self.assertIsNone(storage.get(State, state.id))
+        self.assertIs(storage.get(Review, review.id), review)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_buckets_reload(self):
+        """Test that bucketed shards reload to the same objects"""
+        FileStorage._FileStorage__buckets = 4
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(20)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        self.assertEqual(len(os.listdir(self.dir)), 4)
+        objects = self.reloaded()
+        self.assertEqual(sorted(objects), sorted("State." + state.id
+                                                 for state in states))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_reads_changed_shard(self):
+        """Test that close reads only the shard that changed"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        city = City(name="Ames")
+        storage.new(state)
+        storage.new(city)
+        storage.save()
+        records = self.shard("State.json")
+        records["State." + state.id]["name"] = "Idaho"
+        with open(os.path.join(self.dir, "State.json"), "w") as f:
+            json.dump(records, f)
+        storage.close()
+        self.assertEqual(storage.get(State, state.id).name, "Idaho")
+        self.assertIs(storage.get(City, city.id), city)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_compact_after_reload_of_journal(self):
+        """Test that compaction keeps records only found in the log"""
+        FileStorage._FileStorage__journal = True
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        self.assertEqual(os.listdir(self.dir), [shards.log_name])
+        self.reloaded()
+        storage.compact()
+        self.assertEqual(os.listdir(self.dir), ["State.json"])
+        self.assertIn("State." + state.id, self.reloaded())
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_convert(self):
+        """Test that convert splits a JSON file into shards"""
+        state = State(name="Iowa")
+        user = User(email="a@b.c")
+        with open(self.path, "w") as f:
+            json.dump({"State." + state.id: state.to_dict(),
+                       "User." + user.id: user.to_dict()}, f)
+        self.assertEqual(shards.convert(self.path, self.dir),
+                         ["State.json", "User.json"])
+        objects = self.reloaded()
+        self.assertEqual(objects["State." + state.id].name, "Iowa")
+        self.assertEqual(objects["User." + user.id].email, "a@b.c")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_convert_error(self):
+        """Test that convert leaves no shard when the source is invalid"""
+        state = State(name="Iowa")
+        with open(self.path, "w") as f:
+            f.write('{"State.' + state.id + '": ' +
+                    json.dumps(state.to_dict()) + ', "User.1": {')
+        with self.assertRaises(ValueError):
+            shards.convert(self.path, self.dir)
+        self.assertEqual(os.listdir(self.dir), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_convert_script(self):
+        """Test that the converter runs without loading file.json"""
+        state = State(name="Iowa")
+        src = os.path.join(self.tmp.name, "src.json")
+        with open(src, "w") as f:
+            json.dump({"State." + state.id: state.to_dict()}, f)
+        # the models package would load it, and report the error
+        with open(self.path, "w") as f:
+            f.write("not json")
+        script = os.path.abspath(shards.__file__)
+        result = subprocess.run([sys.executable, script, src, self.dir],
+                                cwd=self.tmp.name, capture_output=True,
+                                text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout, "State.json\n")
+
+
+class TestFileStorageBinary(FileStorageTestCase):
+    """Test the binary snapshot format of the FileStorage class"""
+
+    def setUp(self):
+        """Selects the binary format"""
+        super().setUp()
+        FileStorage._FileStorage__binary = True
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_round_trip(self):
+        """Test that objects saved in binary reload with the same values"""
+        storage = FileStorage()
+        place = Place(name="Loft", number_rooms=3, latitude=4.5)
+        user = User(email="a@b.c", password="secret")
+        storage.new(place)
+        storage.new(user)
+        storage.save()
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(5), b"HBNB\x01")
+        objects = self.reloaded()
+        loaded = objects["Place." + place.id]
+        self.assertIsNot(loaded, place)
+        self.assertEqual(loaded.to_dict(), place.to_dict())
+        self.assertEqual(loaded.created_at, place.created_at)
+        self.assertEqual(loaded.updated_at, place.updated_at)
+        self.assertEqual(objects["User." + user.id]._password,
+                         user._password)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_reads_json_snapshot(self):
+        """Test that an existing JSON snapshot is still read"""
+        FileStorage._FileStorage__binary = False
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        FileStorage._FileStorage__binary = True
+        self.assertEqual(self.reloaded()["State." + state.id].name, "Iowa")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_close_unchanged(self):
+        """Test that a reload of an unchanged binary record keeps it"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        storage.reload()
+        self.assertIs(storage.get(State, state.id), state)
+
+
+class TestFileStorageFlush(FileStorageTestCase):
+    """Test the background flush of the FileStorage class"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_save_is_deferred(self):
+        """Test that save leaves the write to flush within the window"""
+        FileStorage._FileStorage__flush_window = 60
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        storage.save()
+        self.assertFalse(os.path.exists(self.path))
+        storage.flush()
+        with open(self.path) as f:
+            self.assertIn("State." + state.id, json.load(f))
+        self.assertEqual(os.listdir(self.tmp.name), ["file.json"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_background_flush(self):
+        """Test that the background thread writes the coalesced saves"""
+        FileStorage._FileStorage__flush_window = 0.05
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(5)]
+        for state in states:
+            storage.new(state)
+            storage.save()
+        for _ in range(100):
+            if os.path.exists(self.path):
+                break
+            time.sleep(0.05)
+        with open(self.path) as f:
+            self.assertEqual(len(json.load(f)), 5)
+
+
+class TestFileStorageBulk(FileStorageTestCase):
+    """Test the bulk methods of the FileStorage class"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_new_many(self):
+        """Test that new_many stores all the objects for one save"""
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(10)]
+        storage.new_many(states)
+        self.assertEqual(storage.count(State), 10)
+        storage.save()
+        self.assertEqual(len(self.reloaded()), 10)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_delete_many(self):
+        """Test that delete_many removes all the objects"""
+        storage = FileStorage()
+        states = [State(name=str(i)) for i in range(10)]
+        storage.new_many(states)
+        storage.save()
+        storage.delete_many(states[:7])
+        self.assertEqual(storage.count(State), 3)
+        storage.save()
+        self.assertEqual(len(self.reloaded()), 3)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_update_many(self):
+        """Test that update_many sets and saves the new values"""
+        storage = FileStorage()
+        iowa, utah = State(name="Iowa"), State(name="Utah")
+        cities = [City(name=str(i), state_id=iowa.id) for i in range(3)]
+        storage.new_many([iowa, utah] + cities)
+        storage.save()
+        updated_at = cities[0].updated_at
+        storage.update_many(City, [
+            {"id": cities[0].id, "name": "Ames", "state_id": utah.id},
+            {"id": cities[1].id, "id_ignored": None},
+            {"id": "missing", "name": "nowhere"}])
+        self.assertEqual(cities[0].name, "Ames")
+        self.assertNotEqual(cities[0].updated_at, updated_at)
+        self.assertEqual(utah.cities, [cities[0]])
+        self.assertEqual(len(iowa.cities), 2)
+        self.assertIsNone(storage.get(City, "missing"))
+        storage.save()
+        self.assertEqual(self.reloaded()["City." + cities[0].id].name,
+                         "Ames")
+
+
+class TestFileStorageGeneration(FileStorageTestCase):
+    """Test the generation method of the FileStorage class"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_generation_changes(self):
+        """Test that every change to a class changes its generation"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        generations = [storage.generation(State)]
+        storage.new(state)
+        generations.append(storage.generation(State))
+        state.name = "Utah"
+        generations.append(storage.generation(State))
+        storage.delete(state)
+        generations.append(storage.generation(State))
+        self.assertEqual(len(set(generations)), 4)
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_generation_per_class(self):
+        """Test that changes to a class leave the others alone"""
+        storage = FileStorage()
+        generation = storage.generation("City")
+        state = State(name="Iowa")
+        storage.new(state)
+        state.name = "Utah"
+        storage.save()
+        self.assertEqual(storage.generation(City), generation)
+
+
+class TestFileStorageGeo(FileStorageTestCase):
+    """Test the near method of the FileStorage class"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_near(self):
+        """Test that places are found by position as they change"""
+        storage = FileStorage()
+        paris = Place(name="Paris", latitude=48.8566, longitude=2.3522)
+        london = Place(name="London", latitude=51.5074, longitude=-0.1278)
+        storage.new_many([paris, london])
+        found = storage.near(48.85, 2.35, limit=2)
+        self.assertEqual([place for _, place in found], [paris, london])
+        self.assertEqual(len(storage.near(48.85, 2.35, radius=10)), 1)
+        paris.latitude, paris.longitude = 40.4168, -3.7038
+        self.assertEqual(storage.near(48.85, 2.35, radius=10), [])
+        storage.delete(london)
+        self.assertEqual([place for _, place in storage.near(
+            51.5, -0.1, limit=5)], [paris])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_near_no_position(self):
+        """Test that a place is not indexed until both coordinates are
+        set"""
+        storage = FileStorage()
+        place = Place(name="Nowhere")
+        storage.new(place)
+        self.assertEqual(storage.near(0.01, 0.01, radius=5), [])
+        place.latitude = 0.0
+        self.assertEqual(storage.near(0.01, 0.01, radius=5), [])
+        place.longitude = 0.0
+        self.assertEqual([obj for _, obj in storage.near(0.01, 0.01,
+                                                         radius=5)],
+                         [place])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_near_reload(self):
+        """Test that reloaded places are indexed"""
+        storage = FileStorage()
+        storage.new(Place(name="Paris", latitude=48.8566, longitude=2.3522))
+        storage.save()
+        self.reloaded()
+        self.assertEqual(len(FileStorage().near(48.85, 2.35, radius=1)), 1)
+
+
+class TestFileStorageRanges(FileStorageTestCase):
+    """Test the range queries on places of the FileStorage class"""
+
+    def setUp(self):
+        """Adds places of various prices and sizes"""
+        super().setUp()
+        self.storage = FileStorage()
+        self.places = [Place(name=str(i), price_by_night=10 * i,
+                             max_guest=i % 4) for i in range(10)]
+        self.storage.new_many(self.places)
+
+    def names(self, filters):
+        """Returns the names of the places matching filters"""
+        return sorted(place.name for place in
+                      self.storage.query(Place, filters))
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_ranges(self):
+        """Test that bounds select the places within them"""
+        self.assertEqual(self.names({"price_by_night__ge": 30,
+                                     "price_by_night__le": 60,
+                                     "max_guest__gt": 1}), ["3", "6"])
+        self.assertEqual(self.names({"max_guest": 0}), ["0", "4", "8"])
+        self.assertEqual(self.names({"price_by_night__lt": 0}), [])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_ranges_change(self):
+        """Test that the indexes follow changed and deleted places"""
+        self.places[0].price_by_night = 45
+        self.storage.delete(self.places[4])
+        self.assertEqual(self.names({"price_by_night__gt": 35,
+                                     "price_by_night__lt": 55}), ["0", "5"])
+        self.storage.save()
+        self.reloaded()
+        self.assertEqual(self.names({"price_by_night__gt": 35,
+                                     "price_by_night__lt": 55}), ["0", "5"])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_ranges_indexed(self):
+        """Test that only the places in range are matched"""
+        with mock.patch.object(file_storage, "matches",
+                               wraps=file_storage.matches) as checked:
+            self.names({"price_by_night__ge": 80})
+        self.assertEqual(checked.call_count, 2)
+
+
+class TestFileStorageQuery(FileStorageTestCase):
+    """Test the query method of the FileStorage class"""
+
+    def setUp(self):
+        """Adds a state with cities of various sizes"""
+        super().setUp()
+        self.storage = FileStorage()
+        self.iowa, self.utah = State(name="Iowa"), State(name="Utah")
+        self.cities = [City(name="c{}".format(i % 4), state_id=self.iowa.id)
+                       for i in range(10)]
+        self.storage.new_many([self.iowa, self.utah] + self.cities +
+                              [City(name="c0", state_id=self.utah.id)])
+
+    def ids(self, objs):
+        """Returns the ids of objs"""
+        return [obj.id for obj in objs]
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_filters(self):
+        """Test that the filters select the matching objects"""
+        cities = self.storage.query(City, {"state_id": self.iowa.id})
+        self.assertEqual(self.ids(cities), sorted(self.ids(self.cities)))
+        cities = self.storage.query("City", {"state_id": self.iowa.id,
+                                             "name__in": ["c1", "c2"]})
+        self.assertEqual(len(cities), 5)
+        cities = self.storage.query(City, {"name__ge": "c2",
+                                           "state_id__ne": self.utah.id})
+        self.assertEqual(len(cities), 4)
+        self.assertEqual(self.storage.query(City, {"id": "missing"}), [])
+        self.assertEqual(self.storage.query("Nope"), [])
+        with self.assertRaises(ValueError):
+            self.storage.query(City, {"nope": 1})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iterate(self):
+        """Test that iterate yields the matching objects lazily"""
+        cities = self.storage.iterate(City, {"state_id": self.iowa.id,
+                                             "name": "c1"})
+        self.assertIsNotNone(next(cities))
+        self.assertEqual(len(list(cities)), 2)
+        self.assertEqual(list(self.storage.iterate("Nope")), [])
+        with self.assertRaises(ValueError):
+            self.storage.iterate(City, {"nope": 1})
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_order_limit_offset(self):
+        """Test sorting, then skipping offset and keeping limit objects"""
+        cities = self.storage.query(City, {"state_id": self.iowa.id},
+                                    order_by="-name")
+        names = [city.name for city in cities]
+        self.assertEqual(names, sorted(names, reverse=True))
+        self.assertEqual(self.storage.query(
+            City, {"state_id": self.iowa.id}, order_by="-name", limit=3,
+            offset=2), cities[2:5])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_cursor(self):
+        """Test that pages chained by cursor visit every object once"""
+        expected = self.storage.query(City, {"state_id": self.iowa.id},
+                                      order_by=["name", "-created_at"])
+        pages, cursor = [], None
+        while True:
+            page = self.storage.query(
+                City, {"state_id": self.iowa.id},
+                order_by=["name", "-created_at"], limit=3, cursor=cursor)
+            if not page:
+                break
+            pages.extend(page)
+            cursor = page[-1].id
+        self.assertEqual(pages, expected)
+        with self.assertRaises(ValueError):
+            self.storage.query(City, cursor="missing")
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_id_pages(self):
+        """Test that a page by id reads only about the objects it holds"""
+        states = [State(name=str(i)) for i in range(1000)]
+        self.storage.new_many(states)
+        ids = sorted(state.id for state in states + [self.iowa, self.utah])
+        with mock.patch.object(file_storage, "matches",
+                               wraps=file_storage.matches) as matches:
+            page = self.storage.query(State, {"id__gt": ids[500]}, limit=5)
+            self.assertEqual(self.ids(page), ids[501:506])
+            self.assertLessEqual(matches.call_count, 100)
+            page = self.storage.query(State, {"name__ne": "x"}, limit=3,
+                                      offset=2, cursor=ids[996])
+            self.assertEqual(self.ids(page), ids[999:])
+        self.storage.delete(self.storage.get(State, ids[501]))
+        page = self.storage.query(State, {"id__gt": ids[500]}, limit=5)
+        self.assertEqual(self.ids(page), ids[502:507])
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_iterate_order(self):
+        """Test that iterate yields by id, batch at a time, with the
+        changes made between batches"""
+        cities = self.storage.iterate(City, batch=4)
+        expected = sorted(self.ids(self.storage.all(City).values()))
+        first = next(cities)
+        self.assertEqual(first.id, expected[0])
+        self.storage.delete(self.storage.get(City, expected[-1]))
+        self.assertEqual(self.ids([first] + list(cities)), expected[:-1])
+        cities = self.storage.iterate(City, {"state_id": self.iowa.id})
+        self.assertEqual(self.ids(cities), sorted(
+            city.id for city in self.cities if city.id != expected[-1]))
+
+
+class TestFileStorageThreads(FileStorageTestCase):
+    """Test the FileStorage class used by concurrent threads"""
+
+    @unittest.skipIf(models.storage_t == 'db', "not testing file storage")
+    def test_concurrent_readers_and_writers(self):
+        """Test that reads never see the storage change under them"""
+        storage = FileStorage()
+        state = State(name="Iowa")
+        storage.new(state)
+        errors = []
+        done = threading.Event()
+
+        def write(n):
+            """adds, changes, deletes and saves cities"""
+            try:
+                for i in range(200):
+                    city = City(name="{}-{}".format(n, i), state_id=state.id)
+                    storage.new(city)
+                    city.name = "renamed"
+                    if i % 2:
+                        storage.delete(city)
+                    if i % 50 == 0:
+                        storage.save()
+            except Exception as e:
+                errors.append(e)
+
+        def read():
+            """iterates the storage until the writers are done"""
+            try:
+                while not done.is_set():
+                    for obj in storage.all().values():
+                        obj.id
+                    for obj in storage.all(City).values():
+                        obj.name
+                    storage.count()
+                    storage.count(City)
+                    state.cities
+            except Exception as e:
+                errors.append(e)
+
+        readers = [threading.Thread(target=read) for _ in range(4)]
+        writers = [threading.Thread(target=write, args=(n,))
+                   for n in range(4)]
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        done.set()
+        for thread in readers:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(storage.count(City), 400)
+        self.assertEqual(len(state.cities), 400)
+        storage.save()
+        self.assertEqual(len([key for key in self.reloaded()
+                              if key.startswith("City.")]), 400)
+
 
 class TestFileStorageCount(unittest.TestCase):
     """Test cases for the count method in FileStorage."""
@@ -141,6 +1074,16 @@ class TestFileStorageCount(unittest.TestCase):
         storage.save()
         self.assertEqual(storage.count(State), initial_count + 1)
 
+    @unittest.skipIf(storage.__class__.__name__ != "FileStorage",
+                     "not testing file storage")
+    def test_count_after_delete(self):
+        """Test that deleting an object decrements the count."""
+        new_state = State(name="Ohio")
+        storage.new(new_state)
+        initial_count = storage.count(State)
+        storage.delete(new_state)
+        self.assertEqual(storage.count(State), initial_count - 1)
+
     @unittest.skipIf(storage.__class__.__name__ != "FileStorage",
                      "not testing file storage")
     def test_count_nonexistent_class(self):
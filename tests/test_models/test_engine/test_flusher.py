@@ -0,0 +1,118 @@
+#!/usr/bin/python3
+"""
+Contains the TestFlusher classes
+"""
+
+import inspect
+import pep8
+import threading
+import time
+import unittest
+from models.engine.flusher import Flusher
+
+
+class TestFlusherDocs(unittest.TestCase):
+    """Tests to check the documentation and style of Flusher"""
+
+    def test_pep8_conformance_flusher(self):
+        """Test that models/engine/flusher.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/flusher.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_flusher.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_flusher_docstrings(self):
+        """Test for the presence of docstrings in Flusher"""
+        self.assertTrue(len(Flusher.__doc__) >= 1)
+        for name, func in inspect.getmembers(Flusher, inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestFlusher(unittest.TestCase):
+    """Test the Flusher class"""
+
+    def setUp(self):
+        """Counts the flushes"""
+        self.flushed = 0
+        self.done = threading.Event()
+
+    def flush(self):
+        """Counts one flush"""
+        self.flushed += 1
+        self.done.set()
+
+    def test_requests_coalesce(self):
+        """Test that requests within the window make one flush"""
+        flusher = Flusher(self.flush, 0.2)
+        for _ in range(10):
+            flusher.request()
+        self.assertEqual(self.flushed, 0)
+        self.assertTrue(self.done.wait(5))
+        time.sleep(0.3)
+        self.assertEqual(self.flushed, 1)
+        flusher.stop()
+
+    def test_flush_now(self):
+        """Test that flush runs a pending flush in the caller"""
+        flusher = Flusher(self.flush, 60)
+        flusher.flush()
+        self.assertEqual(self.flushed, 0)
+        flusher.request()
+        flusher.flush()
+        self.assertEqual(self.flushed, 1)
+        flusher.stop()
+        self.assertEqual(self.flushed, 1)
+
+    def test_flush_waits(self):
+        """Test that flush returns only once a background flush in
+        progress is written"""
+        started, release = threading.Event(), threading.Event()
+
+        def slow():
+            """Flushes once released"""
+            started.set()
+            release.wait(5)
+            self.flush()
+        flusher = Flusher(slow, 0)
+        flusher.request()
+        self.assertTrue(started.wait(5))
+        returned = threading.Event()
+        waiter = threading.Thread(target=lambda: (flusher.flush(),
+                                                  returned.set()))
+        waiter.start()
+        self.assertFalse(returned.wait(0.2))
+        release.set()
+        self.assertTrue(returned.wait(5))
+        self.assertEqual(self.flushed, 1)
+        waiter.join()
+        flusher.stop()
+
+    def test_stop_flushes_pending(self):
+        """Test that stop flushes a pending request"""
+        flusher = Flusher(self.flush, 60)
+        flusher.request()
+        flusher.stop()
+        self.assertEqual(self.flushed, 1)
+        with self.assertRaises(RuntimeError):
+            flusher.request()
+
+    def test_error_is_raised_later(self):
+        """Test that a failed background flush raises on the next request"""
+        def fail():
+            """Fails"""
+            self.done.set()
+            raise OSError("disk full")
+        flusher = Flusher(fail, 0)
+        flusher.request()
+        self.assertTrue(self.done.wait(5))
+        time.sleep(0.1)
+        with self.assertRaises(OSError):
+            flusher.request()
+        flusher.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
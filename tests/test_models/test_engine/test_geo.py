@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+"""
+Contains the TestGridIndex classes
+"""
+
+import inspect
+import pep8
+import random
+import unittest
+from types import SimpleNamespace
+from models.engine import geo
+from models.engine.geo import GridIndex, bounding_box, distance, nearest
+
+
+class TestGeoDocs(unittest.TestCase):
+    """Tests to check the documentation and style of geo"""
+
+    def test_pep8_conformance_geo(self):
+        """Test that models/engine/geo.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/geo.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_geo.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_geo_docstrings(self):
+        """Test for the presence of docstrings in geo"""
+        self.assertTrue(len(geo.__doc__) >= 1)
+        for name, func in inspect.getmembers(geo, inspect.isfunction) + \
+                inspect.getmembers(GridIndex, inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+def place(id, lat, lng):
+    """returns an object at lat, lng"""
+    return SimpleNamespace(id=id, latitude=lat, longitude=lng)
+
+
+class TestGeo(unittest.TestCase):
+    """Test the distance helpers"""
+
+    def test_distance(self):
+        """Test the distance between two cities"""
+        self.assertAlmostEqual(distance(48.8566, 2.3522, 51.5074, -0.1278),
+                               343.5, delta=1)
+        self.assertEqual(distance(10, 20, 10, 20), 0)
+        self.assertAlmostEqual(distance(0, 179.9, 0, -179.9),
+                               distance(0, 0, 0, 0.2))
+
+    def test_bounding_box(self):
+        """Test the boxes, across the antimeridian and near a pole"""
+        (lat_min, lat_max), ranges = bounding_box(0, 0, 111.19)
+        self.assertAlmostEqual(lat_min, -1, places=2)
+        self.assertAlmostEqual(lat_max, 1, places=2)
+        self.assertEqual(len(ranges), 1)
+        self.assertEqual(len(bounding_box(0, 179.5, 111.19)[1]), 2)
+        self.assertEqual(bounding_box(89.5, 0, 111.19)[1], [(-180, 180)])
+
+    def test_nearest(self):
+        """Test the sort by distance, then id, within radius and limit"""
+        a, b, c = place("a", 0, 0), place("b", 0, 0), place("c", 0, 0)
+        found = [(2, c), (1, b), (1, a), (3, a)]
+        self.assertEqual(nearest(found), [(1, a), (1, b), (2, c), (3, a)])
+        self.assertEqual(nearest(found, 2, 2), [(1, a), (1, b)])
+        self.assertEqual(nearest(found, 0.5), [])
+
+
+class TestGridIndex(unittest.TestCase):
+    """Test the GridIndex class"""
+
+    def test_index(self):
+        """Test that objects are added, moved and removed"""
+        index = GridIndex(1)
+        paris = place("paris", 48.8566, 2.3522)
+        index.add(paris)
+        index.add(place("nowhere", None, "x"))
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.near(48, 2, limit=1)[0][1], paris)
+        paris.latitude, paris.longitude = 51.5074, -0.1278
+        index.add(paris)
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.near(48, 2, radius=100), [])
+        index.remove("paris")
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.near(51, 0, limit=1), [])
+
+    def test_against_scan(self):
+        """Test that searches find what a scan of every object finds"""
+        rng = random.Random(0)
+        objs = [place(str(i), rng.uniform(-90, 90), rng.uniform(-180, 180))
+                for i in range(500)]
+        objs += [place(str(i), rng.gauss(40, 1), rng.gauss(-100, 1))
+                 for i in range(500, 2000)]
+        index = GridIndex(0.5)
+        for obj in objs:
+            index.add(obj)
+        points = [(40, -100), (89.9, 0), (-89.9, 179.9), (0, 179.99),
+                  (0, -179.99), (10, 10)]
+        for lat, lng in points:
+            for radius, limit in ((None, 1), (None, 25), (100, None),
+                                  (1000, 5), (5000, None)):
+                with self.subTest(lat=lat, lng=lng, radius=radius,
+                                  limit=limit):
+                    expected = nearest(
+                        [(distance(lat, lng, obj.latitude, obj.longitude),
+                          obj) for obj in objs], radius, limit)
+                    self.assertEqual(index.near(lat, lng, radius, limit),
+                                     expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+"""
+Contains the TestJsonStream classes
+"""
+
+import inspect
+import io
+import json
+import pep8
+import unittest
+from models.engine import json_stream
+
+
+class TestJsonStreamDocs(unittest.TestCase):
+    """Tests to check the documentation and style of json_stream"""
+
+    def test_pep8_conformance_json_stream(self):
+        """Test that models/engine/json_stream.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/json_stream.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_json_stream.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_json_stream_docstrings(self):
+        """Test for the presence of docstrings in json_stream"""
+        self.assertTrue(len(json_stream.__doc__) >= 1)
+        for name, func in inspect.getmembers(json_stream,
+                                             inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestJsonStream(unittest.TestCase):
+    """Test the items function"""
+    records = {"State.1": {"id": "1", "name": "Iowa", "__class__": "State"},
+               "Place.2": {"id": "2", "latitude": 37.5, "amenity_ids": [],
+                           "description": "a \"quoted\" {brace}, colon:"},
+               "City.3": {}}
+
+    def parse(self, text, size):
+        """Returns the pairs read from text, size characters at a time"""
+        return list(json_stream.items(io.StringIO(text), size))
+
+    def test_items(self):
+        """Test that items matches json.load for any chunk size"""
+        for indent in (None, 4):
+            text = json.dumps(self.records, indent=indent)
+            for size in (1, 2, 7, 64, 1 << 16):
+                with self.subTest(indent=indent, size=size):
+                    self.assertEqual(self.parse(text, size),
+                                     list(self.records.items()))
+
+    def test_empty_object(self):
+        """Test that an empty object yields nothing"""
+        self.assertEqual(self.parse(" { } \n", 1), [])
+
+    def test_number_across_chunks(self):
+        """Test that a number split by a chunk boundary is read whole"""
+        self.assertEqual(self.parse('{"a": 123456}', 8), [("a", 123456)])
+
+    def test_invalid(self):
+        """Test that malformed or truncated JSON raises JSONDecodeError"""
+        for text in ("", "[]", '{"a": 1', '{"a" 1}', '{"a": 1 "b": 2}',
+                     '{"a": {"id": ', '{"a": 1,}'):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    self.parse(text, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
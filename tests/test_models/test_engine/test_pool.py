@@ -0,0 +1,85 @@
+#!/usr/bin/python3
+"""
+Contains the TestMeteredQueuePool classes
+"""
+
+import inspect
+import os
+import pep8
+import tempfile
+import unittest
+from sqlalchemy import create_engine, exc, text
+from models.engine.pool import MeteredQueuePool
+
+
+class TestMeteredQueuePoolDocs(unittest.TestCase):
+    """Tests to check the documentation and style of MeteredQueuePool"""
+
+    def test_pep8_conformance_pool(self):
+        """Test that models/engine/pool.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/pool.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_pool.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_pool_docstrings(self):
+        """Test for the presence of docstrings in MeteredQueuePool"""
+        self.assertTrue(len(MeteredQueuePool.__doc__) >= 1)
+        for name, func in inspect.getmembers(MeteredQueuePool,
+                                             inspect.isfunction):
+            if name in MeteredQueuePool.__dict__:
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestMeteredQueuePool(unittest.TestCase):
+    """Test the MeteredQueuePool class against SQLite"""
+
+    def setUp(self):
+        """Creates an engine with a pool of one connection"""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            "sqlite:///" + os.path.join(self.tmp.name, "test.db"),
+            poolclass=MeteredQueuePool, pool_size=1, max_overflow=0,
+            pool_timeout=0.1)
+
+    def tearDown(self):
+        """Removes the engine and its database"""
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_stats(self):
+        """Test that checkouts and connections are counted"""
+        for _ in range(3):
+            with self.engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                stats = self.engine.pool.stats()
+                self.assertEqual(stats["checked_out"], 1)
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["checkouts"], 3)
+        self.assertEqual(stats["connects"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["checked_in"], 1)
+        self.assertEqual(stats["size"], 1)
+        self.assertGreaterEqual(stats["wait_total"], stats["wait_max"])
+
+    def test_timeout(self):
+        """Test that a checkout timing out is counted as waiting"""
+        with self.engine.connect():
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+        stats = self.engine.pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertGreaterEqual(stats["wait_max"], 0.1)
+
+    def test_invalidations(self):
+        """Test that discarded connections are counted"""
+        with self.engine.connect() as connection:
+            connection.invalidate()
+        self.assertEqual(self.engine.pool.stats()["invalidations"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+#!/usr/bin/python3
+"""
+Contains the TestQuery classes
+"""
+
+import inspect
+import pep8
+import unittest
+from models.engine import query
+from models.engine.query import (SortKey, matches, parse_filters,
+                                 parse_order)
+from models.place import Place
+
+
+class TestQueryDocs(unittest.TestCase):
+    """Tests to check the documentation and style of query"""
+
+    def test_pep8_conformance_query(self):
+        """Test that models/engine/query.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/query.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_query.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_query_docstrings(self):
+        """Test for the presence of docstrings in query"""
+        self.assertTrue(len(query.__doc__) >= 1)
+        for name, func in inspect.getmembers(query, inspect.isfunction):
+            if func.__module__ == query.__name__ and name != "<lambda>":
+                with self.subTest(function=name):
+                    self.assertTrue(len(func.__doc__) >= 1)
+
+
+class Row:
+    """Object with the given attributes"""
+
+    def __init__(self, **kwargs):
+        """Sets the attributes"""
+        self.__dict__.update(kwargs)
+
+
+class TestQuery(unittest.TestCase):
+    """Test the helpers of the query method"""
+
+    def test_parse_filters(self):
+        """Test that filters become (attribute, operator, value)"""
+        self.assertEqual(
+            parse_filters(Place, {"city_id": "c", "price_by_night__le": 9,
+                                  "id__in": ("a", "b")}),
+            [("city_id", "eq", "c"), ("price_by_night", "le", 9),
+             ("id", "in", ["a", "b"])])
+        self.assertEqual(parse_filters(Place, None), [])
+
+    def test_parse_filters_errors(self):
+        """Test that unknown attributes and operators are rejected"""
+        with self.assertRaises(ValueError):
+            parse_filters(Place, {"nope": 1})
+        with self.assertRaises(ValueError):
+            parse_filters(Place, {"_sa_instance_state": 1})
+        with self.assertRaises(ValueError):
+            parse_filters(Place, {"name__like": "a"})
+
+    def test_parse_order(self):
+        """Test that the order ends with id"""
+        self.assertEqual(parse_order(Place, None), [("id", False)])
+        self.assertEqual(parse_order(Place, "-price_by_night"),
+                         [("price_by_night", True), ("id", False)])
+        self.assertEqual(parse_order(Place, ["name", "-id"]),
+                         [("name", False), ("id", True)])
+        with self.assertRaises(ValueError):
+            parse_order(Place, "-nope")
+
+    def test_matches(self):
+        """Test the operators, and None meeting no condition but ne"""
+        row = Row(a=3, b=None)
+        self.assertTrue(matches(row, [("a", "ge", 3), ("a", "in", [3])]))
+        self.assertFalse(matches(row, [("a", "lt", 3)]))
+        self.assertFalse(matches(row, [("b", "lt", 3)]))
+        self.assertTrue(matches(row, [("b", "ne", 3)]))
+        self.assertFalse(matches(row, [("b", "ne", None)]))
+        self.assertFalse(matches(row, [("missing", "eq", 3)]))
+        row = Row(a="90")
+        self.assertFalse(matches(row, [("a", "ge", 50)]))
+        self.assertTrue(matches(row, [("a", "ne", 50)]))
+
+    def test_sort_key(self):
+        """Test sorting on several attributes, None first"""
+        rows = [Row(a=1, id="x"), Row(a=None, id="y"), Row(a=2, id="z"),
+                Row(a=1, id="w")]
+        order = [("a", False), ("id", False)]
+        self.assertEqual([row.id for row in sorted(
+            rows, key=lambda row: SortKey(row, order))], ["y", "w", "x", "z"])
+        order = [("a", True), ("id", False)]
+        self.assertEqual([row.id for row in sorted(
+            rows, key=lambda row: SortKey(row, order))], ["z", "w", "x", "y"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+#!/usr/bin/python3
+"""
+Contains the TestRangeIndex classes
+"""
+
+import inspect
+import pep8
+import random
+import unittest
+from types import SimpleNamespace
+from models.engine import ranges
+from models.engine.query import operators
+from models.engine.ranges import RangeIndex, number, text
+
+
+class TestRangesDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ranges"""
+
+    def test_pep8_conformance_ranges(self):
+        """Test that models/engine/ranges.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/ranges.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_ranges.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_ranges_docstrings(self):
+        """Test for the presence of docstrings in ranges"""
+        self.assertTrue(len(ranges.__doc__) >= 1)
+        for name, func in inspect.getmembers(ranges, inspect.isfunction) + \
+                inspect.getmembers(RangeIndex, inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+def place(id, price):
+    """returns an object of price_by_night price"""
+    return SimpleNamespace(id=id, price_by_night=price)
+
+
+class TestRangeIndex(unittest.TestCase):
+    """Test the RangeIndex class"""
+
+    def test_number(self):
+        """Test which values are indexed"""
+        self.assertTrue(number(0))
+        self.assertTrue(number(2.5))
+        self.assertTrue(number(True))
+        for value in (None, "5", float("nan"), [1]):
+            with self.subTest(value=value):
+                self.assertFalse(number(value))
+
+    def test_index(self):
+        """Test finding, changing and removing objects"""
+        index = RangeIndex("price_by_night")
+        objs = [place("p{}".format(i), 10 * i) for i in range(5)]
+        for obj in objs:
+            index.add(obj)
+        index.add(place("text", "cheap"))
+        self.assertEqual(len(index), 5)
+        self.assertEqual(sorted(index.find([("ge", 10), ("lt", 30)])),
+                         ["p1", "p2"])
+        self.assertEqual(index.find([("eq", 40)]), ["p4"])
+        objs[4].price_by_night = 0
+        index.add(objs[4])
+        index.remove("p0")
+        index.remove("nope")
+        self.assertEqual(len(index), 4)
+        self.assertEqual(sorted(index.find([("le", 10)])), ["p1", "p4"])
+        self.assertEqual(index.count([("le", 10)]), 2)
+        self.assertEqual(index.find([("gt", 40)]), [])
+
+    def test_limit(self):
+        """Test that find returns the first limit ids, across blocks"""
+        index = RangeIndex("price_by_night", block=2)
+        for i in range(20):
+            index.add(place("p{:02}".format(i), i))
+        self.assertEqual(index.find([("ge", 3)], 6),
+                         ["p{:02}".format(i) for i in range(3, 9)])
+        self.assertEqual(index.find([("ge", 3), ("lt", 5)], 6),
+                         ["p03", "p04"])
+        self.assertEqual(index.find([("gt", 17)], 6), ["p18", "p19"])
+        self.assertEqual(index.find([("gt", 19)], 6), [])
+
+    def test_ids(self):
+        """Test an index of the ids"""
+        index = RangeIndex("id", block=2, valid=text)
+        for id in ("b", "d", "a", "c"):
+            index.add(place(id, None))
+        index.remove("c")
+        self.assertEqual(index.find([]), ["a", "b", "d"])
+        self.assertEqual(index.find([("gt", "a")], 1), ["b"])
+        self.assertTrue(text("a"))
+        self.assertFalse(text(1))
+
+    def test_against_scan(self):
+        """Test that lookups match a scan as objects change, with blocks
+        of various sizes"""
+        rng = random.Random(0)
+        for block in (1, 8, 1000):
+            index = RangeIndex("price_by_night", block=block)
+            objs = {}
+            for step in range(2000):
+                id = "p{}".format(rng.randrange(300))
+                if rng.random() < 0.2:
+                    objs.pop(id, None)
+                    index.remove(id)
+                else:
+                    objs[id] = place(id, rng.choice(
+                        [rng.randrange(100), rng.random() * 100]))
+                    index.add(objs[id])
+                if step < 500 or step % 20:
+                    # the first lookup sorts hundreds of objects at once
+                    continue
+                bounds = [(op, rng.randrange(100)) for op in rng.sample(
+                    ("eq", "lt", "le", "gt", "ge"), rng.randint(1, 2))]
+                expected = sorted(
+                    id for id, obj in objs.items()
+                    if all(operators[op](obj.price_by_night, value)
+                           for op, value in bounds))
+                with self.subTest(block=block, step=step, bounds=bounds):
+                    found = index.find(bounds)
+                    self.assertEqual(sorted(found), expected)
+                    self.assertEqual([objs[id].price_by_night
+                                      for id in found],
+                                     sorted(objs[id].price_by_night
+                                            for id in found))
+                    self.assertEqual(index.count(bounds), len(expected))
+            self.assertEqual(len(index), len(objs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Contains the TestRouter classes
+"""
+
+import inspect
+import pep8
+import unittest
+from models.engine import replicas
+from models.engine.replicas import Router, RoutingSession
+
+
+class TestReplicasDocs(unittest.TestCase):
+    """Tests to check the documentation and style of replicas"""
+
+    def test_pep8_conformance_replicas(self):
+        """Test that models/engine/replicas.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/replicas.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_replicas.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_replicas_docstrings(self):
+        """Test for the presence of docstrings in replicas"""
+        self.assertTrue(len(replicas.__doc__) >= 1)
+        for cls in (Router, RoutingSession):
+            self.assertTrue(len(cls.__doc__) >= 1)
+            for name in cls.__dict__:
+                func = cls.__dict__[name]
+                if inspect.isfunction(func):
+                    with self.subTest(function=name):
+                        self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestRouter(unittest.TestCase):
+    """Test the Router class"""
+
+    def test_no_replicas(self):
+        """Test that there is no replica to read from"""
+        self.assertIsNone(Router([]).replica())
+
+    def test_round_robin(self):
+        """Test that the replicas take turns"""
+        router = Router(["a", "b", "c"])
+        self.assertEqual([router.replica() for _ in range(6)],
+                         ["a", "b", "c", "a", "b", "c"])
+
+    def test_fail(self):
+        """Test that a failed replica is skipped until retry"""
+        router = Router(["a", "b"], retry=60)
+        router.fail("a")
+        self.assertEqual([router.replica() for _ in range(3)],
+                         ["b", "b", "b"])
+        router.fail("b")
+        self.assertIsNone(router.replica())
+
+    def test_retry(self):
+        """Test that a failed replica is used again after retry"""
+        router = Router(["a"], retry=0)
+        router.fail("a")
+        self.assertEqual(router.replica(), "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
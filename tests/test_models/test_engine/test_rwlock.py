@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""
+Contains the TestReadWriteLock classes
+"""
+
+import inspect
+import pep8
+import threading
+import unittest
+from models.engine.rwlock import ReadWriteLock
+
+
+class TestReadWriteLockDocs(unittest.TestCase):
+    """Tests to check the documentation and style of ReadWriteLock"""
+
+    def test_pep8_conformance_rwlock(self):
+        """Test that models/engine/rwlock.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/rwlock.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_rwlock.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_rwlock_docstrings(self):
+        """Test for the presence of docstrings in ReadWriteLock"""
+        self.assertTrue(len(ReadWriteLock.__doc__) >= 1)
+        for name, func in inspect.getmembers(ReadWriteLock,
+                                             inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+class TestReadWriteLock(unittest.TestCase):
+    """Test the ReadWriteLock class"""
+
+    def setUp(self):
+        """Creates the lock"""
+        self.lock = ReadWriteLock()
+        self.threads = []
+
+    def tearDown(self):
+        """Waits for the threads started by the test"""
+        for thread in self.threads:
+            thread.join()
+
+    def in_thread(self, context, timeout=0.1):
+        """Returns whether another thread enters context within timeout
+
+        The thread leaves the context as soon as it enters it.
+        """
+        entered = threading.Event()
+
+        def run():
+            """enters the context"""
+            with context():
+                entered.set()
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        return entered.wait(timeout)
+
+    def test_readers_share(self):
+        """Test that threads read at the same time"""
+        with self.lock.read():
+            self.assertTrue(self.in_thread(self.lock.read, 5))
+
+    def test_writer_excludes(self):
+        """Test that a writer excludes readers and writers"""
+        with self.lock.read():
+            self.assertFalse(self.in_thread(self.lock.write))
+        with self.lock.write():
+            self.assertFalse(self.in_thread(self.lock.read))
+            self.assertFalse(self.in_thread(self.lock.write))
+        self.assertTrue(self.in_thread(self.lock.write, 5))
+
+    def test_reentrant(self):
+        """Test that the holder may read again and the writer may write"""
+        with self.lock.write():
+            with self.lock.write():
+                with self.lock.read():
+                    pass
+            self.assertFalse(self.in_thread(self.lock.read))
+        with self.lock.read():
+            with self.lock.read():
+                pass
+            self.assertFalse(self.in_thread(self.lock.write))
+        self.assertTrue(self.in_thread(self.lock.write, 5))
+
+    def test_no_upgrade(self):
+        """Test that a reader cannot start writing"""
+        with self.lock.read():
+            with self.assertRaises(RuntimeError):
+                with self.lock.write():
+                    pass
+        self.assertTrue(self.in_thread(self.lock.write, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+"""
+Contains the TestPlaceSearch classes
+"""
+
+import inspect
+import pep8
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+from models.city import City
+from models.engine.query import matches, parse_filters
+from models.engine.search import PlaceSearch
+from models.place import Place
+
+
+class TestPlaceSearchDocs(unittest.TestCase):
+    """Tests to check the documentation and style of PlaceSearch"""
+
+    def test_pep8_conformance_search(self):
+        """Test that models/engine/search.py conforms to PEP8."""
+        pep8s = pep8.StyleGuide(quiet=True)
+        result = pep8s.check_files(['models/engine/search.py',
+                                    'tests/test_models/test_engine/'
+                                    'test_search.py'])
+        self.assertEqual(result.total_errors, 0,
+                         "Found code style errors (and warnings).")
+
+    def test_search_docstrings(self):
+        """Test for the presence of docstrings in PlaceSearch"""
+        self.assertTrue(len(PlaceSearch.__doc__) >= 1)
+        for name, func in inspect.getmembers(PlaceSearch,
+                                             inspect.isfunction):
+            with self.subTest(function=name):
+                self.assertTrue(len(func.__doc__) >= 1)
+
+
+class Storage:
+    """storage of plain objects, counting how often it is read"""
+
+    def __init__(self, cities, places):
+        """stores the cities and the places"""
+        self.objects = {City: cities, Place: places}
+        self.generations = {City: 0, Place: 0}
+        self.reads = 0
+        self.queries = 0
+
+    def all(self, cls, load=()):
+        """returns the objects of cls by id"""
+        self.reads += 1
+        return {obj.id: obj for obj in self.objects[cls]}
+
+    def query(self, cls, filters=None, fields=None):
+        """returns the objects of cls matching filters, by id"""
+        self.queries += 1
+        conditions = parse_filters(cls, filters)
+        return sorted((obj for obj in self.objects[cls]
+                       if matches(obj, conditions)), key=lambda obj: obj.id)
+
+    def generation(self, cls):
+        """returns the number of changes to cls"""
+        return self.generations[cls]
+
+
+class TestPlaceSearch(unittest.TestCase):
+    """Test the PlaceSearch class"""
+
+    def setUp(self):
+        """Creates two states of two cities, each with two places"""
+        cities = [SimpleNamespace(id="c{}".format(i), state_id="s{}".format(
+            i // 2)) for i in range(4)]
+        places = [SimpleNamespace(id="p{}".format(i), city_id="c{}".format(
+            i // 2), amenity_ids=["a{}".format(j) for j in range(i % 3)],
+            price_by_night=10 * i) for i in range(7, -1, -1)]
+        self.storage = Storage(cities, places)
+        self.search = PlaceSearch(self.storage)
+
+    def ids(self, **filters):
+        """returns the ids of the places found"""
+        return [place.id for place in self.search.search(**filters)]
+
+    def test_all(self):
+        """Test that no filter finds every place, sorted by id"""
+        self.assertEqual(self.ids(), ["p{}".format(i) for i in range(8)])
+
+    def test_states_and_cities(self):
+        """Test that states and cities are united"""
+        self.assertEqual(self.ids(states=["s0"]), ["p0", "p1", "p2", "p3"])
+        self.assertEqual(self.ids(states=["s0"], cities=["c3", "c0"]),
+                         ["p0", "p1", "p2", "p3", "p6", "p7"])
+        self.assertEqual(self.ids(states=["nope"], cities=["nope"]), [])
+
+    def test_amenities(self):
+        """Test that a place must have all the amenities"""
+        self.assertEqual(self.ids(amenities=["a0"]),
+                         ["p1", "p2", "p4", "p5", "p7"])
+        self.assertEqual(self.ids(amenities=["a0", "a1"]), ["p2", "p5"])
+        self.assertEqual(self.ids(states=["s1"], amenities=["a1"]), ["p5"])
+        self.assertEqual(self.ids(amenities=["a0", "nope"]), [])
+
+    def test_filters(self):
+        """Test that filters are queried alone, else checked in memory"""
+        self.assertEqual(self.ids(filters={"price_by_night__ge": 30,
+                                           "price_by_night__lt": 60}),
+                         ["p3", "p4", "p5"])
+        self.assertEqual(self.storage.queries, 1)
+        self.assertEqual(self.ids(states=["s0"], amenities=["a0"],
+                                  filters={"price_by_night__ge": 20}),
+                         ["p2"])
+        self.assertEqual(self.ids(amenities=["a1"],
+                                  filters={"price_by_night__le": 40}),
+                         ["p2"])
+        self.assertEqual(self.storage.queries, 1)
+        with self.assertRaises(ValueError):
+            self.ids(filters={"nope__ge": 1})
+
+    def test_rebuild(self):
+        """Test that the indexes are rebuilt only when storage changes"""
+        self.ids(states=["s0"])
+        self.ids(cities=["c1"])
+        self.assertEqual(self.storage.reads, 2)
+        self.storage.objects[Place].append(
+            SimpleNamespace(id="p8", city_id="c1", amenity_ids=[]))
+        self.assertNotIn("p8", self.ids(cities=["c1"]))
+        self.storage.generations[Place] += 1
+        self.assertIn("p8", self.ids(cities=["c1"]))
+        self.assertEqual(self.storage.reads, 3)
+
+
+class RelatedStorage(Storage):
+    """storage that knows the objects related to another, as FileStorage"""
+
+    def related(self, cls, foreign_key, value):
+        """returns the objects of cls whose foreign_key is (or, for a
+        list, holds) value"""
+        return [obj for obj in self.objects[cls]
+                if getattr(obj, foreign_key, None) == value or
+                value in (getattr(obj, foreign_key, None) or ())]
+
+    def related_by_id(self, cls, foreign_key, value):
+        """returns the objects related returns by id"""
+        return {obj.id: obj for obj in self.related(cls, foreign_key, value)}
+
+    def iterate(self, cls, filters=None):
+        """returns an iterator over the objects of query"""
+        return iter(self.query(cls, filters))
+
+
+class TestPlaceSearchRelated(TestPlaceSearch):
+    """Test the PlaceSearch class over the indexes of storage"""
+
+    def setUp(self):
+        """Creates the places of TestPlaceSearch in a RelatedStorage"""
+        super().setUp()
+        self.storage = RelatedStorage(self.storage.objects[City],
+                                      self.storage.objects[Place])
+        self.search = PlaceSearch(self.storage)
+
+    def test_rebuild(self):
+        """Test that changes are found without reading every place"""
+        self.ids(states=["s0"])
+        self.ids(amenities=["a1"])
+        self.storage.objects[Place].append(
+            SimpleNamespace(id="p8", city_id="c1", amenity_ids=["a1"]))
+        self.assertIn("p8", self.ids(cities=["c1"]))
+        self.assertIn("p8", self.ids(amenities=["a1"]))
+        self.assertEqual(self.storage.reads, 0)
+
+    def test_iterate(self):
+        """Test that every place is read from the iterate method of
+        storage, as the iterator is consumed"""
+        with mock.patch.object(self.storage, "iterate",
+                               wraps=self.storage.iterate) as iterate:
+            places = self.search.iterate()
+            iterate.assert_called_once_with(Place, None)
+        self.assertEqual(next(places).id, "p0")
+        self.assertEqual(self.storage.reads, 0)
+
+if __name__ == "__main__":
+    unittest.main()